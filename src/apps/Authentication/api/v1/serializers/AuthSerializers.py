@@ -1,10 +1,7 @@
-from django.utils.timezone import now
-
 from rest_framework import serializers
 
 from apps.Billing.models import Subscription
 from apps.Chat.models import Participant
-from apps.Common.models import StatusSuscription
 
 
 class LoginSerializer(serializers.Serializer):
@@ -73,7 +70,11 @@ class MeSerializerOutput(serializers.Serializer):
         ).data
 
     def get_subscription(self, user):
-        subscription = Subscription.objects.filter(user=user).first()
+        subscription = (
+            Subscription.objects.filter(user=user)
+            .order_by("-current_period_end")
+            .first()
+        )
 
         if not subscription:
             return None
@@ -87,7 +88,7 @@ class MeSerializerOutput(serializers.Serializer):
         ).data
 
     def get_has_access(self, user):
-        subscription = Subscription.objects.filter(user=user).first()
+        subscription = user.get_last_valid_subscription()
 
         if not subscription:
             return {
@@ -95,19 +96,9 @@ class MeSerializerOutput(serializers.Serializer):
                 "last_day": None,
             }
 
-        if subscription.status == StatusSuscription.ACTIVE or (
-            subscription.status == StatusSuscription.CANCELED
-            and subscription.current_period_end
-            and subscription.current_period_end > now()
-        ):
-            return AccessDataSerializer(
-                {
-                    "has_access": True,
-                    "last_day": subscription.current_period_end,
-                }
-            ).data
-
-        return {
-            "has_access": False,
-            "last_day": None,
-        }
+        return AccessDataSerializer(
+            {
+                "has_access": True,
+                "last_day": subscription.current_period_end,
+            }
+        ).data
@@ -26,7 +26,11 @@ from apps.Authentication.service import (
     RefreshService,
     RegisterService,
 )
-from apps.Common.throttles import FailedLoginThrottle
+from apps.Common.throttles import (
+    AuthRateThrottle,
+    FailedLoginThrottle,
+    RefreshRateThrottle,
+)
 
 
 class AuthenticationView(viewsets.ViewSet):
@@ -36,6 +40,7 @@ class AuthenticationView(viewsets.ViewSet):
         detail=False,
         methods=["post"],
         permission_classes=[AllowAny],
+        throttle_classes=[AuthRateThrottle],
     )
     def login(self, request):
         throttle = FailedLoginThrottle()
@@ -98,6 +103,7 @@ class AuthenticationView(viewsets.ViewSet):
         detail=False,
         methods=["post"],
         permission_classes=[AllowAny],
+        throttle_classes=[RefreshRateThrottle],
     )
     def refresh_token(self, request):
         access_token = RefreshService().execute(request.COOKIES.get("refresh_token"))
@@ -116,6 +122,7 @@ class AuthenticationView(viewsets.ViewSet):
         detail=False,
         methods=["post"],
         permission_classes=[AllowAny],
+        throttle_classes=[AuthRateThrottle],
     )
     def register(self, request):
         serializer = RegisterSerializerInput(data=request.data)
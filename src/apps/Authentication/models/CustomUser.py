@@ -1,7 +1,6 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
-from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
 from phonenumber_field.modelfields import PhoneNumberField
@@ -75,11 +74,8 @@ class CustomUser(CustomModel, AbstractBaseUser, PermissionsMixin):
         return True
 
     def get_last_valid_subscription(self):
-        obj = Subscription.objects.filter(user=self).first()
+        return Subscription.objects.last_valid(self)
 
-        if obj is None:
-            return None
-
-        if obj.current_period_end > now():
-            return obj
-        return None
+    def get_features(self):
+        subscription = self.get_last_valid_subscription()
+        return subscription.get_features() if subscription else frozenset()
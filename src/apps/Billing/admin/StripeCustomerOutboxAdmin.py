@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from ..models import StripeCustomerOutbox
+
+
+@admin.register(StripeCustomerOutbox)
+class StripeCustomerOutboxAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "user",
+        "created_at",
+        "processed_at",
+        "attempts",
+    ]
@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from ..models import StripeEvent
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "stripe_event_id",
+        "event_type",
+        "stripe_customer_id",
+        "created",
+        "processed_at",
+        "attempts",
+    ]
+    list_filter = ["event_type"]
+    search_fields = ["stripe_event_id", "stripe_customer_id"]
@@ -10,4 +10,5 @@ class UsageAdmin(admin.ModelAdmin):
         "quota",
         "subscription",
         "count",
+        "period_start",
     ]
@@ -5,5 +5,7 @@ from apps.Billing.admin.PlanAdmin import PlanAdmin
 from apps.Billing.admin.PriceAdmin import PriceAdmin
 from apps.Billing.admin.QuotaAdmin import QuotaAdmin
 from apps.Billing.admin.QuotaPlanAdmin import QuotaPlanAdmin
+from apps.Billing.admin.StripeCustomerOutboxAdmin import StripeCustomerOutboxAdmin
+from apps.Billing.admin.StripeEventAdmin import StripeEventAdmin
 from apps.Billing.admin.SubscriptionAdmin import SubscriptionAdmin
 from apps.Billing.admin.UsageAdmin import UsageAdmin
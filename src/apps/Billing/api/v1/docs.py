@@ -12,7 +12,8 @@ list_price_docs = extend_schema(
     description=(
         "Retrieves a list of all available prices/plans. "
         "Public endpoint accessible without authentication. "
-        "No pagination applied."
+        "No pagination applied. Answers 304 when If-None-Match has the "
+        "ETag of the current catalogue."
     ),
     responses={
         200: OpenApiResponse(
@@ -41,10 +42,14 @@ create_stripe_session_docs = extend_schema(
 webhook_stripe_docs = extend_schema(
     tags=["Stripe"],
     summary="Stripe webhook endpoint",
-    description="Receives Stripe webhook events.",
+    description=(
+        "Receives Stripe webhook events. Events are stored and acknowledged "
+        "right away, then processed in the background. Retried deliveries "
+        "are ignored."
+    ),
     request=None,
     responses={
-        200: OpenApiResponse(description="Webhook processed"),
+        200: OpenApiResponse(description="Webhook received"),
         400: OpenApiResponse(description="Invalid payload or signature"),
     },
 )
@@ -1,10 +1,5 @@
-from django.conf import settings
-
-import stripe
 from rest_framework import serializers
 
-stripe.api_key = settings.STRIPE_API_KEY
-
 
 class CheckoutSessionSerializerInput(serializers.Serializer):
     success_url = serializers.URLField()
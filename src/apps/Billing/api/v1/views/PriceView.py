@@ -4,14 +4,30 @@ from rest_framework.permissions import AllowAny
 from apps.Billing.api.v1.docs import list_price_docs
 from apps.Billing.api.v1.serializers import PriceSerializer
 from apps.Billing.models import Price
+from apps.Billing.service import PriceCatalogueService
+from apps.Common.responses import catalogue_response, get_query_variant
 
 
 class PriceView(viewsets.GenericViewSet, mixins.ListModelMixin):
-    queryset = Price.objects.all()
+    queryset = Price.objects.select_related("plan", "period", "currency")
     serializer_class = PriceSerializer
     permission_classes = [AllowAny]
     filterset_fields = ["period__name"]
 
     @list_price_docs
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        catalogue = PriceCatalogueService()
+        version = catalogue.get_version()
+        # Each filter and page is cached on its own
+        variant = get_query_variant(self)
+
+        return catalogue_response(
+            request,
+            version,
+            variant,
+            lambda: catalogue.execute(
+                version,
+                variant,
+                lambda: super(PriceView, self).list(request, *args, **kwargs).data,
+            ),
+        )
@@ -9,7 +9,11 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from apps.Billing.api.v1.docs import create_stripe_session_docs, webhook_stripe_docs
-from apps.Billing.service import CreateSessionService, StripeWebHookService
+from apps.Billing.service import (
+    CreateSessionService,
+    GetOrCreateCustomerService,
+    StripeWebHookService,
+)
 
 from ..serializers import (
     CheckoutSessionSerializerInput,
@@ -34,7 +38,10 @@ class StripeView(viewsets.ViewSet):
             success_url=validated_data["success_url"],
             cancel_url=validated_data["cancel_url"],
             stripe_price_id=validated_data["stripe_price_id"],
-            customuser_stripe_id=request.user.strip_customer_id,
+            customuser_stripe_id=(
+                request.user.strip_customer_id
+                or GetOrCreateCustomerService().execute(request.user.id)
+            ),
         )
         response = CheckoutSessionSerializerOutput(
             {"stripe_session_url": checkout_session.url}
@@ -0,0 +1,55 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.Common.models import CustomModel
+
+
+class StripeCustomerOutbox(CustomModel):
+    """
+    Pending creation of the stripe customer of a user. The row is written
+    with the participant, a worker creates the customer afterwards.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    idempotency_key = models.UUIDField(
+        _("Idempotency key sent to stripe"),
+        default=uuid.uuid4,
+        editable=False,
+    )
+    created_at = models.DateTimeField(
+        _("Date the creation was requested"),
+        auto_now_add=True,
+    )
+    processed_at = models.DateTimeField(
+        _("Date the customer was created"),
+        null=True,
+        blank=True,
+    )
+    attempts = models.PositiveIntegerField(
+        _("Number of times the creation failed"),
+        default=0,
+    )
+    last_error = models.TextField(
+        _("Last creation error"),
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = "BILLING_STRIPE_CUSTOMER_OUTBOX"
+        verbose_name = _("Stripe customer outbox")
+        verbose_name_plural = _("Stripe customers outbox")
+        app_label = "Billing"
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(processed_at__isnull=True),
+                name="stripe_customer_pending_idx",
+            ),
+        ]
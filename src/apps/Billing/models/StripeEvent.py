@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.Common.models import CustomModel
+
+
+class StripeEvent(CustomModel):
+    stripe_event_id = models.CharField(
+        _("Stripe event id"),
+        max_length=255,
+        unique=True,
+    )
+    event_type = models.CharField(
+        _("Type of the event"),
+        max_length=100,
+    )
+    stripe_customer_id = models.CharField(
+        _("Stripe customer"),
+        max_length=255,
+        null=True,
+    )
+    payload = models.JSONField(
+        _("Event sent by stripe"),
+    )
+    created = models.DateTimeField(
+        _("Date stripe created the event"),
+    )
+    received_at = models.DateTimeField(
+        _("Date the event was received"),
+        auto_now_add=True,
+    )
+    processed_at = models.DateTimeField(
+        _("Date the event was processed"),
+        null=True,
+        blank=True,
+    )
+    attempts = models.PositiveIntegerField(
+        _("Number of times the processing failed"),
+        default=0,
+    )
+    last_error = models.TextField(
+        _("Last processing error"),
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = "BILLING_STRIPE_EVENT"
+        verbose_name = _("Stripe event")
+        verbose_name_plural = _("Stripe events")
+        app_label = "Billing"
+        indexes = [
+            models.Index(
+                fields=["stripe_customer_id", "created"],
+                condition=models.Q(processed_at__isnull=True),
+                name="stripe_event_pending_idx",
+            ),
+        ]
@@ -1,9 +1,69 @@
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
-from apps.Billing.models import Plan, Price
-from apps.Common.models import CustomModel, StatusSuscription
+from apps.Billing.models import Price, QuotaPlan
+from apps.Common.models import (
+    ActivatorModelManager,
+    ActivatorQuerySet,
+    CustomModel,
+    StatusSuscription,
+)
+
+QUOTA_LIMIT_CACHE_TIMEOUT = 60 * 60
+
+# Status -> statuses it can move to
+TRANSITIONS = {
+    StatusSuscription.INCOMPLETE: {
+        StatusSuscription.ACTIVE,
+        StatusSuscription.CANCELED,
+    },
+    StatusSuscription.ACTIVE: {
+        StatusSuscription.PAST_DUE,
+        StatusSuscription.CANCELED,
+    },
+    StatusSuscription.PAST_DUE: {
+        StatusSuscription.ACTIVE,
+        StatusSuscription.CANCELED,
+    },
+    StatusSuscription.CANCELED: set(),
+}
+
+# Statuses that give access until the end of the paid period
+ENTITLED_STATUSES = [
+    StatusSuscription.ACTIVE,
+    StatusSuscription.PAST_DUE,
+    StatusSuscription.CANCELED,
+]
+
+
+class SubscriptionQuerySet(ActivatorQuerySet):
+
+    def valid(self):
+        return self.filter(
+            status__in=ENTITLED_STATUSES,
+            current_period_end__gt=now(),
+        )
+
+    def last_valid(self, user):
+        return self.valid().filter(user=user).order_by("-current_period_end").first()
+
+
+class SubscriptionManager(ActivatorModelManager):
+    def get_queryset(self):
+        return SubscriptionQuerySet(
+            self.model,
+            using=self._db,
+        )
+
+    def valid(self):
+        return self.get_queryset().valid()
+
+    def last_valid(self, user):
+        return self.get_queryset().last_valid(user)
 
 
 class Subscription(CustomModel):
@@ -41,6 +101,12 @@ class Subscription(CustomModel):
         choices=StatusSuscription,
     )
 
+    last_event_at = models.DateTimeField(
+        _("Creation date of the last stripe event applied"),
+        null=True,
+        blank=True,
+    )
+
     # Snapshot of price table
     amount = models.PositiveBigIntegerField(
         _("Amount on cents"),
@@ -57,35 +123,115 @@ class Subscription(CustomModel):
         max_length=100,
     )
 
+    objects: SubscriptionManager = SubscriptionManager()
+
     class Meta:
         db_table = "BILLING_SUBSCRIPTION"
         verbose_name = _("Subscription")
         verbose_name_plural = _("Subscriptions")
         ordering = ["start_date"]
         app_label = "Billing"
+        indexes = [
+            models.Index(
+                fields=["user", "status", "current_period_end"],
+                name="subscription_user_status_idx",
+            ),
+            models.Index(
+                fields=["user", "-current_period_end"],
+                condition=models.Q(status__in=ENTITLED_STATUSES),
+                name="subscription_entitled_idx",
+            ),
+        ]
+
+    def can_transition_to(self, status) -> bool:
+        return status == self.status or status in TRANSITIONS[self.status]
+
+    def transition_to(self, status):
+        """
+        Move the subscription to ``status``. Staying in the same status is a
+        renewal or an update and is always allowed.
+        """
+        if not self.can_transition_to(status):
+            raise ValidationError(
+                f"Subscription can not go from {self.status} to {status}."
+            )
+        self.status = status
+
+    def get_features(self):
+        # Imported here, the repository loads the Billing models.
+        from apps.Billing.repository import PlanFeatureRepository
+
+        return PlanFeatureRepository().get_features(self.plan_name)
 
     def has_feature(self, feature):
-        current_plan = Plan.objects.filter(name=self.plan_name).first()
+        return feature in self.get_features()
+
+    @staticmethod
+    def get_quota_limit_cache_key(plan_name, quota):
+        return f"quota_limit__{plan_name}__{quota}"
+
+    def get_quota_limit(self, quota):
+        """
+        Limit of the quota for the plan of the subscription, None when the
+        plan does not limit it.
+        """
+        return cache.get_or_set(
+            self.get_quota_limit_cache_key(self.plan_name, quota),
+            lambda: QuotaPlan.objects.filter(
+                plan__name=self.plan_name,
+                quota__code=quota,
+            )
+            .values_list("limit", flat=True)
+            .first(),
+            QUOTA_LIMIT_CACHE_TIMEOUT,
+        )
 
-        if not current_plan:
-            return False
+    def get_quota_usage(self, quota):
+        _, usage = self._meter(quota, amount=0, limit=None, commit=False)
+        return usage
 
-        if current_plan.features.filter(code=feature).exists():
-            return True
+    def get_quota_remaining(self, quota):
+        limit = self.get_quota_limit(quota)
+        if limit is None:
+            return None
+        return max(limit - self.get_quota_usage(quota), 0)
 
-        return False
+    def can_consume(self, quota, amount=1):
+        allowed, _ = self._meter(
+            quota, amount, self.get_quota_limit(quota), commit=False
+        )
+        return allowed
 
-    def get_quota_limit(self):
-        return None
+    def consume(self, quota, amount=1):
+        """
+        Atomically check and increment the usage of the quota in the
+        current period. Returns False, without consuming, when it would go
+        over the limit.
+        """
+        allowed, _ = self._meter(quota, amount, self.get_quota_limit(quota))
+        return allowed
 
-    def get_quota_usage(self):
-        return None
+    def refund(self, quota, amount=1):
+        """Give back an amount consumed by a change that was rolled back."""
+        self._meter(quota, -amount, limit=None)
 
-    def get_quota_remaining(self):
-        return None
+    def _meter(self, quota, amount, limit, commit=True):
+        # Imported here, the repository loads the Billing models.
+        from apps.Billing.models import Usage
+        from apps.Billing.repository import QuotaRepository
 
-    def can_consume(self):
-        return None
+        def get_stored_usage():
+            return (
+                Usage.objects.filter(
+                    subscription=self,
+                    quota__code=quota,
+                    period_start=self.current_period_start,
+                )
+                .values_list("count", flat=True)
+                .first()
+                or 0
+            )
 
-    def consume(self):
-        return None
+        return QuotaRepository().consume(
+            self, quota, amount, limit, get_stored_usage, commit=commit
+        )
@@ -19,10 +19,13 @@ class Usage(CustomModel):
     count = models.PositiveIntegerField(
         _("Number of time apply"),
     )
+    period_start = models.DateTimeField(
+        _("Start date of the metered period"),
+    )
 
     class Meta:
         db_table = "BILLING_USAGE"
-        unique_together = [["quota", "subscription"]]
+        unique_together = [["quota", "subscription", "period_start"]]
         verbose_name = _("Usage")
         verbose_name_plural = _("Usages")
         app_label = "Billing"
@@ -5,5 +5,7 @@ from apps.Billing.models.Plan import Plan
 from apps.Billing.models.Price import Price
 from apps.Billing.models.Quota import Quota
 from apps.Billing.models.QuotaPlan import QuotaPlan
+from apps.Billing.models.StripeCustomerOutbox import StripeCustomerOutbox
+from apps.Billing.models.StripeEvent import StripeEvent
 from apps.Billing.models.Subscription import Subscription
 from apps.Billing.models.Usage import Usage
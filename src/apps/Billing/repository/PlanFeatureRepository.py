@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+
+VERSION_KEY = "plan_features_version"
+# Seconds a worker trusts its matrix before comparing versions again
+VERSION_CHECK_INTERVAL = 5
+
+
+class PlanFeatureRepository:
+    """
+    Plan name -> frozenset of feature codes, loaded once per worker process.
+    The version of the matrix lives in the cache, changing a plan or a
+    feature bumps it and every worker reloads the matrix on its next check,
+    so a feature check is a set membership test without queries.
+    """
+
+    _lock = threading.Lock()
+    # (version, matrix, checked_at) replaced as a whole, readers never lock
+    _state = (None, None, 0.0)
+
+    def get_version(self):
+        return cache.get_or_set(VERSION_KEY, time.time_ns, None)
+
+    def invalidate(self):
+        cache.set(VERSION_KEY, time.time_ns(), None)
+        PlanFeatureRepository._state = (None, None, 0.0)
+
+    def get_features(self, plan_name):
+        return self.get_matrix().get(plan_name, frozenset())
+
+    def has_feature(self, plan_name, feature):
+        return feature in self.get_features(plan_name)
+
+    def get_matrix(self):
+        version, matrix, checked_at = PlanFeatureRepository._state
+        if matrix is not None and self._is_recent(checked_at):
+            return matrix
+
+        with self._lock:
+            version, matrix, checked_at = PlanFeatureRepository._state
+            if matrix is not None and self._is_recent(checked_at):
+                return matrix
+
+            current_version = self.get_version()
+            if matrix is None or version != current_version:
+                matrix = self._load()
+
+            PlanFeatureRepository._state = (current_version, matrix, time.monotonic())
+            return matrix
+
+    def _is_recent(self, checked_at):
+        return time.monotonic() - checked_at < VERSION_CHECK_INTERVAL
+
+    def _load(self):
+        # Imported here, the models load this repository.
+        from apps.Billing.models import Plan
+
+        features = defaultdict(set)
+        for plan_name, feature_code in Plan.features.through.objects.values_list(
+            "plan__name", "feature__code"
+        ):
+            features[plan_name].add(feature_code)
+
+        return {
+            plan_name: frozenset(feature_codes)
+            for plan_name, feature_codes in features.items()
+        }
@@ -0,0 +1,101 @@
+from django.utils.timezone import now
+
+from apps.Common.cache import get_redis_client
+
+# KEYS[1] counter, KEYS[2] set of counters pending to be flushed
+# ARGV[1] amount (negative to refund), ARGV[2] limit (-1 unlimited),
+# ARGV[3] ttl, ARGV[4] stored usage to seed a missing counter (-1 unknown),
+# ARGV[5] 1 to increment, 0 to only check
+CONSUME_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    if tonumber(ARGV[4]) < 0 then
+        return {-1, 0}
+    end
+    redis.call('SET', KEYS[1], ARGV[4], 'EX', ARGV[3], 'NX')
+    current = redis.call('GET', KEYS[1])
+end
+current = tonumber(current)
+
+local amount = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+if amount > 0 and limit >= 0 and current + amount > limit then
+    return {0, current}
+end
+
+if ARGV[5] == '1' and amount ~= 0 then
+    current = redis.call('INCRBY', KEYS[1], amount)
+    if current < 0 then
+        current = 0
+        redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    redis.call('SADD', KEYS[2], KEYS[1])
+end
+return {1, current}
+"""
+
+KEY_PREFIX = "quota"
+DIRTY_KEY = "quota:dirty"
+# Counters outlive the period so the last increments can still be flushed.
+KEY_GRACE_PERIOD = 60 * 60 * 24 * 7
+
+
+class QuotaRepository:
+    """
+    Quota counters per (subscription, quota, period) kept in Redis. The
+    limit check and the increment run in a single Lua script, so concurrent
+    consumers never overrun a limit and no database lock is taken.
+    """
+
+    def __init__(self):
+        self.client = get_redis_client()
+        self.consume_script = self.client.register_script(CONSUME_SCRIPT)
+
+    @staticmethod
+    def get_key(subscription, quota):
+        period = int(subscription.current_period_start.timestamp())
+        return f"{KEY_PREFIX}:{subscription.id}:{quota}:{period}"
+
+    @staticmethod
+    def parse_key(key):
+        _, subscription_id, quota, period = key.split(":")
+        return subscription_id, quota, int(period)
+
+    def consume(
+        self, subscription, quota, amount, limit, get_stored_usage, commit=True
+    ):
+        """
+        Return a tuple (allowed, usage). ``get_stored_usage`` is only called
+        when the counter is not in Redis yet.
+        """
+        key = self.get_key(subscription, quota)
+        ttl = (
+            max(int((subscription.current_period_end - now()).total_seconds()), 0)
+            + KEY_GRACE_PERIOD
+        )
+        args = [amount, -1 if limit is None else limit, ttl, -1, int(commit)]
+
+        allowed, usage = self.consume_script(keys=[key, DIRTY_KEY], args=args)
+        if allowed == -1:
+            args[3] = get_stored_usage()
+            allowed, usage = self.consume_script(keys=[key, DIRTY_KEY], args=args)
+
+        return bool(allowed), usage
+
+    def pop_pending(self, batch_size):
+        """
+        Pop a batch of counters changed since the last flush and return a
+        list of (key, usage).
+        """
+        keys = self.client.spop(DIRTY_KEY, batch_size)
+        if not keys:
+            return []
+
+        keys = [key.decode() if isinstance(key, bytes) else key for key in keys]
+        values = self.client.mget(keys)
+        return [(key, int(value)) for key, value in zip(keys, values) if value]
+
+    def mark_pending(self, keys):
+        if keys:
+            self.client.sadd(DIRTY_KEY, *keys)
@@ -1,78 +1,133 @@
 import logging
+import time
+from functools import lru_cache
 
 from django.conf import settings
 
-import stripe
-from stripe._error import APIConnectionError, APIError
+import requests
+from prometheus_client import Histogram
+from requests.adapters import HTTPAdapter
 
-stripe.api_key = settings.STRIPE_API_KEY
+from apps.Common.profiling import record_external
+
+STRIPE_REQUEST_LATENCY = Histogram(
+    "stripe_request_latency_seconds",
+    "Latency of the calls made to the stripe API",
+    ["operation", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+@lru_cache(maxsize=1)
+def get_stripe_client():
+    """
+    Shared stripe client. Connections are kept alive in a pool, every call
+    has explicit timeouts and failed network calls are retried by the
+    library with an idempotency key, so a retried POST is never applied
+    twice. STRIPE_API_BASE points it to a local stub server (stripe-mock).
+    The stripe package is imported on the first call, booting a worker does
+    not need it.
+    """
+    import stripe
+
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.STRIPE_HTTP_POOL_SIZE,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return stripe.StripeClient(
+        settings.STRIPE_API_KEY,
+        http_client=stripe.RequestsClient(
+            timeout=(settings.STRIPE_CONNECT_TIMEOUT, settings.STRIPE_READ_TIMEOUT),
+            session=session,
+        ),
+        max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+        base_addresses=(
+            {"api": settings.STRIPE_API_BASE} if settings.STRIPE_API_BASE else None
+        ),
+    )
 
 
 class StripeRepository:
     logger = logging.getLogger(__name__)
 
-    def create_customer(self, name, email, phone):
+    def __init__(self):
+        self.client = get_stripe_client()
+
+    def _request(self, operation, method, params, idempotency_key=None):
+        from stripe import APIConnectionError, APIError
+
+        options = {"idempotency_key": idempotency_key} if idempotency_key else {}
+        start = time.perf_counter()
+        outcome = "error"
+
         try:
-            return stripe.Customer.create(
-                name=name,
-                email=email,
-                phone=phone,
-            )
+            response = method(params=params, options=options)
+            outcome = "success"
+            return response
         except APIConnectionError as e:
-            self.logger.error(f"Stripe connection error creating customer: {str(e)}")
+            self.logger.error(f"Stripe connection error creating {operation}: {str(e)}")
             raise
         except APIError as e:
-            self.logger.error(f"Stripe API error creating customer: {str(e)}")
+            self.logger.error(f"Stripe API error creating {operation}: {str(e)}")
             raise
+        finally:
+            elapsed = time.perf_counter() - start
+            STRIPE_REQUEST_LATENCY.labels(operation, outcome).observe(elapsed)
+            record_external("stripe", elapsed)
+
+    def create_customer(self, name, email, phone, idempotency_key=None):
+        return self._request(
+            "customer",
+            self.client.v1.customers.create,
+            {
+                "name": name,
+                "email": email,
+                "phone": phone,
+            },
+            idempotency_key,
+        )
 
     def create_stripe_product(self, name):
-        try:
-            return stripe.Product.create(
-                name=name,
-            )
-        except APIConnectionError as e:
-            self.logger.error(f"Stripe connection error creating product: {str(e)}")
-            raise
-        except APIError as e:
-            self.logger.error(f"Stripe API error creating product: {str(e)}")
-            raise
+        return self._request(
+            "product",
+            self.client.v1.products.create,
+            {
+                "name": name,
+            },
+        )
 
     def create_stripe_price(self, currency, unit_amount, months, product_id):
-        try:
-            return stripe.Price.create(
-                currency=currency,
-                unit_amount=unit_amount,
-                recurring={"interval": "month", "interval_count": months},
-                product=product_id,
-            )
-        except APIConnectionError as e:
-            self.logger.error(f"Stripe connection error creating price: {str(e)}")
-            raise
-        except APIError as e:
-            self.logger.error(f"Stripe API error creating price: {str(e)}")
-            raise
+        return self._request(
+            "price",
+            self.client.v1.prices.create,
+            {
+                "currency": currency,
+                "unit_amount": unit_amount,
+                "recurring": {"interval": "month", "interval_count": months},
+                "product": product_id,
+            },
+        )
 
     def create_stripe_checkout_session(
         self, success_url, cancel_url, stripe_price_id, customuser_stripe_id
     ):
-        try:
-            return stripe.checkout.Session.create(
-                success_url=success_url,
-                cancel_url=cancel_url,
-                line_items=[
+        return self._request(
+            "checkout session",
+            self.client.v1.checkout.sessions.create,
+            {
+                "success_url": success_url,
+                "cancel_url": cancel_url,
+                "line_items": [
                     {
                         "price": stripe_price_id,
                         "quantity": 1,
                     }
                 ],
-                mode="subscription",
-                customer=customuser_stripe_id,
-            )
-        except APIConnectionError as e:
-            self.logger.error(
-                f"Stripe connection error creating checkout session: {str(e)}"
-            )
-            raise
-        except APIError as e:
-            self.logger.error(f"Stripe API error creating checkout session: {str(e)}")
-            raise
+                "mode": "subscription",
+                "customer": customuser_stripe_id,
+            },
+        )
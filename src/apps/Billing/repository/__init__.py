@@ -1 +1,3 @@
+from .PlanFeatureRepository import PlanFeatureRepository
+from .QuotaRepository import QuotaRepository
 from .StripeRepository import StripeRepository
@@ -0,0 +1,32 @@
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = "price_catalogue_version"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class PriceCatalogueService:
+    """
+    Rendered price lists cached under the catalogue version. Changing a
+    price, plan, period or currency bumps the version, so the old entries
+    are never read again and expire by themselves.
+    """
+
+    def get_version(self):
+        # A timestamp, not a counter, so a version lost by the cache never
+        # points to entries rendered before.
+        return cache.get_or_set(VERSION_KEY, time.time_ns, None)
+
+    def invalidate(self):
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+    def execute(self, version, variant, render):
+        key = f"price_catalogue__{version}__{variant}"
+        data = cache.get(key)
+
+        if data is None:
+            data = render()
+            cache.set(key, data, CACHE_TIMEOUT)
+
+        return data
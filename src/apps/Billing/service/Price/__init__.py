@@ -0,0 +1 @@
+from .PriceCatalogueService import PriceCatalogueService
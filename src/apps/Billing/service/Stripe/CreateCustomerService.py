@@ -2,5 +2,5 @@ from .BaseStripeService import BaseStripeService
 
 
 class CreateCustomerService(BaseStripeService):
-    def execute(self, name, email, phone):
-        return self.stripe_repo.create_customer(name, email, phone)
+    def execute(self, name, email, phone, idempotency_key=None):
+        return self.stripe_repo.create_customer(name, email, phone, idempotency_key)
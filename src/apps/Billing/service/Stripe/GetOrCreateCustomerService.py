@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.utils.timezone import now
+
+from apps.Authentication.models import CustomUser
+from apps.Billing.models import StripeCustomerOutbox
+
+from .CreateCustomerService import CreateCustomerService
+
+
+class GetOrCreateCustomerService:
+    """
+    Return the stripe customer id of a user, creating the customer when the
+    outbox worker did not do it yet. The outbox row is locked during the
+    call and its idempotency key is sent, so stripe never gets two
+    customers for the same user.
+    """
+
+    def execute(self, user_id, wait=True):
+        """
+        With ``wait=False`` a creation already running elsewhere is skipped
+        and None is returned. Failures are recorded on the outbox by the
+        worker, here they would be rolled back with the request.
+        """
+        with transaction.atomic():
+            outbox, _ = StripeCustomerOutbox.objects.get_or_create(user_id=user_id)
+            outbox = (
+                StripeCustomerOutbox.objects.select_for_update(skip_locked=not wait)
+                .filter(id=outbox.id)
+                .first()
+            )
+            if outbox is None:
+                return None
+
+            user = CustomUser.objects.select_related("participant").get(id=user_id)
+
+            if not user.strip_customer_id:
+                user.strip_customer_id = self._create_customer(user, outbox)
+                user.save(update_fields=["strip_customer_id"])
+
+            if outbox.processed_at is None:
+                outbox.processed_at = now()
+                outbox.last_error = None
+                outbox.save(update_fields=["processed_at", "last_error"])
+
+            return user.strip_customer_id
+
+    def _create_customer(self, user, outbox):
+        participant = user.participant
+        return (
+            CreateCustomerService()
+            .execute(
+                name=f"{participant.first_name} {participant.last_name}",
+                email=user.email,
+                phone=user.phone,
+                idempotency_key=f"customer-{outbox.idempotency_key}",
+            )
+            .id
+        )
@@ -0,0 +1,160 @@
+import logging
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.utils.timezone import now
+
+from apps.Authentication.models import CustomUser
+from apps.Billing.models import Price, Subscription
+from apps.Common.models import StatusSuscription
+
+# Stripe subscription status -> our status
+STATUS = {
+    "incomplete": StatusSuscription.INCOMPLETE,
+    "trialing": StatusSuscription.ACTIVE,
+    "active": StatusSuscription.ACTIVE,
+    "past_due": StatusSuscription.PAST_DUE,
+    "unpaid": StatusSuscription.PAST_DUE,
+}
+
+
+class ProcessStripeEventService:
+    """
+    Apply a stored stripe event to the subscription state machine. Events
+    older than the last one applied to a subscription are skipped, so
+    replays and late deliveries never move a subscription back.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def execute(self, event):
+        handler = {
+            "customer.subscription.created": self._apply_subscription,
+            "customer.subscription.updated": self._apply_subscription,
+            "customer.subscription.deleted": self._apply_subscription,
+            "invoice.paid": self._renew_subscription,
+            "invoice.payment_failed": self._mark_past_due,
+        }.get(event.event_type)
+
+        if handler is None:
+            self.logger.info(f"Unhandled event type {event.event_type}")
+        else:
+            handler(event.payload["data"]["object"], event.created)
+
+        event.processed_at = now()
+        event.last_error = None
+        event.save(update_fields=["processed_at", "last_error"])
+
+    def _apply_subscription(self, session, event_created):
+        item = session["items"]["data"][0]
+        current_price = Price.objects.select_related("plan", "period").get(
+            stripe_price_id=item["price"]["id"]
+        )
+
+        subscription = self._get_subscription(session["id"], event_created)
+        if subscription is False:
+            return
+
+        if subscription is None:
+            subscription = Subscription(
+                stripe_subscription_id=session["id"],
+                user=CustomUser.objects.get(strip_customer_id=session["customer"]),
+                status=self._get_status(session),
+            )
+        else:
+            self._transition(subscription, self._get_status(session))
+
+        # Newer API versions moved the period to the subscription items
+        period_start = session.get("current_period_start") or item.get(
+            "current_period_start"
+        )
+        period_end = session.get("current_period_end") or item.get("current_period_end")
+        ended_at = session.get("ended_at")
+
+        subscription.price = current_price
+        subscription.start_date = self._to_datetime(session["start_date"])
+        subscription.end_date = self._to_datetime(ended_at).date() if ended_at else None
+        subscription.current_period_start = self._to_datetime(period_start)
+        subscription.current_period_end = self._to_datetime(period_end)
+        subscription.amount = item["price"]["unit_amount"]
+        subscription.currency_code = session["currency"]
+        subscription.plan_name = current_price.plan.name
+        subscription.period_name = current_price.period.name
+        subscription.last_event_at = event_created
+        subscription.save()
+
+    def _renew_subscription(self, invoice, event_created):
+        subscription = self._get_subscription(
+            self._get_invoice_subscription_id(invoice), event_created
+        )
+        if not subscription:
+            return
+
+        period = invoice["lines"]["data"][0]["period"]
+        self._transition(subscription, StatusSuscription.ACTIVE)
+        subscription.current_period_start = self._to_datetime(period["start"])
+        subscription.current_period_end = self._to_datetime(period["end"])
+        subscription.last_event_at = event_created
+        subscription.save(
+            update_fields=[
+                "status",
+                "current_period_start",
+                "current_period_end",
+                "last_event_at",
+            ]
+        )
+
+    def _mark_past_due(self, invoice, event_created):
+        subscription = self._get_subscription(
+            self._get_invoice_subscription_id(invoice), event_created
+        )
+        if not subscription:
+            return
+
+        self._transition(subscription, StatusSuscription.PAST_DUE)
+        subscription.last_event_at = event_created
+        subscription.save(update_fields=["status", "last_event_at"])
+
+    def _get_subscription(self, stripe_subscription_id, event_created):
+        """
+        Return the locked subscription, None when it does not exist yet and
+        False when the event is older than the last one applied.
+        """
+        subscription = (
+            Subscription.objects.select_for_update()
+            .filter(stripe_subscription_id=stripe_subscription_id)
+            .first()
+        )
+
+        if (
+            subscription
+            and subscription.last_event_at
+            and event_created < subscription.last_event_at
+        ):
+            self.logger.info(
+                f"Skipping stale event for subscription {stripe_subscription_id}"
+            )
+            return False
+
+        return subscription
+
+    def _transition(self, subscription, status):
+        if subscription.can_transition_to(status):
+            subscription.transition_to(status)
+        else:
+            self.logger.warning(
+                f"Ignoring transition of subscription {subscription.id} "
+                f"from {subscription.status} to {status}"
+            )
+
+    def _get_status(self, session):
+        return STATUS.get(session["status"], StatusSuscription.CANCELED)
+
+    def _get_invoice_subscription_id(self, invoice):
+        # Newer API versions moved it to the invoice parent
+        if invoice.get("subscription"):
+            return invoice["subscription"]
+        return invoice["parent"]["subscription_details"]["subscription"]
+
+    def _to_datetime(self, timestamp):
+        return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
@@ -1,18 +1,24 @@
+import json
 import logging
 from datetime import datetime
 from datetime import timezone as dt_timezone
 
 from django.conf import settings
+from django.db import transaction
 
-import stripe
 from rest_framework import status
 
-from apps.Authentication.models import CustomUser
-from apps.Billing.models import Price, Subscription
-from apps.Common.models import StatusSuscription
+from apps.Billing.models import StripeEvent
+from apps.Billing.tasks import process_stripe_events
 
 
 class StripeWebHookService:
+    """
+    Verify the event and store it, the processing is done by a worker so
+    stripe gets its answer right away. Events are keyed by their stripe id,
+    retried deliveries are ignored.
+    """
+
     logger = logging.getLogger(__name__)
 
     def execute(
@@ -20,8 +26,11 @@ class StripeWebHookService:
         payload,
         sig_header,
     ):
+        # Imported here like in StripeRepository, workers boot without it
+        import stripe
+
         try:
-            event = stripe.Webhook.construct_event(
+            stripe.Webhook.construct_event(
                 payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
             )
         except ValueError as e:
@@ -31,43 +40,37 @@ class StripeWebHookService:
             self.logger.error("Error verifying webhook signature: {}".format(str(e)))
             return status.HTTP_400_BAD_REQUEST
 
-        if event.type == "customer.subscription.created":
-            session = event["data"]["object"]
-            stripe_subscription_id = session["id"]
-            stripe_customuser_id = session["customer"]
-            stripe_price_id = session["items"]["data"][0]["price"]["id"]
-
-            current_price = Price.objects.get(stripe_price_id=stripe_price_id)
-            current_customer = CustomUser.objects.get(
-                strip_customer_id=stripe_customuser_id
-            )
+        event = json.loads(payload)
+        customer_id = self._get_customer_id(event)
 
-            Subscription.objects.create(
-                stripe_subscription_id=stripe_subscription_id,
-                user=current_customer,
-                price=current_price,
-                start_date=datetime.fromtimestamp(
-                    session["start_date"], tz=dt_timezone.utc
-                ),
-                current_period_start=datetime.fromtimestamp(
-                    session["current_period_start"], tz=dt_timezone.utc
-                ),
-                current_period_end=datetime.fromtimestamp(
-                    session["current_period_end"], tz=dt_timezone.utc
-                ),
-                status=StatusSuscription.ACTIVE,
-                amount=session["items"]["data"][0]["price"]["unit_amount"],
-                currency_code=session["currency"],
-                plan_name=current_price.plan.name,
-                period_name=current_price.period.name,
+        with transaction.atomic():
+            _, created = StripeEvent.objects.get_or_create(
+                stripe_event_id=event["id"],
+                defaults={
+                    "event_type": event["type"],
+                    "stripe_customer_id": customer_id,
+                    "payload": event,
+                    "created": datetime.fromtimestamp(
+                        event["created"], tz=dt_timezone.utc
+                    ),
+                },
             )
 
-        elif event.type == "customer.subscription.updated":
-            pass
-        elif event.type == "customer.subscription.deleted":
-            # canceled suscription
-            pass
-        else:
-            print("Unhandled event type {}".format(event.type))
+            if created:
+                transaction.on_commit(
+                    lambda: process_stripe_events.delay(
+                        customer_id=customer_id,
+                    )  # type: ignore
+                )
 
         return status.HTTP_200_OK
+
+    def _get_customer_id(self, event):
+        data = event["data"]["object"]
+        if data.get("object") == "customer":
+            return data.get("id")
+
+        customer = data.get("customer")
+        if isinstance(customer, dict):
+            return customer.get("id")
+        return customer
@@ -2,4 +2,6 @@ from .CreateCustomerService import CreateCustomerService
 from .CreatePriceService import CreatePriceService
 from .CreateProductService import CreateProductService
 from .CreateSessionService import CreateSessionService
+from .GetOrCreateCustomerService import GetOrCreateCustomerService
+from .ProcessStripeEventService import ProcessStripeEventService
 from .StripeWebHookService import StripeWebHookService
@@ -1 +1,2 @@
+from .Price import *
 from .Stripe import *
@@ -0,0 +1,43 @@
+from django.db.models import F
+
+from celery import shared_task
+
+from apps.Billing.models import StripeCustomerOutbox
+
+BATCH_SIZE = 100
+
+
+@shared_task(bind=True, max_retries=5)
+def create_stripe_customer(self, user_id):
+    """
+    Create the stripe customer of a user from its outbox row and store its
+    id on the user.
+    """
+    # Imported here, the services load the Billing tasks.
+    from apps.Billing.service import GetOrCreateCustomerService
+
+    try:
+        return GetOrCreateCustomerService().execute(user_id, wait=False)
+    except Exception as e:
+        StripeCustomerOutbox.objects.filter(user_id=user_id).update(
+            attempts=F("attempts") + 1,
+            last_error=str(e),
+        )
+        raise self.retry(countdown=2 ** (self.request.retries + 1), exc=e)
+
+
+@shared_task
+def create_pending_stripe_customers(batch_size=BATCH_SIZE):
+    """
+    Sweep the outbox rows not processed yet (lost or failed tasks) and
+    queue their creation.
+    """
+    user_ids = list(
+        StripeCustomerOutbox.objects.filter(processed_at__isnull=True)
+        .order_by("created_at")
+        .values_list("user_id", flat=True)[:batch_size]
+    )
+
+    for user_id in user_ids:
+        create_stripe_customer.delay(user_id=str(user_id))  # type: ignore
+    return len(user_ids)
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models import F
+
+from celery import shared_task
+
+from apps.Billing.models import StripeEvent
+
+BATCH_SIZE = 100
+# Events failing more times are left for manual review
+MAX_ATTEMPTS = 10
+
+
+@shared_task(bind=True, max_retries=5)
+def process_stripe_events(self, customer_id):
+    """
+    Process the pending events of a stripe customer in the order stripe
+    created them. The pending events are locked so the events of a
+    customer, or of no customer, are never applied by two workers at the
+    same time.
+    """
+    # Imported here, the services enqueue this task.
+    from apps.Billing.service import ProcessStripeEventService
+
+    service = ProcessStripeEventService()
+    processed = 0
+
+    with transaction.atomic():
+        # A worker waiting for the lock skips the events processed meanwhile
+        events = (
+            StripeEvent.objects.select_for_update()
+            .filter(
+                stripe_customer_id=customer_id,
+                processed_at__isnull=True,
+            )
+            .order_by("created", "received_at")
+        )
+
+        for event in events:
+            try:
+                with transaction.atomic():
+                    service.execute(event)
+                processed += 1
+            except Exception as e:
+                StripeEvent.objects.filter(id=event.id).update(
+                    attempts=F("attempts") + 1,
+                    last_error=str(e),
+                )
+                # Later events of the customer wait for this one.
+                break
+        else:
+            return processed
+
+    raise self.retry(countdown=2 ** (self.request.retries + 1))
+
+
+@shared_task
+def process_pending_stripe_events(batch_size=BATCH_SIZE):
+    """
+    Sweep the customers with pending events (lost or failed tasks) and
+    queue their processing.
+    """
+    customer_ids = list(
+        StripeEvent.objects.filter(
+            processed_at__isnull=True,
+            attempts__lt=MAX_ATTEMPTS,
+        )
+        .order_by()
+        .values_list("stripe_customer_id", flat=True)
+        .distinct()[:batch_size]
+    )
+
+    for customer_id in customer_ids:
+        process_stripe_events.delay(customer_id=customer_id)  # type: ignore
+    return len(customer_ids)
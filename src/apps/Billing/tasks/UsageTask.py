@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+from celery import shared_task
+
+from apps.Billing.models import Quota, Usage
+from apps.Billing.repository import QuotaRepository
+
+BATCH_SIZE = 500
+
+
+@shared_task
+def flush_quota_usage(batch_size=BATCH_SIZE):
+    """
+    Copy the quota counters changed in Redis into ``Usage``. Counters hold
+    the absolute usage of the period, so writing one twice is harmless.
+    """
+    repository = QuotaRepository()
+    counters = repository.pop_pending(batch_size)
+
+    if not counters:
+        return 0
+
+    quotas = dict(Quota.objects.values_list("code", "id"))
+
+    usages = []
+    for key, count in counters:
+        subscription_id, quota, period = repository.parse_key(key)
+        if quota not in quotas:
+            continue
+        usages.append(
+            Usage(
+                subscription_id=subscription_id,
+                quota_id=quotas[quota],
+                period_start=datetime.fromtimestamp(period, tz=timezone.utc),
+                count=count,
+            )
+        )
+
+    try:
+        Usage.objects.bulk_create(
+            usages,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["quota", "subscription", "period_start"],
+            update_fields=["count"],
+        )
+    except Exception:
+        # Keep the counters pending for the next run.
+        repository.mark_pending([key for key, _ in counters])
+        raise
+
+    return len(usages)
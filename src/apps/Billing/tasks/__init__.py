@@ -0,0 +1,9 @@
+from apps.Billing.tasks.StripeCustomerTask import (
+    create_pending_stripe_customers,
+    create_stripe_customer,
+)
+from apps.Billing.tasks.StripeEventTask import (
+    process_pending_stripe_events,
+    process_stripe_events,
+)
+from apps.Billing.tasks.UsageTask import flush_quota_usage
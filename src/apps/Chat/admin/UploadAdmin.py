@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from ..models import Upload
+
+
+@admin.register(Upload)
+class UploadAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "participant",
+        "file_name",
+        "content_type",
+        "size",
+        "offset",
+        "sha256",
+        "completed_at",
+    ]
+    ordering = ["-created_at"]
@@ -5,3 +5,4 @@ from .MessageAdmin import MessageAdmin
 from .MessageStatusAdmin import MessageStatusAdmin
 from .NatureAdmin import NatureAdmin
 from .ParticipantAdmin import ParticipantAdmin
+from .UploadAdmin import UploadAdmin
@@ -1,20 +1,27 @@
 import json
 
-from asgiref.sync import async_to_sync
+from django.core.serializers.json import DjangoJSONEncoder
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
-from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.exceptions import APIException, ValidationError
 
 from apps.Chat.api.v1.serializers import (
     BaseEventSerializer,
     DeleteMessageSerializer,
-    MessageDetailedSerializer,
+    MessageSerializer,
     ReactMessageSerializer,
     SeenSerializer,
     SendMessageSerializer,
     TypingSerializer,
 )
-from apps.Chat.models import Chat, Message
-from apps.Common.models import ConsumerCommand, MessageType
+from apps.Chat.models import Participant
+from apps.Chat.service import (
+    CheckChatMembershipService,
+    CreateMessageService,
+    MarkMessagesSeenService,
+)
+from apps.Common.models import MessageType
 
 EVENT_SERIALIZERS = {
     "send_message": SendMessageSerializer,
@@ -24,23 +31,28 @@ EVENT_SERIALIZERS = {
     "react_message": ReactMessageSerializer,
 }
 
+# Close codes of the rejected handshakes
+UNAUTHORIZED = 4401
+FORBIDDEN = 4403
+
 
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.user = self.scope["user"]  # type: ignore
-        chat_id = self.scope["url_route"]["kwargs"]["conversation_id"]  # type: ignore
-        chat = self.get_chat(chat_id)
+        self.chat_id = str(self.scope["url_route"]["kwargs"]["chat_id"])  # type: ignore
+        self.chat_room_socket__name = f"chat_room__{self.chat_id}"
 
-        if chat is None:
-            raise NotFound
+        if not self.user.is_authenticated:
+            await self.close(code=UNAUTHORIZED)
+            return
 
-        self.chat = chat
-        self.chat_room_socket__name = f"chat_room__{self.chat.id}"  # type: ignore
+        self.participant = await self.get_participant()
 
-        if not self.check_user_has_perm():
-            raise PermissionDenied
+        if self.participant is None or not await self.check_user_has_perm():
+            await self.close(code=FORBIDDEN)
+            return
 
-        async_to_sync(self.channel_layer.group_add)(
+        await self.channel_layer.group_add(
             self.chat_room_socket__name,
             self.channel_name,
         )
@@ -52,37 +64,109 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.channel_name,
         )
 
-    def receive(self, text_data):
-        data = json.loads(text_data)
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data or "")
+        except json.JSONDecodeError:
+            await self.send_event("error", "The event must be a JSON object")
+            return
+
+        try:
+            await self.handle_event(data)
+        except APIException as e:
+            await self.send_event("error", e.detail)
+
+    async def handle_event(self, data):
         base_serializer = BaseEventSerializer(data=data)
         base_serializer.is_valid(raise_exception=True)
 
         event_type = base_serializer.validated_data["type"]  # type: ignore
 
-        serializer_class = EVENT_SERIALIZERS[event_type]
-        serializer = serializer_class(data=data)
+        serializer = EVENT_SERIALIZERS[event_type](data=data)
         serializer.is_valid(raise_exception=True)
 
-        validated_data = serializer.validated_data
+        # delete_message and react_message are part of the protocol, they
+        # have no handler yet.
+        handler = getattr(self, f"on_{event_type}", None)
 
-        # TODO: create service for all this endpoints
-        # TODO: check if can receive multipartparses for images,files,videos
-        if event_type == ConsumerCommand.CREATE_MESSAGE:
-            return
+        if handler is None:
+            raise ValidationError(f'The "{event_type}" event is not implemented yet')
 
-        if event_type == ConsumerCommand.DELETE_MESSAGE:
-            return
+        await handler(serializer.validated_data)
 
-        if event_type == ConsumerCommand.UPDATE_MESSAGE:
-            return
+    async def on_send_message(self, data):
+        await database_sync_to_async(self.create_message)(data["content"])
 
-        raise ValidationError("There is no event type that match this request")
+    async def on_typing(self, data):
+        await self.channel_layer.group_send(
+            self.chat_room_socket__name,
+            {
+                "type": "chat_typing",
+                "sender": self.channel_name,
+                "data": {
+                    "participant": str(self.participant.id),
+                    "is_typing": data["is_typing"],
+                },
+            },
+        )
 
-    def get_chat(self, chat_id):
-        return Chat.objects.filter(id=chat_id).first()
+    async def on_seen(self, data):
+        message_id = str(data["message_id"])
 
+        await database_sync_to_async(MarkMessagesSeenService().execute)(
+            self.chat_id,
+            self.participant,
+            message_id,
+        )
+        await self.channel_layer.group_send(
+            self.chat_room_socket__name,
+            {
+                "type": "chat_seen",
+                "sender": self.channel_name,
+                "data": {
+                    "participant": str(self.participant.id),
+                    "message_id": message_id,
+                },
+            },
+        )
+
+    # Channel layer events
+
+    async def chat_message(self, event):
+        await self.send_event("chat_message", event["data"])
+
+    async def chat_typing(self, event):
+        if event["sender"] != self.channel_name:
+            await self.send_event("typing", event["data"])
+
+    async def chat_seen(self, event):
+        if event["sender"] != self.channel_name:
+            await self.send_event("seen", event["data"])
+
+    async def send_event(self, event_type, data):
+        await self.send(
+            text_data=json.dumps(
+                {"type": event_type, "data": data},
+                cls=DjangoJSONEncoder,
+            )
+        )
+
+    @database_sync_to_async
+    def get_participant(self):
+        return Participant.objects.filter(user=self.user).first()
+
+    @database_sync_to_async
     def check_user_has_perm(self):
-        return Chat.objects.filter(
-            id=self.chat.id,
-            chatparticipant__participant__user=self.user,
-        ).exists()
+        return CheckChatMembershipService().execute(self.chat_id, self.participant.id)
+
+    def create_message(self, content):
+        serializer = MessageSerializer(
+            data={
+                "chat": self.chat_id,
+                "message_type": MessageType.TEXT,
+                "content": content,
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+
+        CreateMessageService().execute(serializer, self.user)
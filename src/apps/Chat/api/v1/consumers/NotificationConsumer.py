@@ -1,8 +1,12 @@
 import json
 
-from asgiref.sync import async_to_sync
+from django.core.serializers.json import DjangoJSONEncoder
+
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+# Close code of the rejected handshakes
+UNAUTHORIZED = 4401
+
 
 class NotificationConsumer(AsyncWebsocketConsumer):
 
@@ -10,7 +14,11 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         self.user = self.scope["user"]  # type: ignore
         self.notification_socket_name = f"notification__{self.user.id}"  # type: ignore
 
-        async_to_sync(self.channel_layer.group_add)(
+        if not self.user.is_authenticated:
+            await self.close(code=UNAUTHORIZED)
+            return
+
+        await self.channel_layer.group_add(
             self.notification_socket_name,
             self.channel_name,
         )
@@ -28,3 +36,13 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         message = text_data_json["message"]
 
         await self.send(text_data=json.dumps({"message": message}))
+
+    # Channel layer events
+
+    async def chat_message(self, event):
+        await self.send(
+            text_data=json.dumps(
+                {"type": "chat_message", "data": event["data"]},
+                cls=DjangoJSONEncoder,
+            )
+        )
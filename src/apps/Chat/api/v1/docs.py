@@ -1,13 +1,18 @@
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 
 from apps.Chat.api.v1.serializers import (
+    AgentCatalogueSerializerInput,
     ChatSerializer,
     MessageDetailedSerializer,
     MessageSerializer,
     NatureSerializer,
     ParticipantSerializer,
+    RecommendAgentSerializerInput,
+    RecommendedAgentSerializer,
+    SearchParticipantSerializerInput,
     StartChatSerializerInput,
     StartChatSerializerResponseOutput,
+    UploadSerializer,
 )
 
 list_chats_doc = extend_schema(
@@ -59,13 +64,51 @@ list_participants_from_chat = extend_schema(
     },
 )
 
+list_agents_doc = extend_schema(
+    tags=["Agent"],
+    summary="List agents",
+    description=(
+        "Retrieves the agents with their natures and types, filtered by "
+        "nature (all of the given ones) and agent type. Served from the "
+        "cached agent catalogue, answers 304 when If-None-Match has the "
+        "ETag of the current catalogue."
+    ),
+    parameters=[AgentCatalogueSerializerInput],
+    responses={
+        200: OpenApiResponse(
+            response=ParticipantSerializer(many=True),
+            description="List of agents retrieved successfully",
+        ),
+        304: OpenApiResponse(description="Not modified"),
+    },
+)
+
+recommend_agents_doc = extend_schema(
+    tags=["Agent"],
+    summary="Recommend agents",
+    description=(
+        "Ranks the agents by weighted overlap with the given natures. "
+        "Without natures, the natures of the agents the user already chats "
+        "with are weighted by how often they appear, and those agents are "
+        "left out."
+    ),
+    parameters=[RecommendAgentSerializerInput],
+    responses={
+        200: OpenApiResponse(
+            response=RecommendedAgentSerializer(many=True),
+            description="Agents recommended successfully",
+        ),
+    },
+)
+
 list_natures_doc = extend_schema(
     tags=["Nature"],
     summary="List nature options",
     description=(
         "Retrieves a list of all available nature/chat types. "
         "Requires subscription and proper permissions. "
-        "No pagination applied."
+        "Served from the cached agent catalogue, answers 304 when "
+        "If-None-Match has the ETag of the current catalogue."
     ),
     responses={
         200: OpenApiResponse(
@@ -112,10 +155,33 @@ partial_update_message = extend_schema(
     },
 )
 
+message_media_doc = extend_schema(
+    tags=["Message"],
+    summary="Message Media",
+    description=(
+        "Download the file or a preview (poster, medium, small) of a message. "
+        "Supports Range, If-Range and If-None-Match requests."
+    ),
+    request=None,
+    responses={
+        (200, "application/octet-stream"): OpenApiResponse(
+            description="Whole file",
+        ),
+        (206, "application/octet-stream"): OpenApiResponse(
+            description="Requested byte range",
+        ),
+        304: OpenApiResponse(description="Not modified"),
+        416: OpenApiResponse(description="Range not satisfiable"),
+    },
+)
+
 list_participant_doc = extend_schema(
     tags=["Participant"],
     summary="List Participants",
-    description=("List all participant that the user have access to"),
+    description=(
+        "List all participant that the user have access to, ordered by "
+        "nickname and paginated with a cursor."
+    ),
     responses={
         200: OpenApiResponse(
             response=ParticipantSerializer(many=True),
@@ -123,3 +189,83 @@ list_participant_doc = extend_schema(
         )
     },
 )
+
+search_participant_doc = extend_schema(
+    tags=["Participant"],
+    summary="Search Participants",
+    description=(
+        "Typeahead search over the nickname, first and last name of the "
+        "participants, ranked by similarity. Participants that already share "
+        "a chat with the user are ranked higher unless boost_shared is false."
+    ),
+    parameters=[SearchParticipantSerializerInput],
+    responses={
+        200: OpenApiResponse(
+            response=ParticipantSerializer(many=True),
+            description="Participants found succesfully",
+        )
+    },
+)
+
+create_upload_doc = extend_schema(
+    tags=["Upload"],
+    summary="Start Upload",
+    description=(
+        "Start a resumable upload declaring the file name, content type and "
+        "total size. The chunks are sent afterwards to the chunk endpoint."
+    ),
+    request=UploadSerializer,
+    responses={
+        201: OpenApiResponse(
+            response=UploadSerializer,
+            description="Upload started succesfully",
+        )
+    },
+)
+
+retrieve_upload_doc = extend_schema(
+    tags=["Upload"],
+    summary="Retrieve Upload",
+    description=(
+        "Retrieve the state of an upload. The offset tells the client from "
+        "which byte it has to resume."
+    ),
+    responses={
+        200: OpenApiResponse(
+            response=UploadSerializer,
+            description="Upload retrieved succesfully",
+        )
+    },
+)
+
+upload_chunk_doc = extend_schema(
+    tags=["Upload"],
+    summary="Upload Chunk",
+    description=(
+        "Append the raw request body to the upload. The Upload-Offset header "
+        "must match the current offset of the upload."
+    ),
+    request={"application/octet-stream": bytes},
+    responses={
+        200: OpenApiResponse(
+            response=UploadSerializer,
+            description="Chunk stored succesfully",
+        )
+    },
+)
+
+complete_upload_doc = extend_schema(
+    tags=["Upload"],
+    summary="Complete Upload",
+    description=(
+        "Assemble the upload into a file keyed by its content hash. The "
+        "upload id can then be sent when creating a message."
+    ),
+    request=None,
+    responses={
+        200: OpenApiResponse(
+            response=UploadSerializer,
+            description="Upload completed succesfully",
+        )
+    },
+)
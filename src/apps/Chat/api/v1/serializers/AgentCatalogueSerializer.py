@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+from apps.Common.models import AgentType, NatureType
+
+from .NatureSerializer import NatureSerializer
+from .ParticipantSerializer import ParticipantSerializer
+
+
+class AgentCatalogueSerializerInput(serializers.Serializer):
+    nature = serializers.ListField(
+        child=serializers.ChoiceField(choices=NatureType.choices),
+        required=False,
+        default=list,
+    )
+    agent_type = serializers.ChoiceField(
+        choices=AgentType.choices,
+        required=False,
+        default=None,
+    )
+
+
+class RecommendAgentSerializerInput(serializers.Serializer):
+    nature = serializers.ListField(
+        child=serializers.ChoiceField(choices=NatureType.choices),
+        required=False,
+        default=list,
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class AgentCatalogueSerializer(serializers.Serializer):
+    natures = NatureSerializer(many=True)
+    agents = ParticipantSerializer(many=True)
+
+
+class RecommendedAgentSerializer(ParticipantSerializer):
+    score = serializers.IntegerField()
+
+    class Meta(ParticipantSerializer.Meta):
+        fields = ParticipantSerializer.Meta.fields + ["score"]
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.Chat.models import Agent, Nature
+from apps.Chat.models import Agent
 from apps.Common.models import AgentType, FeatureCode
 
 from .NatureSerializer import ChipNatureSerializer
@@ -13,7 +13,7 @@ PERMISSION = {
 
 
 class AgentSerializer(serializers.ModelSerializer):
-    natures = ChipNatureSerializer(Nature.objects.all())
+    natures = ChipNatureSerializer(read_only=True)
     has_permission = serializers.SerializerMethodField()
 
     class Meta:
@@ -26,10 +26,13 @@ class AgentSerializer(serializers.ModelSerializer):
         ]
 
     def get_has_permission(self, obj):
-        if (
-            self.context["request"]
-            .user.get_last_valid_subscription()
-            .has_feature(PERMISSION[obj.agent_type])
-        ):
-            return True
-        return False
+        return PERMISSION[obj.agent_type] in self.get_entitled_features()
+
+    def get_entitled_features(self):
+        # Resolved once per request and kept in the shared context, a list
+        # of agents would otherwise look up the subscription per row.
+        if "entitled_features" not in self.context:
+            self.context["entitled_features"] = self.context[
+                "request"
+            ].user.get_features()
+        return self.context["entitled_features"]
@@ -1,3 +1,5 @@
+from django.utils.functional import cached_property
+
 from rest_framework import serializers
 
 from apps.Chat.models import Chat, ChatParticipant, Message, Participant
@@ -61,10 +63,25 @@ class ChatDetailedSerializer(serializers.ModelSerializer):
             "metadata",
         ]
 
+    # Built once per list, building the fields of a serializer per chat
+    # costs more than rendering it
+    @cached_property
+    def message_serializer(self):
+        return BasicMessageSerializer()
+
+    @cached_property
+    def chat_participant_serializer(self):
+        return ChatParticipantSerializer()
+
     def get_last_message(self, obj):
-        message = obj.message_set.select_related("participant").first()
+        last_messages = self.context.get("last_messages")
+
+        if last_messages is None:
+            message = obj.message_set.select_related("participant").first()
+        else:
+            message = last_messages.get(obj.last_message_id)
 
-        return BasicMessageSerializer(message).data if message else None
+        return self.message_serializer.to_representation(message) if message else None
 
     def get_metadata(self, obj):
         request = self.context.get("request")
@@ -72,12 +89,15 @@ class ChatDetailedSerializer(serializers.ModelSerializer):
         if request is None:
             return None
 
-        chat_participant = obj.chatparticipant_set.filter(
-            participant=request.user.participant
-        ).first()
+        if hasattr(obj, "own_chat_participants"):
+            chat_participant = next(iter(obj.own_chat_participants), None)
+        else:
+            chat_participant = obj.chatparticipant_set.filter(
+                participant=request.user.participant
+            ).first()
 
         return (
-            ChatParticipantSerializer(chat_participant).data
+            self.chat_participant_serializer.to_representation(chat_participant)
             if chat_participant
             else None
         )
@@ -9,7 +9,8 @@ class BaseEventSerializer(serializers.Serializer):
             "seen",
             "delete_message",
             "react_message",
-        ]
+        ],
+        error_messages={"invalid_choice": 'Unsupported event type "{input}".'},
     )
 
 
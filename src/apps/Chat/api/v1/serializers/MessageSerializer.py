@@ -1,10 +1,25 @@
+from django.urls import reverse
+
 from rest_framework import serializers
 
-from apps.Chat.models import Message
+from apps.Chat.models import Message, Upload
+from apps.Common.models import MessageType
+
+UPLOAD_FIELDS = {
+    MessageType.IMAGE: ("image", "image/"),
+    MessageType.FILE: ("attach", ""),
+    MessageType.VIDEO: ("video", "video/"),
+}
 
 
 class MessageDetailedSerializer(serializers.ModelSerializer):
+    # A string, the data is also sent through the channel layer
+    participant = serializers.PrimaryKeyRelatedField(
+        read_only=True,
+        pk_field=serializers.UUIDField(),
+    )
     seen = serializers.SerializerMethodField()
+    previews = serializers.SerializerMethodField()
 
     class Meta:
         model = Message
@@ -16,10 +31,25 @@ class MessageDetailedSerializer(serializers.ModelSerializer):
             "image",
             "attach",
             "video",
+            "width",
+            "height",
+            "blurhash",
+            "previews",
             "sent_at",
             "seen",
         ]
 
+    def get_previews(self, obj):
+        request = self.context.get("request")
+        previews = {}
+
+        # Served by the media action, with the membership check of the file
+        for variant in obj.previews:
+            url = reverse("message-media", kwargs={"pk": obj.id, "variant": variant})
+            previews[variant] = request.build_absolute_uri(url) if request else url
+
+        return previews
+
     def get_seen(self, obj):
         request = self.context.get("request")
 
@@ -36,6 +66,11 @@ class MessageDetailedSerializer(serializers.ModelSerializer):
 
 class MessageSerializer(serializers.ModelSerializer):
     participant = serializers.PrimaryKeyRelatedField(read_only=True)
+    upload = serializers.PrimaryKeyRelatedField(
+        queryset=Upload.objects.filter(completed_at__isnull=False),
+        write_only=True,
+        required=False,
+    )
 
     class Meta:
         model = Message
@@ -48,4 +83,41 @@ class MessageSerializer(serializers.ModelSerializer):
             "image",
             "attach",
             "video",
+            "upload",
         ]
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        upload = attrs.get("upload")
+
+        if upload is None:
+            return attrs
+
+        request = self.context.get("request")
+        if request is None or upload.participant_id != request.user.participant.id:
+            raise serializers.ValidationError(
+                {"upload": "The upload does not belong to the participant"}
+            )
+
+        message_type = attrs.get("message_type")
+        if message_type not in UPLOAD_FIELDS:
+            raise serializers.ValidationError(
+                {"upload": "This message type does not accept uploads"}
+            )
+
+        _, content_type_prefix = UPLOAD_FIELDS[message_type]
+        if not upload.content_type.startswith(content_type_prefix):
+            raise serializers.ValidationError(
+                {"upload": "The upload content type does not match the message type"}
+            )
+
+        return attrs
+
+    def create(self, validated_data):
+        upload = validated_data.pop("upload", None)
+
+        if upload is not None:
+            field_name, _ = UPLOAD_FIELDS[validated_data["message_type"]]
+            validated_data[field_name] = upload.file.name
+
+        return super().create(validated_data)
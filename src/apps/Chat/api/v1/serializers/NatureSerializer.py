@@ -17,4 +17,5 @@ class ChipNatureSerializer(serializers.ListSerializer):
     child = serializers.CharField()
 
     def to_representation(self, data):
-        return list(data.values_list("name", flat=True))
+        # all() keeps the prefetched natures, values_list would query again
+        return [nature.name for nature in data.all()]
@@ -5,8 +5,14 @@ from apps.Chat.models import Participant
 from .AgentSerializer import AgentSerializer
 
 
+class SearchParticipantSerializerInput(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=150)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
+    boost_shared = serializers.BooleanField(default=True)
+
+
 class ParticipantSerializer(serializers.ModelSerializer):
-    details = serializers.SerializerMethodField()
+    details = AgentSerializer(source="agent", read_only=True, allow_null=True)
 
     class Meta:
         model = Participant
@@ -21,11 +27,3 @@ class ParticipantSerializer(serializers.ModelSerializer):
             "participant_status",
             "details",
         ]
-
-    def get_details(self, obj):
-        if obj.agent:
-            return AgentSerializer(
-                obj.agent,
-                context={"request": self.context["request"]},
-            ).data
-        return None
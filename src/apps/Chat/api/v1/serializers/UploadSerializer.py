@@ -0,0 +1,33 @@
+from django.conf import settings
+
+from rest_framework import serializers
+
+from apps.Chat.models import Upload
+
+
+class UploadSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Upload
+        fields = [
+            "id",
+            "file_name",
+            "content_type",
+            "size",
+            "offset",
+            "sha256",
+            "completed_at",
+        ]
+        read_only_fields = [
+            "id",
+            "offset",
+            "sha256",
+            "completed_at",
+        ]
+
+    def validate_size(self, value):
+        if value <= 0 or value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                "The size of the file is out of the allowed range"
+            )
+        return value
@@ -1,3 +1,9 @@
+from apps.Chat.api.v1.serializers.AgentCatalogueSerializer import (
+    AgentCatalogueSerializer,
+    AgentCatalogueSerializerInput,
+    RecommendAgentSerializerInput,
+    RecommendedAgentSerializer,
+)
 from apps.Chat.api.v1.serializers.AgentSerializer import AgentSerializer
 from apps.Chat.api.v1.serializers.ChatSerializer import (
     ChatDetailedSerializer,
@@ -21,4 +27,8 @@ from apps.Chat.api.v1.serializers.NatureSerializer import (
     ChipNatureSerializer,
     NatureSerializer,
 )
-from apps.Chat.api.v1.serializers.ParticipantSerializer import ParticipantSerializer
+from apps.Chat.api.v1.serializers.ParticipantSerializer import (
+    ParticipantSerializer,
+    SearchParticipantSerializerInput,
+)
+from apps.Chat.api.v1.serializers.UploadSerializer import UploadSerializer
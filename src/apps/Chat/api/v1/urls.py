@@ -2,13 +2,22 @@ from django.urls import include, path
 
 from rest_framework.routers import DefaultRouter
 
-from apps.Chat.api.v1.views import ChatView, MessageView, NatureView, ParticipantView
+from apps.Chat.api.v1.views import (
+    AgentView,
+    ChatView,
+    MessageView,
+    NatureView,
+    ParticipantView,
+    UploadView,
+)
 
 router = DefaultRouter()
+router.register(r"agents", AgentView, basename="agent")
 router.register(r"chats", ChatView, basename="chat")
 router.register(r"messages", MessageView, basename="message")
 router.register(r"natures", NatureView, basename="nature")
 router.register(r"participants", ParticipantView, basename="participant")
+router.register(r"uploads", UploadView, basename="upload")
 
 
 urlpatterns = [
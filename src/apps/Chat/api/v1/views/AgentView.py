@@ -0,0 +1,104 @@
+from collections import Counter
+
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.Authorization.permissions import CustomPermission, SubscriptionPermission
+from apps.Chat.api.v1.docs import list_agents_doc, recommend_agents_doc
+from apps.Chat.api.v1.serializers import (
+    AgentCatalogueSerializer,
+    AgentCatalogueSerializerInput,
+    ParticipantSerializer,
+    RecommendAgentSerializerInput,
+)
+from apps.Chat.api.v1.serializers.AgentSerializer import PERMISSION
+from apps.Chat.models import Nature, Participant
+from apps.Chat.service import AgentCatalogueService, RecommendAgentService
+from apps.Common.responses import catalogue_response, get_query_variant
+
+
+def render_catalogue():
+    return AgentCatalogueSerializer(
+        {
+            "natures": Nature.objects.order_by("name"),
+            "agents": Participant.objects.filter(agent__isnull=False)
+            .select_related("agent")
+            .prefetch_related("agent__natures")
+            .order_by("nickname", "id"),
+        },
+        # has_permission depends on the user, it is set when serving
+        context={"entitled_features": frozenset()},
+    ).data
+
+
+class AgentView(viewsets.GenericViewSet, mixins.ListModelMixin):
+    queryset = Participant.objects.filter(agent__isnull=False)
+    serializer_class = ParticipantSerializer
+    permission_classes = [SubscriptionPermission, CustomPermission]
+
+    @list_agents_doc
+    def list(self, request, *args, **kwargs):
+        serializer = AgentCatalogueSerializerInput(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        features = request.user.get_features()
+        catalogue = AgentCatalogueService()
+        version = catalogue.get_version()
+
+        def get_data():
+            agents = catalogue.filter_agents(
+                catalogue.execute(version, render_catalogue),
+                natures=serializer.validated_data["nature"],  # type: ignore
+                agent_type=serializer.validated_data["agent_type"],  # type: ignore
+            )
+            page = self.paginate_queryset(agents)
+            return self.get_paginated_response(
+                [self._set_permission(agent, features) for agent in page]  # type: ignore
+            ).data
+
+        return catalogue_response(
+            request,
+            version,
+            get_query_variant(self, sorted(features), params=serializer.fields),
+            get_data,
+            public=False,
+        )
+
+    @recommend_agents_doc
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[SubscriptionPermission],
+    )
+    def recommendations(self, request):
+        serializer = RecommendAgentSerializerInput(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        natures = serializer.validated_data["nature"]  # type: ignore
+        service = RecommendAgentService()
+
+        if natures:
+            weights, exclude = Counter(natures), set()
+        else:
+            weights, exclude = service.get_history_weights(request.user.participant)
+
+        catalogue = AgentCatalogueService()
+        recommended = service.execute(
+            catalogue.execute(catalogue.get_version(), render_catalogue),
+            weights,
+            exclude=exclude,
+            limit=serializer.validated_data["limit"],  # type: ignore
+        )
+
+        features = request.user.get_features()
+        data = [
+            {**self._set_permission(agent, features), "score": score}
+            for agent, score in recommended
+        ]
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _set_permission(self, agent, features):
+        has_permission = PERMISSION[agent["details"]["agent_type"]] in features
+        return {
+            **agent,
+            "details": {**agent["details"], "has_permission": has_permission},
+        }
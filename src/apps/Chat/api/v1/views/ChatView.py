@@ -1,3 +1,5 @@
+from django.db.models import Prefetch
+
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -30,7 +32,20 @@ class ChatView(viewsets.GenericViewSet, mixins.ListModelMixin):
     pagination_class = ChatPagination
 
     def get_queryset(self):
-        return Chat.objects.all_user_chats(self.request.user)
+        queryset = Chat.objects.all_user_chats(self.request.user)
+
+        if self.action == "list":
+            queryset = queryset.with_last_message_id().prefetch_related(
+                Prefetch(
+                    "chatparticipant_set",
+                    queryset=ChatParticipant.objects.filter(
+                        participant__user=self.request.user
+                    ),
+                    to_attr="own_chat_participants",
+                )
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -40,7 +55,16 @@ class ChatView(viewsets.GenericViewSet, mixins.ListModelMixin):
 
     @list_chats_doc
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+
+        # The last messages of the whole page in a single query
+        context = self.get_serializer_context()
+        context["last_messages"] = Message.objects.select_related(
+            "participant"
+        ).in_bulk([chat.last_message_id for chat in page if chat.last_message_id])
+
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
 
     @start_chat_doc
     @action(
@@ -106,7 +130,11 @@ class ChatView(viewsets.GenericViewSet, mixins.ListModelMixin):
         ).exists():
             raise PermissionDenied()
 
-        queryset = Participant.objects.filter(chatparticipant__chat=chat)
+        queryset = (
+            Participant.objects.filter(chatparticipant__chat=chat)
+            .select_related("agent")
+            .prefetch_related("agent__natures")
+        )
         serializer = ParticipantSerializer(
             queryset,
             many=True,
@@ -1,11 +1,18 @@
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
 
 from apps.Authorization.permissions import CustomPermission, SubscriptionPermission
-from apps.Chat.api.v1.docs import create_message, partial_update_message, update_message
+from apps.Chat.api.v1.docs import (
+    create_message,
+    message_media_doc,
+    partial_update_message,
+    update_message,
+)
 from apps.Chat.api.v1.serializers import MessageSerializer
 from apps.Chat.models import Message
-from apps.Chat.service import CreateMessageService
+from apps.Chat.service import CreateMessageService, GetMessageMediaService
 from apps.Common.pagination import MessagePagination
+from apps.Common.responses import media_response
 
 
 class MessageView(
@@ -19,10 +26,9 @@ class MessageView(
     pagination_class = MessagePagination
 
     def perform_create(self, serializer):
-        user = self.request.user
         CreateMessageService().execute(
             serializer,
-            user,
+            self.request.user,
         )
 
     @create_message
@@ -36,3 +42,19 @@ class MessageView(
     @partial_update_message
     def partial_update(self, request, *args, **kwargs):
         return super().partial_update(request, *args, **kwargs)
+
+    @message_media_doc
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"media/(?P<variant>[a-z]+)",
+        permission_classes=[SubscriptionPermission],
+    )
+    def media(self, request, pk=None, variant=None):
+        # Access is granted by chat membership, checked by the service.
+        storage, name, content_type, etag = GetMessageMediaService().execute(
+            message_id=pk,
+            variant=variant,
+            participant=request.user.participant,
+        )
+        return media_response(request, storage, name, content_type, etag)
@@ -4,6 +4,10 @@ from apps.Authorization.permissions import CustomPermission, SubscriptionPermiss
 from apps.Chat.api.v1.docs import list_natures_doc
 from apps.Chat.api.v1.serializers import NatureSerializer
 from apps.Chat.models import Nature
+from apps.Chat.service import AgentCatalogueService
+from apps.Common.responses import catalogue_response, get_query_variant
+
+from .AgentView import render_catalogue
 
 
 class NatureView(viewsets.GenericViewSet, mixins.ListModelMixin):
@@ -13,4 +17,19 @@ class NatureView(viewsets.GenericViewSet, mixins.ListModelMixin):
 
     @list_natures_doc
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        catalogue = AgentCatalogueService()
+        version = catalogue.get_version()
+
+        def get_data():
+            natures = catalogue.execute(version, render_catalogue)["natures"]
+            return self.get_paginated_response(
+                self.paginate_queryset(natures)  # type: ignore
+            ).data
+
+        return catalogue_response(
+            request,
+            version,
+            get_query_variant(self),
+            get_data,
+            public=False,
+        )
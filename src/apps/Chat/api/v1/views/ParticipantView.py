@@ -1,18 +1,49 @@
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from apps.Authorization.permissions import CustomPermission, SubscriptionPermission
-from apps.Chat.api.v1.docs import list_participant_doc
-from apps.Chat.api.v1.serializers import ParticipantSerializer
+from apps.Chat.api.v1.docs import list_participant_doc, search_participant_doc
+from apps.Chat.api.v1.serializers import (
+    ParticipantSerializer,
+    SearchParticipantSerializerInput,
+)
 from apps.Chat.models import Participant
+from apps.Chat.service import SearchParticipantService
+from apps.Common.pagination import ParticipantPagination
 
 
 class ParticipantView(viewsets.GenericViewSet, mixins.ListModelMixin):
-    queryset = Participant.objects.all()
+    queryset = Participant.objects.select_related("agent").prefetch_related(
+        "agent__natures"
+    )
     serializer_class = ParticipantSerializer
     permission_classes = [SubscriptionPermission, CustomPermission]
     filterset_fields = ["participant_type"]
-    search_fields = ["nickname"]
+    pagination_class = ParticipantPagination
 
     @list_participant_doc
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @search_participant_doc
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[SubscriptionPermission],
+    )
+    def search(self, request):
+        serializer = SearchParticipantSerializerInput(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        participants = SearchParticipantService().execute(
+            participant=request.user.participant,
+            term=serializer.validated_data["q"],  # type: ignore
+            limit=serializer.validated_data["limit"],  # type: ignore
+            boost_shared=serializer.validated_data["boost_shared"],  # type: ignore
+        )
+        response = ParticipantSerializer(
+            participants,
+            many=True,
+            context={"request": request},
+        )
+        return Response(response.data, status=status.HTTP_200_OK)
@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.Authorization.permissions import CustomPermission, SubscriptionPermission
+from apps.Chat.api.v1.docs import (
+    complete_upload_doc,
+    create_upload_doc,
+    retrieve_upload_doc,
+    upload_chunk_doc,
+)
+from apps.Chat.api.v1.serializers import UploadSerializer
+from apps.Chat.models import Upload
+from apps.Chat.service import AppendUploadChunkService, CompleteUploadService
+
+
+# The chunks are written outside of a transaction, AppendUploadChunkService
+# commits the offset on its own.
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class UploadView(
+    viewsets.GenericViewSet,
+    mixins.CreateModelMixin,
+):
+    serializer_class = UploadSerializer
+    permission_classes = [SubscriptionPermission, CustomPermission]
+
+    def get_queryset(self):
+        return Upload.objects.filter(participant=self.request.user.participant)
+
+    def perform_create(self, serializer):
+        serializer.save(participant=self.request.user.participant)
+
+    @create_upload_doc
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @retrieve_upload_doc
+    def retrieve(self, request, pk=None):
+        # Ownership is enforced by the queryset, the upload is looked up
+        # directly so clients can poll the offset to resume.
+        upload = get_object_or_404(self.get_queryset(), pk=pk)
+        return Response(
+            UploadSerializer(upload).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @upload_chunk_doc
+    @action(
+        detail=True,
+        methods=["put"],
+        parser_classes=[],
+    )
+    def chunk(self, request, pk=None):
+        # The body is streamed straight to disk, request.data must not be
+        # accessed here or the whole chunk would be buffered in memory.
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.headers.get("Content-Length", ""))
+        except ValueError:
+            raise ValidationError(
+                "Upload-Offset and Content-Length headers are required"
+            )
+
+        upload = AppendUploadChunkService().execute(
+            upload_id=pk,
+            participant=request.user.participant,
+            stream=request.stream,
+            offset=offset,
+            length=length,
+        )
+        return Response(
+            UploadSerializer(upload).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @complete_upload_doc
+    @action(
+        detail=True,
+        methods=["post"],
+    )
+    def complete(self, request, pk=None):
+        upload = CompleteUploadService().execute(
+            upload_id=pk,
+            participant=request.user.participant,
+        )
+        return Response(
+            UploadSerializer(upload).data,
+            status=status.HTTP_200_OK,
+        )
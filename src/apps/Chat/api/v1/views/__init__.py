@@ -1,4 +1,6 @@
+from .AgentView import AgentView
 from .ChatView import ChatView
 from .MessageView import MessageView
 from .NatureView import NatureView
 from .ParticipantView import ParticipantView
+from .UploadView import UploadView
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import Count, Q
+from django.db.models import Count, OuterRef, Q, Subquery
 from django.utils.translation import gettext_lazy as _
 
 from apps.Common.models import (
@@ -8,6 +8,7 @@ from apps.Common.models import (
     CustomModel,
     ParticipantType,
 )
+from apps.Common.storage import content_addressed_storage
 
 
 class ChatQuerySet(ActivatorQuerySet):
@@ -34,6 +35,18 @@ class ChatQuerySet(ActivatorQuerySet):
             ),
         )
 
+    def with_last_message_id(self):
+        # Imported here, the message model depends on this one.
+        from .Message import Message
+
+        return self.annotate(
+            last_message_id=Subquery(
+                Message.objects.filter(chat=OuterRef("pk"))
+                .order_by("-sent_at")
+                .values("id")[:1]
+            )
+        )
+
     def all_user_chats(self, current_user):
         return self.active().filter(chatparticipant__participant__user=current_user)
 
@@ -126,6 +139,7 @@ class Chat(CustomModel):
     )
     photo = models.ImageField(
         upload_to="group_avatar/",
+        storage=content_addressed_storage,
         blank=True,
         null=True,
     )
@@ -149,3 +163,13 @@ class Chat(CustomModel):
 
     def check_participant_can_write(self, participant) -> bool:
         return self.chatparticipant_set.filter(participant=participant).exists()  # type: ignore
+
+    def get_agent_type(self):
+        """Agent type of the agent in the chat, None for chats between users."""
+        return (
+            self.chatparticipant_set.filter(  # type: ignore
+                participant__agent__isnull=False,
+            )
+            .values_list("participant__agent__agent_type", flat=True)
+            .first()
+        )
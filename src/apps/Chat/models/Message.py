@@ -1,8 +1,10 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from apps.Common.models import CustomModel, MessageStatusType, MessageType
+from apps.Common.storage import content_addressed_storage
 
 from .Chat import Chat
 from .Participant import Participant
@@ -29,16 +31,19 @@ class Message(CustomModel):
     )
     image = models.ImageField(
         _("Image attached"),
+        storage=content_addressed_storage,
         null=True,
         blank=True,
     )
     attach = models.FileField(
         _("File attached"),
+        storage=content_addressed_storage,
         null=True,
         blank=True,
     )
     video = models.FileField(
         _("Video attached"),
+        storage=content_addressed_storage,
         null=True,
         blank=True,
     )
@@ -46,6 +51,37 @@ class Message(CustomModel):
         _("Time the message was created"),
         auto_now_add=True,
     )
+    width = models.PositiveIntegerField(
+        _("Width of the image or video"),
+        null=True,
+        blank=True,
+    )
+    height = models.PositiveIntegerField(
+        _("Height of the image or video"),
+        null=True,
+        blank=True,
+    )
+    blurhash = models.CharField(
+        _("Blurhash placeholder of the image or video"),
+        max_length=100,
+        null=True,
+        blank=True,
+    )
+    previews = models.JSONField(
+        _("Storage names of the generated previews"),
+        default=dict,
+        blank=True,
+    )
+    preview_error = models.CharField(
+        _("Why the previews could not be generated"),
+        max_length=100,
+        null=True,
+        blank=True,
+    )
+    statuses_created = models.BooleanField(
+        _("Check if the statuses of the message were already created"),
+        default=False,
+    )
 
     class Meta:
         db_table = "CHAT_MESSAGE"
@@ -55,6 +91,11 @@ class Message(CustomModel):
         ordering = ["-sent_at"]
         indexes = [
             models.Index(fields=["message_type"]),
+            models.Index(
+                fields=["sent_at"],
+                condition=Q(statuses_created=False),
+                name="message_pending_statuses_idx",
+            ),
         ]
 
     def clean(self) -> None:
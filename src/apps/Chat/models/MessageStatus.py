@@ -32,3 +32,4 @@ class MessageStatus(CustomModel):
         verbose_name = _("Message Status")
         verbose_name_plural = _("Message Statuses")
         app_label = "Chat"
+        unique_together = ("participant", "message")
@@ -1,13 +1,55 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Greatest
 from django.utils.translation import gettext_lazy as _
 
-from apps.Common.models import CustomModel, ParticipantStatus, ParticipantType
+from apps.Common.models import (
+    ActivatorModelManager,
+    ActivatorQuerySet,
+    CustomModel,
+    ParticipantStatus,
+    ParticipantType,
+)
+from apps.Common.storage import content_addressed_storage
 
 from .Agent import Agent
 
+SEARCH_FIELDS = ["nickname", "first_name", "last_name"]
+
+
+class ParticipantQuerySet(ActivatorQuerySet):
+
+    def search(self, term):
+        """
+        Participants with a nickname, first or last name containing a word
+        similar to ``term``, annotated with the best similarity. The filter
+        is served by the trigram GIN index.
+        """
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f"{field}__trigram_word_similar": term})
+
+        return self.filter(condition).annotate(
+            similarity=Greatest(
+                *[TrigramWordSimilarity(term, field) for field in SEARCH_FIELDS]
+            )
+        )
+
+
+class ParticipantManager(ActivatorModelManager):
+    def get_queryset(self):
+        return ParticipantQuerySet(
+            self.model,
+            using=self._db,
+        )
+
+    def search(self, term):
+        return self.get_queryset().search(term)
+
 
 class Participant(CustomModel):
     participant_type = models.CharField(
@@ -41,6 +83,7 @@ class Participant(CustomModel):
     )
     avatar = models.ImageField(
         upload_to="participant_avatar/",
+        storage=content_addressed_storage,
         blank=True,
         null=True,
     )
@@ -50,11 +93,23 @@ class Participant(CustomModel):
         default=ParticipantStatus.EN_LINEA,
     )
 
+    objects: ParticipantManager = ParticipantManager()
+
     class Meta:
         db_table = "CHAT_PARTICIPANT"
         verbose_name = _("Participant")
         verbose_name_plural = _("Participants")
         app_label = "Chat"
+        indexes = [
+            # Cursor pagination of the directory
+            models.Index(fields=["nickname", "id"]),
+            # Needs the pg_trgm extension
+            GinIndex(
+                fields=SEARCH_FIELDS,
+                opclasses=["gin_trgm_ops"] * len(SEARCH_FIELDS),
+                name="participant_search_trgm_idx",
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 name="participant_user_xor_agent",
@@ -0,0 +1,68 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.Common.models import CustomModel
+from apps.Common.storage import content_addressed_storage
+
+from .Participant import Participant
+
+
+class Upload(CustomModel):
+    participant = models.ForeignKey(
+        Participant,
+        on_delete=models.CASCADE,
+    )
+    file_name = models.CharField(
+        _("Original name of the file"),
+        max_length=255,
+    )
+    content_type = models.CharField(
+        _("Mime type of the file"),
+        max_length=100,
+    )
+    size = models.PositiveBigIntegerField(
+        _("Total size of the file in bytes"),
+    )
+    offset = models.PositiveBigIntegerField(
+        _("Number of bytes already received"),
+        default=0,
+    )
+    sha256 = models.CharField(
+        _("Hash of the content of the file"),
+        max_length=64,
+        null=True,
+        blank=True,
+    )
+    file = models.FileField(
+        _("Assembled file"),
+        storage=content_addressed_storage,
+        null=True,
+        blank=True,
+    )
+    chunk_reserved_until = models.DateTimeField(
+        _("Time the chunk being written is released"),
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        _("Time the upload was started"),
+        auto_now_add=True,
+    )
+    completed_at = models.DateTimeField(
+        _("Time the upload was assembled"),
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        db_table = "CHAT_UPLOAD"
+        verbose_name = _("Upload")
+        verbose_name_plural = _("Uploads")
+        app_label = "Chat"
+        indexes = [
+            models.Index(fields=["sha256"]),
+        ]
+
+    @property
+    def is_completed(self) -> bool:
+        return self.completed_at is not None
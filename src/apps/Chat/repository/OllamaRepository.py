@@ -3,6 +3,8 @@ import logging
 import requests
 from rest_framework.exceptions import ValidationError
 
+from apps.Common.profiling import external_call
+
 
 class OllamaRepository:
     logger = logging.getLogger(__name__)
@@ -13,13 +15,14 @@ class OllamaRepository:
 
     def chat(self, messages):
         try:
-            response = requests.post(
-                url=f"{self.endpoint}/api/chat",
-                data={
-                    "model": self.model,
-                    "messages": messages,
-                },
-            )
+            with external_call("ollama"):
+                response = requests.post(
+                    url=f"{self.endpoint}/api/chat",
+                    data={
+                        "model": self.model,
+                        "messages": messages,
+                    },
+                )
             self.logger.info(response)
         except:
             raise ValidationError("Something went wront with the api call")
@@ -27,13 +30,14 @@ class OllamaRepository:
 
     def generate(self, prompt):
         try:
-            response = requests.post(
-                url=f"{self.endpoint}/api/generate",
-                data={
-                    "model": self.model,
-                    "prompt": prompt,
-                },
-            )
+            with external_call("ollama"):
+                response = requests.post(
+                    url=f"{self.endpoint}/api/generate",
+                    data={
+                        "model": self.model,
+                        "prompt": prompt,
+                    },
+                )
             self.logger.info(response)
         except:
             raise ValidationError("Something went wront with the api call")
@@ -0,0 +1,87 @@
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from apps.Common.models import NatureType
+
+VERSION_KEY = "agent_catalogue_version"
+CACHE_TIMEOUT = 60 * 60 * 24
+# Bit of each nature in the agent masks
+NATURE_BITS = {nature: 1 << bit for bit, nature in enumerate(NatureType.values)}
+
+
+class AgentCatalogueService:
+    """
+    Snapshot of the agents and natures, rendered once per version and kept
+    in the cache and in the memory of each process. Changing an agent, its
+    natures or its participant bumps the version.
+    """
+
+    # (version, catalogue) of this process
+    _snapshot = (None, None)
+
+    def get_version(self):
+        return cache.get_or_set(VERSION_KEY, time.time_ns, None)
+
+    def invalidate(self):
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+    def execute(self, version, render):
+        """
+        Return the catalogue of ``version``, a dict with the rendered
+        ``natures`` and ``agents``, the agent positions ``by_nature`` and
+        the nature bitset of each agent in ``masks``.
+        ``render`` builds the rendered data when nobody did it yet.
+        """
+        snapshot_version, catalogue = AgentCatalogueService._snapshot
+        if snapshot_version == version:
+            return catalogue
+
+        key = f"agent_catalogue__{version}"
+        data = cache.get(key)
+
+        if data is None:
+            data = render()
+            cache.set(key, data, CACHE_TIMEOUT)
+
+        by_nature = defaultdict(set)
+        masks = []
+        for position, agent in enumerate(data["agents"]):
+            mask = 0
+            for nature in agent["details"]["natures"]:
+                by_nature[nature].add(position)
+                mask |= NATURE_BITS.get(nature, 0)
+            masks.append(mask)
+
+        catalogue = {
+            **data,
+            "by_nature": {
+                nature: frozenset(positions) for nature, positions in by_nature.items()
+            },
+            "masks": masks,
+        }
+        AgentCatalogueService._snapshot = (version, catalogue)
+        return catalogue
+
+    def filter_agents(self, catalogue, natures=(), agent_type=None):
+        """Agents with all the ``natures`` and of ``agent_type``, if given."""
+        agents = catalogue["agents"]
+        positions = range(len(agents))
+
+        if natures:
+            positions = sorted(
+                frozenset.intersection(
+                    *[
+                        catalogue["by_nature"].get(nature, frozenset())
+                        for nature in natures
+                    ]
+                )
+            )
+
+        return [
+            agents[position]
+            for position in positions
+            if agent_type is None
+            or agents[position]["details"]["agent_type"] == agent_type
+        ]
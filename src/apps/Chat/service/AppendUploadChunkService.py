@@ -0,0 +1,119 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.timezone import now
+
+from rest_framework.exceptions import ValidationError
+
+from apps.Chat.models import Upload
+
+from .BaseUploadService import BaseUploadService
+
+# A chunk not written by then can be taken over by a retry of the client
+CHUNK_RESERVATION_TIMEOUT = timedelta(minutes=5)
+
+
+class AppendUploadChunkService(BaseUploadService):
+    """
+    The offset is checked and reserved under the row lock, the chunk is
+    written without a transaction and the new offset is saved afterwards,
+    so a slow client holds neither a lock nor a connection.
+    """
+
+    def execute(self, upload_id, participant, stream, offset, length):
+        upload = self._reserve_chunk(upload_id, participant, offset, length)
+        partial_path = self._get_partial_path(upload)
+
+        try:
+            received = self._write_chunk(partial_path, stream, offset, length)
+        except Exception:
+            self._release_chunk(upload)
+            raise
+
+        if received != length:
+            self._truncate(partial_path, offset)
+            self._release_chunk(upload)
+            raise ValidationError("The chunk was not fully received")
+
+        return self._commit_chunk(upload, offset + length)
+
+    @transaction.atomic
+    def _reserve_chunk(self, upload_id, participant, offset, length):
+        upload = get_object_or_404(
+            Upload.objects.select_for_update(),
+            id=upload_id,
+            participant=participant,
+        )
+
+        self._check_chunk_is_valid(upload, offset, length)
+
+        upload.chunk_reserved_until = now() + CHUNK_RESERVATION_TIMEOUT
+        upload.save(update_fields=["chunk_reserved_until"])
+        return upload
+
+    def _commit_chunk(self, upload, offset):
+        # Only the holder of the reservation moves the offset
+        updated = Upload.objects.filter(
+            id=upload.id,
+            chunk_reserved_until=upload.chunk_reserved_until,
+        ).update(offset=offset, chunk_reserved_until=None)
+
+        if not updated:
+            raise ValidationError(
+                "The chunk reservation expired, resume from the current offset"
+            )
+
+        upload.offset = offset
+        upload.chunk_reserved_until = None
+        return upload
+
+    def _release_chunk(self, upload):
+        Upload.objects.filter(
+            id=upload.id,
+            chunk_reserved_until=upload.chunk_reserved_until,
+        ).update(chunk_reserved_until=None)
+
+    def _check_chunk_is_valid(self, upload, offset, length):
+        if upload.is_completed:
+            raise ValidationError("The upload is already completed")
+
+        if upload.chunk_reserved_until and upload.chunk_reserved_until > now():
+            raise ValidationError("Another chunk of the upload is being written")
+
+        if offset != upload.offset:
+            raise ValidationError(
+                {"offset": f"Expected offset {upload.offset}, received {offset}"}
+            )
+
+        if length <= 0 or length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+            raise ValidationError(
+                {"length": "The chunk size is out of the allowed range"}
+            )
+
+        if offset + length > upload.size:
+            raise ValidationError({"length": "The chunk exceeds the upload size"})
+
+    def _write_chunk(self, partial_path, stream, offset, length):
+        os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+
+        # Write in place at the committed offset so a chunk that was
+        # interrupted before the offset was saved is simply overwritten.
+        fd = os.open(partial_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        received = 0
+        with os.fdopen(fd, "wb") as partial_file:
+            partial_file.seek(offset)
+            while received < length:
+                block = stream.read(min(self.BLOCK_SIZE, length - received))
+                if not block:
+                    break
+                partial_file.write(block)
+                received += len(block)
+            partial_file.truncate(offset + received)
+        return received
+
+    def _truncate(self, partial_path, offset):
+        with open(partial_path, "r+b") as partial_file:
+            partial_file.truncate(offset)
@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from django.conf import settings
 
 from apps.Chat.repository import OllamaRepository
@@ -5,8 +7,10 @@ from apps.Chat.repository import OllamaRepository
 
 class BaseOllamaService:
 
-    def __init__(self):
-        self.ollama_repo = OllamaRepository(
+    # Built on first use, creating the service does not touch the settings
+    @cached_property
+    def ollama_repo(self):
+        return OllamaRepository(
             settings.OLLAMA_MODEL,
             settings.OLLAMA_URL,
         )
@@ -0,0 +1,10 @@
+import os
+
+from django.conf import settings
+
+
+class BaseUploadService:
+    BLOCK_SIZE = 64 * 1024
+
+    def _get_partial_path(self, upload):
+        return os.path.join(settings.CHUNKED_UPLOAD_ROOT, f"{upload.id}.part")
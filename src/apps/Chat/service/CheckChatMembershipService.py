@@ -0,0 +1,27 @@
+from django.core.cache import cache
+
+from apps.Chat.models import ChatParticipant
+
+CACHE_TIMEOUT = 60 * 5
+
+
+class CheckChatMembershipService:
+
+    @staticmethod
+    def get_cache_key(chat_id):
+        return f"chat_members__{chat_id}"
+
+    def execute(self, chat_id, participant_id) -> bool:
+        key = self.get_cache_key(chat_id)
+        members = cache.get(key)
+
+        if members is None:
+            members = {
+                str(member_id)
+                for member_id in ChatParticipant.objects.filter(
+                    chat_id=chat_id
+                ).values_list("participant_id", flat=True)
+            }
+            cache.set(key, members, CACHE_TIMEOUT)
+
+        return str(participant_id) in members
@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.timezone import now
+
+from rest_framework.exceptions import ValidationError
+
+from apps.Chat.models import Upload
+from apps.Common.models import Blob
+
+from .BaseUploadService import BaseUploadService
+
+
+class CompleteUploadService(BaseUploadService):
+
+    @transaction.atomic
+    def execute(self, upload_id, participant):
+        upload = get_object_or_404(
+            Upload.objects.select_for_update(),
+            id=upload_id,
+            participant=participant,
+        )
+
+        if upload.is_completed:
+            return upload
+
+        if upload.offset != upload.size:
+            raise ValidationError(
+                f"The upload is incomplete, {upload.offset} of {upload.size} bytes received"
+            )
+
+        # The partial file is moved into the content addressed storage, or
+        # discarded when the same content is already stored.
+        blob_name = upload.file.storage.save_from_path(self._get_partial_path(upload))
+
+        upload.sha256 = Blob.get_sha256(blob_name)
+        upload.file.name = blob_name
+        upload.completed_at = now()
+        upload.save(update_fields=["sha256", "file", "completed_at"])
+        return upload
@@ -4,7 +4,7 @@ from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied
 
 from apps.Chat.models import Chat, ChatParticipant, Participant
-from apps.Common.models import AgentType, FeatureCode
+from apps.Common.models import AgentType, FeatureCode, QuotaCode
 
 PERMISSION = {
     AgentType.BASIC: FeatureCode.BASIC_AGENT,
@@ -23,8 +23,17 @@ class CreateChatService:
         if exits_chat:
             return exits_chat, False
 
-        self._check_have_permission(current_user, other_participant)
-        chat = self._create_chat_assing_participants(current_user, other_participant)
+        subscription = self._check_have_permission(current_user, other_participant)
+
+        try:
+            chat = self._create_chat_assing_participants(
+                current_user, other_participant
+            )
+        except Exception:
+            if subscription is not None:
+                subscription.refund(QuotaCode.AGENT_CHAT_COUNT)
+            raise
+
         return chat, True
 
     def _check_exist_chat(self, current_participant, other_participant):
@@ -53,13 +62,20 @@ class CreateChatService:
         return chat
 
     def _check_have_permission(self, current_participant, other_participant):
-        if (
-            other_participant.agent
-            and not current_participant.get_last_valid_subscription().has_feature(
+        if other_participant.agent:
+            subscription = current_participant.get_last_valid_subscription()
+
+            if not subscription.has_feature(
                 PERMISSION[other_participant.agent.agent_type]
-            )
-        ):
-            raise PermissionDenied
+            ):
+                raise PermissionDenied
+
+            # Checked and counted at once, concurrent requests cannot go over
+            # the limit. A failed creation gives the chat back.
+            if not subscription.consume(QuotaCode.AGENT_CHAT_COUNT):
+                raise PermissionDenied("Agent chats limit reached for your plan")
+
+            return subscription
 
         # TODO: add validation when model matching is made
         if other_participant.user:
@@ -9,30 +9,43 @@ from apps.Chat.api.v1.serializers import (
     MessageDetailedSerializer,
 )
 from apps.Chat.models import ChatParticipant, MessageStatus
-from apps.Chat.tasks import create_message_statuses
+from apps.Chat.tasks import create_message_statuses, generate_message_previews
+from apps.Common.models import MessageType
+from apps.Common.throttles import AgentGenerationThrottle
 
 
 class CreateMessageService:
 
     @transaction.atomic
-    def execute(self, serializer, user):
+    def execute(self, serializer, user=None, participant=None):
+        """
+        Create the message of a user, or of ``participant`` for the replies
+        of the agents.
+        """
         self.chat = serializer.validated_data["chat"]
-        self.participant = user.participant
+        self.participant = participant or user.participant
 
         self._check_participant_has_permission()
         self._create_message(serializer)
+        if user is not None:
+            self._take_agent_token(user)
         self._update_chat_last_message()
 
         # async
         # self._create_message_statuses()
         transaction.on_commit(
             lambda: create_message_statuses.delay(
-                chat_id=self.chat.id,
-                participant_id=self.participant.id,
-                message_id=self.message.id,
+                message_ids=[str(self.message.id)],
             )  # type: ignore
         )
 
+        if self.message.message_type in (MessageType.IMAGE, MessageType.VIDEO):
+            transaction.on_commit(
+                lambda: generate_message_previews.delay(
+                    message_id=str(self.message.id),
+                )  # type: ignore
+            )
+
         # async
         self._send_event_notification_consumer(user)
         # async
@@ -41,6 +54,13 @@ class CreateMessageService:
     def _create_message(self, serializer):
         self.message = serializer.save(participant=self.participant)
 
+    def _take_agent_token(self, user):
+        # Every message to an agent is answered. The token is taken once the
+        # message passed the checks, and Throttled rolls it back.
+        agent_type = self.chat.get_agent_type()
+        if agent_type:
+            AgentGenerationThrottle().consume(user, agent_type)
+
     def _update_chat_last_message(self):
         self.chat.last_message_at = self.message.sent_at
         self.chat.save(update_fields=["last_message_at"])
@@ -0,0 +1,184 @@
+import logging
+import os
+import shutil
+import subprocess
+from contextlib import ExitStack
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.Chat.models import Message
+from apps.Common.images import encode_blurhash
+from apps.Common.models import MessageType
+
+# Generated from the largest to the smallest so every variant is
+# downscaled from the previous one instead of from the original.
+PREVIEW_SIZES = {
+    "poster": 1280,
+    "medium": 640,
+    "small": 200,
+}
+EXIF_ORIENTATION = 0x0112
+POSTER_TIMEOUT = 30
+# Larger images get no previews, decoding them would take too much memory.
+MAX_PREVIEW_PIXELS = 50_000_000
+# Raised by Pillow for corrupt, truncated or unsupported files. The source
+# is opened before, so an OSError here is a decoding error.
+INVALID_IMAGE_ERRORS = (
+    UnidentifiedImageError,
+    Image.DecompressionBombError,
+    OSError,
+    SyntaxError,
+    ValueError,
+)
+
+
+class GenerateMessagePreviewService:
+    """
+    Not exported by the package, Pillow would be loaded by every web
+    worker. The preview task imports it from this module.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def execute(self, message_id):
+        message = Message.objects.filter(
+            id=message_id,
+            message_type__in=[MessageType.IMAGE, MessageType.VIDEO],
+        ).first()
+
+        if message is None:
+            return None
+
+        if message.message_type == MessageType.IMAGE:
+            source = message.image
+            variants = ["medium", "small"]
+        else:
+            source = message.video
+            variants = ["poster", "medium", "small"]
+
+        if not source:
+            return None
+
+        with ExitStack() as stack:
+            # Opened before decoding, the storage errors are the ones worth a
+            # retry. Pillow reads the file lazily instead of copying it in memory.
+            if message.message_type == MessageType.IMAGE:
+                source_file = stack.enter_context(
+                    default_storage.open(source.name, "rb")
+                )
+
+            try:
+                if message.message_type == MessageType.IMAGE:
+                    image, size = self._open_image(source_file)
+                else:
+                    image = self._extract_poster(source.name)
+                    size = image.size if image else None
+            except INVALID_IMAGE_ERRORS as e:
+                self.logger.warning(
+                    f"Could not decode the media of message {message.id}"
+                )
+                Message.objects.filter(id=message.id).update(
+                    preview_error=type(e).__name__
+                )
+                return None
+
+        if image is None:
+            return None
+
+        with image:
+            previews = self._create_previews(source.name, image, variants)
+            blurhash = encode_blurhash(image)
+
+        # update() keeps the post_save handlers (agent replies) out of this.
+        Message.objects.filter(id=message.id).update(
+            width=size[0],
+            height=size[1],
+            blurhash=blurhash,
+            previews=previews,
+            preview_error=None,
+        )
+        return previews
+
+    def _open_image(self, source_file):
+        image = Image.open(source_file)
+        width, height = image.size
+
+        # Only the header was read, refuse the huge images before decoding.
+        if width * height > MAX_PREVIEW_PIXELS:
+            raise Image.DecompressionBombError(
+                f"{width}x{height} is over the {MAX_PREVIEW_PIXELS} pixels limit"
+            )
+
+        if image.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+            width, height = height, width
+
+        # Let the JPEG decoder downscale while decoding.
+        largest = max(PREVIEW_SIZES.values())
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+        return image, (width, height)
+
+    def _extract_poster(self, name):
+        ffmpeg = shutil.which("ffmpeg")
+
+        if ffmpeg is None:
+            self.logger.warning("ffmpeg is not available, skipping video poster")
+            return None
+
+        path = default_storage.path(name)
+
+        # Short videos have no frame at 1s, fall back to the first one.
+        for position in ("1", "0"):
+            result = subprocess.run(
+                [
+                    ffmpeg,
+                    "-v",
+                    "error",
+                    "-ss",
+                    position,
+                    "-i",
+                    path,
+                    "-frames:v",
+                    "1",
+                    "-f",
+                    "image2pipe",
+                    "-vcodec",
+                    "png",
+                    "-",
+                ],
+                capture_output=True,
+                timeout=POSTER_TIMEOUT,
+                check=False,
+            )
+            if result.returncode == 0 and result.stdout:
+                image = Image.open(BytesIO(result.stdout))
+                image.load()
+                return image
+
+        raise ValueError(f"Could not extract a poster frame from {name}")
+
+    def _create_previews(self, source_name, image, variants):
+        previews = {}
+        preview = image.convert("RGB")
+        base_name = f"previews/{os.path.splitext(source_name)[0]}"
+
+        for variant in variants:
+            size = PREVIEW_SIZES[variant]
+            preview.thumbnail((size, size), Image.Resampling.LANCZOS)
+            name = f"{base_name}/{variant}.webp"
+
+            # Content addressed sources share their previews.
+            if not default_storage.exists(name):
+                buffer = BytesIO()
+                preview.save(buffer, "WEBP", quality=80, method=4)
+                name = default_storage.save(name, ContentFile(buffer.getvalue()))
+
+            previews[variant] = name
+
+        return previews
@@ -0,0 +1,74 @@
+from django.core.files.storage import default_storage
+from django.shortcuts import get_object_or_404
+
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from apps.Chat.models import Message, Upload
+from apps.Common.models import Blob
+
+from .CheckChatMembershipService import CheckChatMembershipService
+
+MEDIA_FIELDS = ["image", "attach", "video"]
+PREVIEW_VARIANTS = ["poster", "medium", "small"]
+
+
+class GetMessageMediaService:
+
+    def execute(self, message_id, variant, participant):
+        """
+        Return the storage, name, content type and ETag of a message file
+        after checking the participant belongs to the chat of the message.
+        """
+        if variant not in MEDIA_FIELDS and variant not in PREVIEW_VARIANTS:
+            raise NotFound
+
+        message = get_object_or_404(
+            Message.objects.only("id", "chat_id", "previews", *MEDIA_FIELDS),
+            id=message_id,
+        )
+
+        if not CheckChatMembershipService().execute(message.chat_id, participant.id):
+            raise PermissionDenied
+
+        if variant in PREVIEW_VARIANTS:
+            return self._get_preview(message, variant)
+
+        field_file = getattr(message, variant)
+        if not field_file:
+            raise NotFound
+
+        return (
+            field_file.storage,
+            field_file.name,
+            self._get_content_type(field_file.name),
+            self._get_etag(field_file.name),
+        )
+
+    def _get_preview(self, message, variant):
+        name = message.previews.get(variant)
+        if name is None:
+            raise NotFound
+
+        # previews/<source name>/<variant>.webp
+        source_name = name.removeprefix("previews/").rsplit("/", 1)[0]
+        etag = None
+        if Blob.is_blob(source_name):
+            etag = f'"{Blob.get_sha256(source_name)}-{variant}"'
+
+        return default_storage, name, "image/webp", etag
+
+    def _get_content_type(self, name):
+        if not Blob.is_blob(name):
+            return None
+
+        return (
+            Upload.objects.filter(sha256=Blob.get_sha256(name))
+            .values_list("content_type", flat=True)
+            .first()
+        )
+
+    def _get_etag(self, name):
+        # Content addressed files never change, the hash is a strong ETag.
+        if Blob.is_blob(name):
+            return f'"{Blob.get_sha256(name)}"'
+        return None
@@ -0,0 +1,37 @@
+from django.db import transaction
+
+from rest_framework.exceptions import NotFound
+
+from apps.Chat.models import ChatParticipant, Message, MessageStatus
+from apps.Common.models import MessageStatusType
+
+
+class MarkMessagesSeenService:
+
+    @transaction.atomic
+    def execute(self, chat_id, participant, message_id):
+        """
+        Mark as read the messages of the chat up to ``message_id`` and
+        recount the not seen messages of the participant.
+        """
+        sent_at = (
+            Message.objects.filter(id=message_id, chat_id=chat_id)
+            .values_list("sent_at", flat=True)
+            .first()
+        )
+
+        if sent_at is None:
+            raise NotFound
+
+        statuses = MessageStatus.objects.filter(
+            participant=participant,
+            message__chat_id=chat_id,
+        ).exclude(status=MessageStatusType.READ)
+
+        statuses.filter(message__sent_at__lte=sent_at).update(
+            status=MessageStatusType.READ
+        )
+        ChatParticipant.objects.filter(
+            chat_id=chat_id,
+            participant=participant,
+        ).update(not_seen=statuses.count())
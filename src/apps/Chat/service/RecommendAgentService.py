@@ -0,0 +1,78 @@
+import heapq
+from collections import Counter
+
+from apps.Chat.models import ChatParticipant
+
+from .AgentCatalogueService import NATURE_BITS
+
+
+class RecommendAgentService:
+    """
+    Rank the agents of the catalogue by weighted nature overlap.
+
+    Every agent has a bitset of its natures. The integer weights are split
+    in binary planes (the natures whose weight has bit b set), so the score
+    of an agent is sum(2**b * popcount(mask & plane_b)): a handful of
+    popcounts per agent whatever the number of natures.
+    """
+
+    def get_history_weights(self, participant):
+        """
+        Weight of each nature in the agents the participant already chats
+        with, and the ids of those agents.
+        """
+        rows = ChatParticipant.objects.filter(
+            chat__chatparticipant__participant=participant,
+            participant__agent__isnull=False,
+        ).values_list("participant_id", "participant__agent__natures__name")
+
+        agents = set()
+        weights = Counter()
+        for participant_id, nature in rows:
+            agents.add(str(participant_id))
+            if nature:
+                weights[nature] += 1
+        return weights, agents
+
+    def execute(self, catalogue, weights, exclude=(), limit=10):
+        """Return a list of (agent, score) of the best ``limit`` agents."""
+        planes = self._get_planes(weights)
+        if not planes:
+            return []
+
+        query = 0
+        for plane, _ in planes:
+            query |= plane
+
+        agents = catalogue["agents"]
+        scored = (
+            (
+                sum((mask & plane).bit_count() << bit for plane, bit in planes),
+                # Between equal scores, the agents with less other natures
+                -(mask & ~query).bit_count(),
+                # And then the catalogue order
+                -position,
+            )
+            for position, mask in enumerate(catalogue["masks"])
+            if mask & query and agents[position]["id"] not in exclude
+        )
+
+        return [
+            (agents[-reversed_position], score)
+            for score, _, reversed_position in heapq.nlargest(limit, scored)
+        ]
+
+    def _get_planes(self, weights):
+        """[(mask of the natures with bit b in its weight, b)]"""
+        weights = {nature: weight for nature, weight in weights.items() if weight > 0}
+        planes = []
+        bit = 0
+        while any(weight >> bit for weight in weights.values()):
+            plane = 0
+            for nature, weight in weights.items():
+                if weight >> bit & 1:
+                    plane |= NATURE_BITS.get(nature, 0)
+            if plane:
+                planes.append((plane, bit))
+            bit += 1
+        return planes
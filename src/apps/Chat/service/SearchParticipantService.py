@@ -0,0 +1,77 @@
+import hashlib
+
+from django.core.cache import cache
+
+from apps.Chat.models import ChatParticipant, Participant
+
+CACHE_TIMEOUT = 60
+# Candidates ranked by the database for a term, before the shared chat boost
+CANDIDATES = 50
+SHARED_CHAT_BOOST = 0.2
+
+
+class SearchParticipantService:
+    """
+    Typeahead search of participants. The similarity ranking of a term is
+    the same for everybody, so the candidates of hot terms (the prefixes
+    typed while searching) are cached and only the shared chat boost of
+    the current participant is computed per request.
+    """
+
+    @staticmethod
+    def get_cache_key(term):
+        return f"participant_search__{hashlib.md5(term.encode()).hexdigest()}"
+
+    def execute(self, participant, term, limit, boost_shared=True):
+        term = " ".join(term.lower().split())
+        candidates = cache.get_or_set(
+            self.get_cache_key(term),
+            lambda: [
+                (str(participant_id), similarity)
+                for participant_id, similarity in Participant.objects.search(term)
+                .order_by("-similarity", "nickname")
+                .values_list("id", "similarity")[:CANDIDATES]
+            ],
+            CACHE_TIMEOUT,
+        )
+        candidates = [
+            (participant_id, similarity)
+            for participant_id, similarity in candidates
+            if participant_id != str(participant.id)
+        ]
+
+        candidate_ids = [participant_id for participant_id, _ in candidates]
+        shared = (
+            self._get_shared(participant, candidate_ids)
+            if boost_shared and candidate_ids
+            else set()
+        )
+        ranked = sorted(
+            candidates,
+            key=lambda candidate: candidate[1]
+            + (SHARED_CHAT_BOOST if candidate[0] in shared else 0),
+            reverse=True,
+        )[:limit]
+
+        participants = {
+            str(result.id): result
+            for result in Participant.objects.select_related("agent")
+            .prefetch_related("agent__natures")
+            .filter(id__in=[participant_id for participant_id, _ in ranked])
+        }
+        # Participants deleted since the candidates were cached are skipped
+        return [
+            participants[participant_id]
+            for participant_id, _ in ranked
+            if participant_id in participants
+        ]
+
+    def _get_shared(self, participant, candidate_ids):
+        """Candidates that have a chat with the participant."""
+        return {
+            str(participant_id)
+            for participant_id in ChatParticipant.objects.filter(
+                chat__chatparticipant__participant=participant,
+                participant_id__in=candidate_ids,
+            ).values_list("participant_id", flat=True)
+        }
@@ -1,3 +1,11 @@
+from .AgentCatalogueService import AgentCatalogueService
+from .AppendUploadChunkService import AppendUploadChunkService
+from .CheckChatMembershipService import CheckChatMembershipService
+from .CompleteUploadService import CompleteUploadService
 from .CreateChatService import CreateChatService
 from .CreateMessageService import CreateMessageService
+from .GetMessageMediaService import GetMessageMediaService
+from .MarkMessagesSeenService import MarkMessagesSeenService
 from .OllamaChatService import OllamaChatService
+from .RecommendAgentService import RecommendAgentService
+from .SearchParticipantService import SearchParticipantService
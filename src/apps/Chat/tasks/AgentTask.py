@@ -0,0 +1,44 @@
+from celery import shared_task
+
+from apps.Chat.models import Message, Participant
+from apps.Common.models import MessageType
+
+
+@shared_task
+def generate_agent_reply(message_id):
+    """
+    Generate the reply of the agent of the chat to a message of a user and
+    send it like any other message. The token of the reply was taken when
+    the message was created.
+    """
+    # Imported here, the services package imports the tasks package.
+    from apps.Chat.api.v1.serializers import MessageSerializer
+    from apps.Chat.service import CreateMessageService, OllamaChatService
+
+    message = Message.objects.select_related("chat").get(id=message_id)
+    agent_participant = (
+        Participant.objects.filter(
+            chatparticipant__chat_id=message.chat_id,
+            agent__isnull=False,
+        )
+        .select_related("agent")
+        .first()
+    )
+    if agent_participant is None:
+        return None
+
+    response = OllamaChatService().execute(
+        chat=message.chat,
+        prompt_type=agent_participant.agent.promp_type,
+    )
+
+    serializer = MessageSerializer(
+        data={
+            "chat": str(message.chat_id),
+            "message_type": MessageType.TEXT,
+            "content": response,
+        }
+    )
+    serializer.is_valid(raise_exception=True)
+    CreateMessageService().execute(serializer, participant=agent_participant)
+    return str(serializer.instance.id)  # type: ignore
@@ -1,41 +1,118 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
 from celery import shared_task
-from django.db.models import F
-from apps.Chat.models import Chat, Participant, ChatParticipant, MessageStatus, Message
+
+from apps.Chat.models import ChatParticipant, Message, MessageStatus
+
+BATCH_SIZE = 500
 
 
 @shared_task(bind=True, max_retries=3)
-def create_message_statuses(
-    self,
-    chat_id,
-    participant_id,
-    message_id,
-):
+def create_message_statuses(self, message_ids):
+    """
+    Create the statuses of a batch of messages and increase the not seen
+    counters of the other chat participants.
+
+    The messages are locked and flagged with ``statuses_created`` inside the
+    same transaction, so a retry or a duplicated delivery of the task is a
+    no-op for the messages that were already processed. Only the statuses
+    inserted here are counted, and members who joined after a message was
+    sent get no status for it.
+    """
     try:
-        # get info
-        chat = Chat.objects.get(pk=chat_id)
-        participant = Participant.objects.get(pk=participant_id)
-        message = Message.objects.get(pk=message_id)
-
-        # filter participants
-        chat_participants = ChatParticipant.objects.filter(chat=chat).exclude(
-            participant=participant
-        )
-
-        # updated not seen messages
-        chat_participants.update(
-            not_seen=F("not_seen") + 1,
-        )
-
-        # create messages statuses
-        messages_statuses = []
-        for chat_participant in chat_participants:
-            messages_statuses.append(
-                MessageStatus(
-                    participant=chat_participant.participant,
-                    message=message,
+        with transaction.atomic():
+            messages = list(
+                Message.objects.select_for_update(skip_locked=True)
+                .filter(id__in=message_ids, statuses_created=False)
+                .order_by()
+                .values_list("id", "chat_id", "participant_id", "sent_at")
+            )
+
+            if not messages:
+                return 0
+
+            message_ids = [message_id for message_id, _, _, _ in messages]
+
+            chat_participants = ChatParticipant.objects.filter(
+                chat_id__in={chat_id for _, chat_id, _, _ in messages}
+            ).values_list("id", "chat_id", "participant_id", "joined_at")
+
+            # chat -> [(chat_participant_id, participant_id, joined_at)]
+            members = defaultdict(list)
+            for chat_participant_id, chat_id, *member in chat_participants:
+                members[chat_id].append((chat_participant_id, *member))
+
+            # Statuses created before, they are not counted again
+            existing = set(
+                MessageStatus.objects.filter(message_id__in=message_ids).values_list(
+                    "message_id", "participant_id"
                 )
             )
-        MessageStatus.objects.bulk_create(messages_statuses)
+
+            # create messages statuses
+            messages_statuses = []
+            not_seen = defaultdict(int)
+            for message_id, chat_id, sender_id, sent_at in messages:
+                for chat_participant_id, participant_id, joined_at in members[chat_id]:
+                    if (
+                        participant_id == sender_id
+                        or joined_at > sent_at
+                        or (message_id, participant_id) in existing
+                    ):
+                        continue
+                    messages_statuses.append(
+                        MessageStatus(
+                            participant_id=participant_id,
+                            message_id=message_id,
+                        )
+                    )
+                    not_seen[chat_participant_id] += 1
+
+            MessageStatus.objects.bulk_create(
+                messages_statuses,
+                batch_size=BATCH_SIZE,
+            )
+
+            # updated not seen messages
+            if not_seen:
+                ChatParticipant.objects.filter(id__in=not_seen.keys()).update(
+                    not_seen=F("not_seen")
+                    + Case(
+                        *[
+                            When(id=chat_participant_id, then=Value(count))
+                            for chat_participant_id, count in not_seen.items()
+                        ],
+                        default=Value(0),
+                    )
+                )
+
+            Message.objects.filter(id__in=message_ids).update(statuses_created=True)
+
+        return len(messages)
 
     except Exception as e:
-        self.retry(countdown=2, exc=e)
+        raise self.retry(countdown=2, exc=e)
+
+
+@shared_task
+def create_pending_message_statuses(batch_size=BATCH_SIZE):
+    """
+    Sweep the messages whose statuses were not created yet (lost or still
+    queued tasks) and process them in batches.
+    """
+    message_ids = list(
+        Message.objects.filter(statuses_created=False)
+        .order_by("sent_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+
+    if not message_ids:
+        return 0
+
+    create_message_statuses.delay(
+        message_ids=[str(message_id) for message_id in message_ids]
+    )  # type: ignore
+    return len(message_ids)
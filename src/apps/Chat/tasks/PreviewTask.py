@@ -0,0 +1,24 @@
+import subprocess
+
+from django.db import DatabaseError
+
+from celery import shared_task
+
+
+@shared_task(bind=True, max_retries=3)
+def generate_message_previews(self, message_id):
+    """
+    Generate the previews of an image or video message.
+
+    Only storage, database and ffmpeg timeouts are retried. Files Pillow can
+    not decode are recorded in ``preview_error`` by the service.
+    """
+    # Imported here, the services package imports the tasks package.
+    from apps.Chat.service.GenerateMessagePreviewService import (
+        GenerateMessagePreviewService,
+    )
+
+    try:
+        return GenerateMessagePreviewService().execute(message_id)
+    except (OSError, DatabaseError, subprocess.TimeoutExpired) as e:
+        raise self.retry(countdown=5, exc=e)
@@ -1 +1,6 @@
-from apps.Chat.tasks.MessageTask import create_message_statuses
+from apps.Chat.tasks.AgentTask import generate_agent_reply
+from apps.Chat.tasks.MessageTask import (
+    create_message_statuses,
+    create_pending_message_statuses,
+)
+from apps.Chat.tasks.PreviewTask import generate_message_previews
@@ -7,3 +7,6 @@ class CommonConfig(AppConfig):
 
     def ready(self):
         import apps.Common.signals
+        from apps.Common.profiling import install_serializer_timing
+
+        install_serializer_timing()
@@ -0,0 +1,24 @@
+from django.core.cache.backends.redis import RedisCache
+
+from apps.Common.profiling import record_cache
+
+MISSING = object()
+
+
+class ProfiledRedisCache(RedisCache):
+    """Redis cache that counts the hits and misses of the current request."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, MISSING, version)
+        if value is MISSING:
+            record_cache(hits=0, misses=1)
+            return default
+
+        record_cache(hits=1, misses=0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        record_cache(hits=len(values), misses=len(keys) - len(values))
+        return values
@@ -0,0 +1,2 @@
+from apps.Common.cache.ProfiledRedisCache import ProfiledRedisCache
+from apps.Common.cache.utils import get_redis_client
@@ -0,0 +1,21 @@
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+
+
+def get_redis_client(alias="default"):
+    """
+    Return the redis-py client behind a django RedisCache, for the atomic
+    operations (INCR, Lua scripts) the cache API does not expose.
+    """
+    cache = caches[alias]
+
+    # The client is only reachable through the private _cache of RedisCache,
+    # other backends have no equivalent for the quota counters.
+    if not isinstance(cache, RedisCache):
+        raise ImproperlyConfigured(
+            f"The {alias!r} cache must be a RedisCache for the quota counters "
+            f"and rate limits, it is a {type(cache).__name__}"
+        )
+
+    return cache._cache.get_client(write=True)
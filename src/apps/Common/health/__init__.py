@@ -0,0 +1,7 @@
+from apps.Common.health.utils import (
+    DEGRADED,
+    HEALTHY,
+    UNHEALTHY,
+    HealthChecker,
+    get_health_report,
+)
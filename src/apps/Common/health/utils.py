@@ -0,0 +1,193 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils.timezone import now
+
+import requests
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from kombu import Connection
+from redis import Redis
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+DEGRADED = "degraded"
+SKIPPED = "skipped"
+
+
+def check_database():
+    connection = connections["default"]
+    # A worker thread keeps its connection, drop it once the server closed it
+    connection.close_if_unusable_or_obsolete()
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def check_cache():
+    caches["default"].get("health_check")
+
+
+_channel_layer_clients = {}
+
+
+def check_channel_layer():
+    layer = get_channel_layer()
+    hosts = getattr(layer, "hosts", None)
+
+    if not hosts:
+        async_to_sync(layer.group_send)("health_check", {"type": "health.check"})
+        return
+
+    # Plain redis clients, the pools of channels_redis are bound to an event
+    # loop and async_to_sync would leave one behind per check
+    for host in hosts:
+        client = _channel_layer_clients.get(repr(host))
+        if client is None:
+            options = {
+                "socket_timeout": settings.HEALTH_CHECK_TIMEOUT,
+                "socket_connect_timeout": settings.HEALTH_CHECK_TIMEOUT,
+            }
+            client = (
+                Redis.from_url(host["address"], **options)
+                if "address" in host
+                else Redis(**host, **options)
+            )
+            _channel_layer_clients[repr(host)] = client
+
+        client.ping()
+
+
+def check_broker():
+    broker_url = getattr(settings, "CELERY_BROKER_URL", None)
+    if not broker_url:
+        return SKIPPED
+
+    with Connection(
+        broker_url,
+        connect_timeout=settings.HEALTH_CHECK_TIMEOUT,
+    ) as connection:
+        connection.connect()
+
+
+def check_ollama():
+    if not settings.OLLAMA_URL:
+        return SKIPPED
+
+    response = requests.get(
+        f"{settings.OLLAMA_URL}/api/version",
+        timeout=settings.HEALTH_CHECK_TIMEOUT,
+    )
+    response.raise_for_status()
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "channel_layer": check_channel_layer,
+    "broker": check_broker,
+    "ollama": check_ollama,
+}
+
+
+class HealthChecker:
+    """
+    Runs the checks of the dependencies concurrently and keeps the report
+    for ``HEALTH_CHECK_CACHE_SECONDS``, so frequent probes do not add load.
+    A check still running from a previous report is not started again.
+    """
+
+    def __init__(self, checks):
+        self.checks = checks
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(checks),
+            thread_name_prefix="health",
+        )
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.report = None
+        self.expires_at = 0.0
+
+    def get_report(self):
+        with self.lock:
+            if self.report is None or time.monotonic() >= self.expires_at:
+                self.report = self.run()
+                self.expires_at = time.monotonic() + settings.HEALTH_CHECK_CACHE_SECONDS
+
+            return self.report
+
+    def run(self):
+        futures = {}
+        for name, check in self.checks.items():
+            future = self.pending.get(name)
+            if future is None or future.done():
+                future = self.executor.submit(self.timed, check)
+                self.pending[name] = future
+            futures[name] = future
+
+        wait(futures.values(), timeout=settings.HEALTH_CHECK_TIMEOUT)
+
+        services = {}
+        for name, future in futures.items():
+            if not future.done():
+                services[name] = {
+                    "status": UNHEALTHY,
+                    "latency_ms": None,
+                    "error": "Timeout",
+                }
+                continue
+
+            status, latency, error = future.result()
+            services[name] = {"status": status, "latency_ms": latency}
+            if error:
+                services[name]["error"] = error
+
+        return {
+            "status": self.get_status(services),
+            "checked_at": now().isoformat(),
+            "services": services,
+        }
+
+    @staticmethod
+    def timed(check):
+        start = time.perf_counter()
+        try:
+            status = check() or HEALTHY
+            error = None
+        except Exception as e:
+            # The name only, the messages can hold hosts or credentials
+            status = UNHEALTHY
+            error = type(e).__name__
+
+        latency = round((time.perf_counter() - start) * 1000, 3)
+        return status, latency, error
+
+    @staticmethod
+    def get_status(services):
+        failing = {
+            name for name, service in services.items() if service["status"] == UNHEALTHY
+        }
+
+        if failing - set(settings.HEALTH_CHECK_OPTIONAL):
+            return UNHEALTHY
+        if failing:
+            return DEGRADED
+        return HEALTHY
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def get_health_report():
+    global _checker
+
+    with _checker_lock:
+        if _checker is None:
+            _checker = HealthChecker(CHECKS)
+
+    return _checker.get_report()
@@ -0,0 +1 @@
+from apps.Common.images.utils import encode_blurhash
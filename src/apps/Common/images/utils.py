@@ -0,0 +1,110 @@
+import math
+
+from PIL import Image
+
+BASE83_CHARACTERS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+BLURHASH_SAMPLE_SIZE = 32
+
+SRGB_TO_LINEAR = [
+    (v / 255) / 12.92 if v / 255 <= 0.04045 else (((v / 255) + 0.055) / 1.055) ** 2.4
+    for v in range(256)
+]
+
+
+def _linear_to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * math.pow(value, 1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value, exponent):
+    return math.copysign(math.pow(abs(value), exponent), value)
+
+
+def _encode_base83(value, length):
+    return "".join(
+        BASE83_CHARACTERS[(value // (83 ** (length - i))) % 83]
+        for i in range(1, length + 1)
+    )
+
+
+def encode_blurhash(image, x_components=4, y_components=3):
+    """
+    Encode a Pillow image as a blurhash string.
+
+    The image is downscaled before the DCT so the cost is constant
+    regardless of the size of the original.
+    """
+    image = image.convert("RGB")
+    image.thumbnail(
+        (BLURHASH_SAMPLE_SIZE, BLURHASH_SAMPLE_SIZE), Image.Resampling.BILINEAR
+    )
+    width, height = image.size
+    data = image.tobytes()
+
+    pixels = [
+        (
+            SRGB_TO_LINEAR[data[index]],
+            SRGB_TO_LINEAR[data[index + 1]],
+            SRGB_TO_LINEAR[data[index + 2]],
+        )
+        for index in range(0, len(data), 3)
+    ]
+    cos_x = [
+        [math.cos(math.pi * i * x / width) for x in range(width)]
+        for i in range(x_components)
+    ]
+    cos_y = [
+        [math.cos(math.pi * j * y / height) for y in range(height)]
+        for j in range(y_components)
+    ]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            red = green = blue = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = normalisation * cos_y[j][y]
+                for x in range(width):
+                    basis = basis_y * cos_x[i][x]
+                    pixel = pixels[row + x]
+                    red += basis * pixel[0]
+                    green += basis * pixel[1]
+                    blue += basis * pixel[2]
+            scale = 1 / (width * height)
+            factors.append((red * scale, green * scale, blue * scale))
+
+    dc, ac = factors[0], factors[1:]
+
+    blurhash = _encode_base83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_maximum = max(abs(value) for factor in ac for value in factor)
+        quantised_maximum = max(0, min(82, math.floor(actual_maximum * 166 - 0.5)))
+        maximum = (quantised_maximum + 1) / 166
+        blurhash += _encode_base83(quantised_maximum, 1)
+    else:
+        maximum = 1
+        blurhash += _encode_base83(0, 1)
+
+    blurhash += _encode_base83(
+        (_linear_to_srgb(dc[0]) << 16)
+        + (_linear_to_srgb(dc[1]) << 8)
+        + _linear_to_srgb(dc[2]),
+        4,
+    )
+
+    for factor in ac:
+        red, green, blue = (
+            max(
+                0,
+                min(18, math.floor(_sign_pow(value / maximum, 0.5) * 9 + 9.5)),
+            )
+            for value in factor
+        )
+        blurhash += _encode_base83(red * 19 * 19 + green * 19 + blue, 2)
+
+    return blurhash
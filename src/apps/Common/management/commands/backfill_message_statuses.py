@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import make_aware
+
+from apps.Chat.models import Message
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Command for flagging the statuses of the messages sent before "
+        "Message.statuses_created was deployed as created. Run it once with the "
+        "deploy date, otherwise the pending statuses sweep counts the whole "
+        "history as not seen again"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            required=True,
+            type=datetime.fromisoformat,
+            help="Deploy date, in ISO format. Later messages are left to the sweep",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        before = options["before"]
+        if before.tzinfo is None:
+            before = make_aware(before)
+
+        updated = 0
+        while True:
+            message_ids = list(
+                Message.objects.filter(statuses_created=False, sent_at__lt=before)
+                .order_by()
+                .values_list("id", flat=True)[:BATCH_SIZE]
+            )
+            if not message_ids:
+                break
+
+            updated += Message.objects.filter(id__in=message_ids).update(
+                statuses_created=True
+            )
+
+        self.stdout.write(f"{updated} messages flagged")
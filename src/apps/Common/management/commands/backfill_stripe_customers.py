@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.Authentication.models import CustomUser
+from apps.Billing.models import StripeCustomerOutbox
+from apps.Billing.tasks import create_pending_stripe_customers
+
+
+class Command(BaseCommand):
+
+    help = "Command for queuing the stripe customer of the users without one"
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        user_ids = CustomUser.objects.filter(
+            strip_customer_id="",
+            participant__isnull=False,
+            stripecustomeroutbox__isnull=True,
+        ).values_list("id", flat=True)
+
+        StripeCustomerOutbox.objects.bulk_create(
+            [StripeCustomerOutbox(user_id=user_id) for user_id in user_ids],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        create_pending_stripe_customers.delay()  # type: ignore
@@ -0,0 +1,138 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Loaded on first use by the services, a worker boots without them
+DEFERRED_MODULES = ["stripe", "PIL.Image"]
+
+PROBE = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import django
+
+django.setup()
+setup = time.perf_counter()
+import {urlconf}
+
+urls = time.perf_counter()
+print(
+    json.dumps(
+        {{
+            "setup_ms": (setup - start) * 1000,
+            "urls_ms": (urls - start) * 1000,
+            "deferred_loaded": [m for m in {deferred!r} if m in sys.modules],
+        }}
+    )
+)
+"""
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Command for measuring the cold start of a worker, django.setup() "
+        "and the URLconf import, in fresh interpreters"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=10)
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Slowest top level imports reported from -X importtime",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail when a deferred module is loaded at startup",
+        )
+        parser.add_argument("--output", default="startup_benchmark.json")
+
+    def handle(self, *args: Any, **options: Any):
+        probe = PROBE.format(urlconf=settings.ROOT_URLCONF, deferred=DEFERRED_MODULES)
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(path for path in sys.path if path),
+        }
+
+        samples = [self.run_probe(probe, env)[0] for _ in range(options["runs"])]
+        deferred_loaded = sorted(
+            {module for sample in samples for module in sample["deferred_loaded"]}
+        )
+
+        results = {
+            "runs": options["runs"],
+            "setup_ms": self.summarize([sample["setup_ms"] for sample in samples]),
+            "urls_ms": self.summarize([sample["urls_ms"] for sample in samples]),
+            "deferred_loaded": deferred_loaded,
+            "slowest_imports": self.get_slowest_imports(probe, env, options["top"]),
+        }
+
+        with open(options["output"], "w") as file:
+            json.dump(results, file, indent=2)
+
+        self.stdout.write(f"django.setup(): {results['setup_ms']}")
+        self.stdout.write(f"with the URLconf: {results['urls_ms']}")
+        for module in results["slowest_imports"]:
+            self.stdout.write(f"  {module['cumulative_ms']:>9} ms  {module['module']}")
+        self.stdout.write(self.style.SUCCESS(f"Results saved in {options['output']}"))
+
+        if options["check"] and deferred_loaded:
+            raise CommandError(
+                f"Modules loaded at startup: {', '.join(deferred_loaded)}"
+            )
+
+    def run_probe(self, probe, env, *flags):
+        result = subprocess.run(
+            [sys.executable, *flags, "-c", probe],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+
+        if result.returncode:
+            raise CommandError(f"The startup probe failed:\n{result.stderr}")
+
+        return json.loads(result.stdout.splitlines()[-1]), result.stderr
+
+    def get_slowest_imports(self, probe, env, top):
+        _, importtime = self.run_probe(probe, env, "-X", "importtime")
+
+        imports = []
+        for line in importtime.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:"):
+                continue
+
+            _, cumulative, module = line.split("|")
+            # Nested imports are indented, their time is in their parent's
+            if module[1:].startswith(" ") or not cumulative.strip().isdigit():
+                continue
+
+            imports.append(
+                {
+                    "module": module.strip(),
+                    "cumulative_ms": round(int(cumulative) / 1000, 1),
+                }
+            )
+
+        return sorted(imports, key=lambda item: -item["cumulative_ms"])[:top]
+
+    @staticmethod
+    def summarize(milliseconds):
+        return {
+            "median": round(statistics.median(milliseconds), 1),
+            "min": round(min(milliseconds), 1),
+            "max": round(max(milliseconds), 1),
+        }
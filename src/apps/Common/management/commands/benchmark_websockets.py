@@ -0,0 +1,461 @@
+import asyncio
+import json
+import math
+import time
+import tracemalloc
+from typing import Any
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils.timezone import now
+
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.Authentication.authentication import JwtAuthMiddleware
+from apps.Authentication.models import CustomUser
+from apps.Chat.models import Chat, ChatParticipant, Participant
+from apps.Chat.service import CheckChatMembershipService
+from apps.Common.models import ParticipantType
+from config.routing import websocket_urlpatterns
+
+MEMORY_CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels.layers.InMemoryChannelLayer",
+    },
+}
+
+# The readers are cancelled once the traffic is over, a short timeout would
+# kill the consumer instead
+READ_TIMEOUT = 60 * 60
+
+
+def percentile(values, percent):
+    """Nearest rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(seconds):
+    """Latency summary in milliseconds."""
+    if not seconds:
+        return {"count": 0}
+
+    milliseconds = [value * 1000 for value in seconds]
+
+    return {
+        "count": len(milliseconds),
+        "mean": round(sum(milliseconds) / len(milliseconds), 3),
+        "p50": round(percentile(milliseconds, 50), 3),
+        "p90": round(percentile(milliseconds, 90), 3),
+        "p99": round(percentile(milliseconds, 99), 3),
+        "max": round(max(milliseconds), 3),
+    }
+
+
+class Client:
+    """A benchmark user with a chat and a notification socket."""
+
+    def __init__(self, participant_id, chat_id, token):
+        self.participant_id = participant_id
+        self.chat_id = chat_id
+        self.token = token
+        self.chat_socket = None
+        self.notification_socket = None
+        self.last_message_id = None
+
+    @property
+    def headers(self):
+        return [(b"cookie", f"access_token={self.token}".encode())]
+
+
+class WebsocketBenchmark:
+
+    def __init__(self, clients, rounds, concurrency, trace_memory, timeout):
+        self.clients = clients
+        self.rounds = rounds
+        self.concurrency = concurrency
+        self.trace_memory = trace_memory
+        self.timeout = timeout
+
+        self.application = JwtAuthMiddleware(URLRouter(websocket_urlpatterns))
+        self.members = {}
+        for client in clients:
+            self.members.setdefault(client.chat_id, []).append(client)
+
+        # Send time of every event, keyed the way the receivers can match it
+        self.sent_at = {}
+        self.latencies = {
+            "typing": [],
+            "message": [],
+            "notification": [],
+            "seen": [],
+        }
+        self.connect_latencies = {"chat": [], "notification": []}
+        self.connect_failures = 0
+        self.expected = 0
+        self.received = 0
+        self.errors = 0
+
+    async def run(self):
+        memory_per_connection = await self._connect_all()
+
+        readers = [
+            asyncio.create_task(self._read(client, socket, kind))
+            for client in self.clients
+            for socket, kind in (
+                (client.chat_socket, "chat"),
+                (client.notification_socket, "notification"),
+            )
+            if socket is not None
+        ]
+
+        start = time.perf_counter()
+        try:
+            for round_number in range(self.rounds):
+                await self._typing_phase()
+                await self._message_phase(round_number)
+                await self._seen_phase(round_number)
+        finally:
+            duration = time.perf_counter() - start
+
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            await self._disconnect_all()
+
+        return {
+            "connections": sum(
+                len(self.connect_latencies[kind]) for kind in self.connect_latencies
+            ),
+            "connect_failures": self.connect_failures,
+            "connect_ms": {
+                kind: summarize(latencies)
+                for kind, latencies in self.connect_latencies.items()
+            },
+            "memory_per_connection_bytes": memory_per_connection,
+            "fanout_ms": {
+                kind: summarize(latencies) for kind, latencies in self.latencies.items()
+            },
+            "deliveries": {
+                "expected": self.expected,
+                "received": self.received,
+                "lost": max(self.expected - self.received, 0),
+            },
+            "deliveries_per_second": (
+                round(self.received / duration, 3) if duration else None
+            ),
+            "duration_seconds": round(duration, 3),
+            "errors": self.errors,
+        }
+
+    # Connections
+
+    async def _connect_all(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        if self.trace_memory:
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        await asyncio.gather(
+            *(self._connect(client, semaphore) for client in self.clients)
+        )
+
+        if not self.trace_memory:
+            return None
+
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        connections = sum(
+            len(latencies) for latencies in self.connect_latencies.values()
+        )
+        return round(used / connections) if connections else None
+
+    async def _connect(self, client, semaphore):
+        async with semaphore:
+            client.chat_socket = await self._open(
+                f"/ws/chat/{client.chat_id}/", client, "chat"
+            )
+            client.notification_socket = await self._open(
+                "/ws/notifications/", client, "notification"
+            )
+
+    async def _open(self, path, client, kind):
+        socket = WebsocketCommunicator(self.application, path, headers=client.headers)
+
+        start = time.perf_counter()
+        connected, _ = await socket.connect(timeout=self.timeout)
+        elapsed = time.perf_counter() - start
+
+        if not connected:
+            self.connect_failures += 1
+            return None
+
+        self.connect_latencies[kind].append(elapsed)
+        return socket
+
+    async def _disconnect_all(self):
+        await asyncio.gather(
+            *(
+                socket.disconnect(timeout=self.timeout)
+                for client in self.clients
+                for socket in (client.chat_socket, client.notification_socket)
+                if socket is not None
+            ),
+            return_exceptions=True,
+        )
+
+    # Traffic
+
+    async def _typing_phase(self):
+        senders = []
+
+        for members in self.members.values():
+            self.expected += len(members) * (len(members) - 1)
+            senders += members
+
+        await self._send_all(
+            senders,
+            lambda client: (
+                ("typing", client.participant_id),
+                {"type": "typing", "is_typing": True},
+            ),
+        )
+
+    async def _message_phase(self, round_number):
+        speakers = []
+
+        for members in self.members.values():
+            # Everyone gets the message back, the others also a notification
+            self.expected += len(members) + len(members) - 1
+            speakers.append(members[round_number % len(members)])
+
+        def build(client):
+            content = uuid4().hex
+            self.sent_at[("notification", client.chat_id)] = time.perf_counter()
+            return ("message", content), {"type": "send_message", "content": content}
+
+        await self._send_all(speakers, build)
+
+    async def _seen_phase(self, round_number):
+        readers = []
+
+        for members in self.members.values():
+            speaker = members[round_number % len(members)]
+            others = [
+                client
+                for client in members
+                if client is not speaker and client.last_message_id
+            ]
+            self.expected += len(others) * (len(members) - 1)
+            readers += others
+
+        await self._send_all(
+            readers,
+            lambda client: (
+                ("seen", client.participant_id, client.last_message_id),
+                {"type": "seen", "message_id": client.last_message_id},
+            ),
+        )
+
+    async def _send_all(self, senders, build):
+        expected = self.expected
+
+        for client in senders:
+            if client.chat_socket is None:
+                continue
+
+            key, event = build(client)
+            self.sent_at[key] = time.perf_counter()
+            await client.chat_socket.send_json_to(event)
+
+        deadline = time.perf_counter() + self.timeout
+        while self.received < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.001)
+
+    async def _read(self, client, socket, kind):
+        while True:
+            event = await socket.receive_json_from(timeout=READ_TIMEOUT)
+            received_at = time.perf_counter()
+            data = event.get("data")
+
+            if event["type"] == "error":
+                self.errors += 1
+                continue
+
+            if kind == "notification":
+                key = ("notification", data["id"])
+                latencies = self.latencies["notification"]
+            elif event["type"] == "chat_message":
+                client.last_message_id = data["id"]
+                key = ("message", data["content"])
+                latencies = self.latencies["message"]
+            elif event["type"] == "typing":
+                key = ("typing", data["participant"])
+                latencies = self.latencies["typing"]
+            else:
+                key = ("seen", data["participant"], data["message_id"])
+                latencies = self.latencies["seen"]
+
+            if key in self.sent_at:
+                latencies.append(received_at - self.sent_at[key])
+                self.received += 1
+
+
+class Command(BaseCommand):
+
+    help = "Command for benchmarking the chat and notification websockets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100)
+        parser.add_argument("--chats", type=int, default=20)
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--timeout", type=float, default=10)
+        parser.add_argument(
+            "--channel-layer",
+            choices=["memory", "configured"],
+            default="memory",
+            help="In memory layer or the CHANNEL_LAYERS of the settings, e.g. Redis",
+        )
+        parser.add_argument(
+            "--no-memory",
+            action="store_true",
+            help="Skip tracemalloc, it slows down the connections",
+        )
+        parser.add_argument("--output", default="websocket_benchmark.json")
+
+    def handle(self, *args: Any, **options: Any):
+        if options["chats"] < 1 or options["clients"] < options["chats"]:
+            raise CommandError("There must be at least one client per chat")
+
+        if options["channel_layer"] == "memory":
+            with override_settings(CHANNEL_LAYERS=MEMORY_CHANNEL_LAYERS):
+                results = self.benchmark(options)
+        else:
+            results = self.benchmark(options)
+
+        with open(options["output"], "w") as file:
+            json.dump(results, file, indent=2)
+
+        self.print_summary(results)
+        self.stdout.write(self.style.SUCCESS(f"Results saved in {options['output']}"))
+
+    def benchmark(self, options):
+        run_id = uuid4().hex[:8]
+        started_at = now()
+
+        try:
+            clients = self.create_data(run_id, options["clients"], options["chats"])
+
+            benchmark = WebsocketBenchmark(
+                clients,
+                rounds=options["rounds"],
+                concurrency=options["concurrency"],
+                trace_memory=not options["no_memory"],
+                timeout=options["timeout"],
+            )
+            results = async_to_sync(benchmark.run)()
+        finally:
+            self.delete_data(run_id)
+
+        return {
+            "started_at": started_at.isoformat(),
+            "channel_layer": settings.CHANNEL_LAYERS["default"]["BACKEND"],
+            "clients": options["clients"],
+            "chats": options["chats"],
+            "rounds": options["rounds"],
+            **results,
+        }
+
+    def create_data(self, run_id, clients, chats):
+        password = make_password(None)
+
+        users = CustomUser.objects.bulk_create(
+            [
+                CustomUser(
+                    email=f"bench-{run_id}-{index}@benchmark.invalid",
+                    phone=f"+1{int(run_id, 16) % 1000:03d}{index:07d}",
+                    password=password,
+                    strip_customer_id="",
+                )
+                for index in range(clients)
+            ],
+            batch_size=500,
+        )
+        participants = Participant.objects.bulk_create(
+            [
+                Participant(
+                    participant_type=ParticipantType.USER,
+                    user=user,
+                    first_name="Benchmark",
+                    last_name=str(index),
+                    nickname=f"bench-{run_id}-{index}",
+                )
+                for index, user in enumerate(users)
+            ],
+            batch_size=500,
+        )
+        chat_list = Chat.objects.bulk_create(
+            [Chat(name=f"bench-{run_id}-{index}") for index in range(chats)],
+            batch_size=500,
+        )
+        ChatParticipant.objects.bulk_create(
+            [
+                ChatParticipant(
+                    chat=chat_list[index % chats],
+                    participant=participant,
+                )
+                for index, participant in enumerate(participants)
+            ],
+            batch_size=500,
+        )
+
+        return [
+            Client(
+                participant_id=str(participant.id),
+                chat_id=str(chat_list[index % chats].id),
+                token=str(AccessToken.for_user(user)),
+            )
+            for index, (user, participant) in enumerate(zip(users, participants))
+        ]
+
+    def delete_data(self, run_id):
+        chats = Chat.objects.filter(name__startswith=f"bench-{run_id}-")
+
+        cache.delete_many(
+            [
+                CheckChatMembershipService.get_cache_key(chat_id)
+                for chat_id in chats.values_list("id", flat=True)
+            ]
+        )
+        chats.delete()
+        CustomUser.objects.filter(email__startswith=f"bench-{run_id}-").delete()
+
+    def print_summary(self, results):
+        self.stdout.write(
+            f"{results['connections']} connections "
+            f"({results['connect_failures']} failed), "
+            f"{results['memory_per_connection_bytes']} bytes per connection"
+        )
+
+        for kind, summary in results["connect_ms"].items():
+            self.stdout.write(f"connect {kind}: {summary}")
+
+        for kind, summary in results["fanout_ms"].items():
+            self.stdout.write(f"fan-out {kind}: {summary}")
+
+        self.stdout.write(
+            f"{results['deliveries']['received']}/{results['deliveries']['expected']} "
+            f"deliveries, {results['deliveries_per_second']} per second, "
+            f"{results['errors']} errors"
+        )
@@ -4,7 +4,7 @@ from django.contrib.auth.models import Group, Permission
 from django.core.management.base import BaseCommand
 
 from apps.Authentication.models import UserProfile
-from apps.Chat.models import Agent, Chat, Message, Nature, Participant
+from apps.Chat.models import Agent, Chat, Message, Nature, Participant, Upload
 from apps.Common.models import CustomGroups
 
 READ_PERMISSIONS = [
@@ -24,6 +24,7 @@ GROUPS_PERMISSIONS = {
         Participant: READ_PERMISSIONS,
         Chat: READ_PERMISSIONS,
         Message: FULL_PERMISSIONS,
+        Upload: FULL_PERMISSIONS,
     },
     CustomGroups.MAINTAINER: {
         UserProfile: FULL_PERMISSIONS,
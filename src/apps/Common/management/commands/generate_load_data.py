@@ -0,0 +1,386 @@
+import io
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any
+from uuid import uuid4
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from apps.Authentication.models import CustomUser
+from apps.Chat.models import Chat, ChatParticipant, Message, Participant
+from apps.Common.models import CustomGroups, MessageType, ParticipantType
+
+# fmt: off
+FIRST_NAMES = [
+    "Alex", "Ana", "Carlos", "Chen", "Fatima", "Hugo", "Ivan", "Julia",
+    "Kenji", "Laura", "Lucas", "Maria", "Noah", "Olivia", "Priya", "Sofia",
+]
+LAST_NAMES = [
+    "Garcia", "Smith", "Kim", "Silva", "Müller", "Rossi", "Nguyen", "Khan",
+    "Lopez", "Ivanova", "Tanaka", "Cohen", "Okafor", "Martin", "Novak", "Diaz",
+]
+# fmt: on
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua ut enim ad minim "
+    "veniam quis nostrud exercitation ullamco laboris nisi aliquip ex ea "
+    "commodo consequat duis aute irure in reprehenderit voluptate velit esse"
+).split()
+
+# Zipf exponent of how often a user joins chats, a few users are in many
+USER_ACTIVITY_EXPONENT = 0.8
+# The phone numbers of a run share an area code, 7 digits are left
+MAX_USERS = 10_000_000
+
+
+def power_law(rng, minimum, maximum, alpha):
+    """Sample of a bounded power law with exponent ``alpha``."""
+    value = minimum * (1 - rng.random()) ** (-1 / (alpha - 1))
+    return min(int(value), maximum)
+
+
+def allocate(total, weights, rng):
+    """Split ``total`` in integer parts proportional to ``weights``."""
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+
+    remainder = total - sum(counts)
+    for index in rng.choices(range(len(weights)), weights=weights, k=remainder):
+        counts[index] += 1
+
+    return counts
+
+
+def copy_value(value):
+    """Value in the text format of COPY."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Keep the given values of the auto_now_add fields on bulk_create."""
+    for field in fields:
+        field.auto_now_add = False
+
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Command for generating a production like dataset of users, "
+        "participants, chats, memberships and messages. The rows skip the "
+        "signals, so no Stripe customers are created"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--chats", type=int, default=50_000)
+        parser.add_argument("--messages", type=int, default=1_000_000)
+        parser.add_argument(
+            "--group-ratio",
+            type=float,
+            default=0.2,
+            help="Share of the chats which are groups, the rest are one to one",
+        )
+        parser.add_argument("--max-group-size", type=int, default=500)
+        parser.add_argument(
+            "--alpha",
+            type=float,
+            default=2.5,
+            help="Exponent of the power laws of the group sizes and chat activity",
+        )
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--password", default="Loadtest123$")
+        parser.add_argument("--seed", type=int)
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create on PostgreSQL too",
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        if options["users"] < 2 or options["users"] > MAX_USERS:
+            raise CommandError(f"The users must be between 2 and {MAX_USERS}")
+
+        if options["alpha"] <= 1:
+            raise CommandError("The alpha must be greater than 1")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        self.now = now()
+        self.run_id = uuid4().hex[:6]
+
+        start = time.perf_counter()
+
+        with explicit_timestamps(
+            Chat._meta.get_field("created_at"),
+            ChatParticipant._meta.get_field("joined_at"),
+            Message._meta.get_field("sent_at"),
+        ):
+            participant_ids = self.generate_users(options["users"], options["password"])
+            chats = self.generate_chats(participant_ids, options)
+            self.generate_messages(chats)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Load data {self.run_id} generated in "
+                f"{time.perf_counter() - start:.1f}s "
+                f"({'COPY' if self.use_copy else 'bulk_create'})"
+            )
+        )
+
+    # Generators
+
+    def generate_users(self, total, password):
+        password = make_password(password)
+        area_code = 200 + int(self.run_id, 16) % 800
+        group = Group.objects.filter(name=CustomGroups.MEMBER).first()
+
+        if group is None:
+            self.stdout.write(
+                self.style.WARNING("There is no MEMBER group, run create_groups first")
+            )
+
+        participant_ids = []
+        progress = self.progress("users", total)
+
+        for offset in range(0, total, self.batch_size):
+            users = []
+            participants = []
+
+            for index in range(offset, min(offset + self.batch_size, total)):
+                user = CustomUser(
+                    email=f"load-{self.run_id}-{index}@loaddata.invalid",
+                    phone=f"+1{area_code}{index:07d}",
+                    password=password,
+                    strip_customer_id="",
+                    verified=True,
+                )
+                users.append(user)
+                participants.append(
+                    Participant(
+                        participant_type=ParticipantType.USER,
+                        user_id=user.id,
+                        first_name=self.rng.choice(FIRST_NAMES),
+                        last_name=self.rng.choice(LAST_NAMES),
+                        nickname=f"load{self.run_id}{index}",
+                    )
+                )
+
+            with transaction.atomic():
+                self.write(CustomUser, users)
+                self.write(Participant, participants)
+
+                if group is not None:
+                    self.write(
+                        CustomUser.groups.through,
+                        [
+                            CustomUser.groups.through(
+                                customuser_id=user.id,
+                                group_id=group.id,
+                            )
+                            for user in users
+                        ],
+                    )
+
+            participant_ids += [participant.id for participant in participants]
+            progress(len(users))
+
+        return participant_ids
+
+    def generate_chats(self, participant_ids, options):
+        total = options["chats"]
+        max_group_size = min(options["max_group_size"], len(participant_ids))
+        alpha = options["alpha"]
+        oldest = self.now - timedelta(days=options["days"])
+
+        # Activity of the users, some of them are in most of the chats
+        cum_activity = list(
+            accumulate(
+                1 / (rank + 1) ** USER_ACTIVITY_EXPONENT
+                for rank in range(len(participant_ids))
+            )
+        )
+
+        # Busy chats get most of the messages
+        message_counts = allocate(
+            options["messages"],
+            [power_law(self.rng, 1, 10**6, alpha) for _ in range(total)],
+            self.rng,
+        )
+
+        chats = []
+        progress = self.progress("chats", total)
+
+        for offset in range(0, total, self.batch_size):
+            chat_rows = []
+            memberships = []
+
+            for index in range(offset, min(offset + self.batch_size, total)):
+                is_group = self.rng.random() < options["group_ratio"]
+                size = (
+                    max(power_law(self.rng, 3, max_group_size, alpha), 3)
+                    if is_group and max_group_size >= 3
+                    else 2
+                )
+                members = self.pick_members(participant_ids, cum_activity, size)
+
+                created_at = oldest + (self.now - oldest) * self.rng.random()
+                last_message_at = (
+                    created_at + (self.now - created_at) * self.rng.random()
+                    if message_counts[index]
+                    else None
+                )
+
+                chat = Chat(
+                    name=f"Group {index}" if is_group else None,
+                    created_at=created_at,
+                    last_message_at=last_message_at,
+                )
+                chat_rows.append(chat)
+                memberships += [
+                    ChatParticipant(
+                        chat_id=chat.id,
+                        participant_id=participant_id,
+                        joined_at=created_at,
+                        is_admin=is_group and position == 0,
+                    )
+                    for position, participant_id in enumerate(members)
+                ]
+                chats.append((chat, members, message_counts[index]))
+
+            with transaction.atomic():
+                self.write(Chat, chat_rows)
+                self.write(ChatParticipant, memberships)
+
+            progress(len(chat_rows))
+
+        return chats
+
+    def generate_messages(self, chats):
+        total = sum(count for _, _, count in chats)
+        progress = self.progress("messages", total)
+        batch = []
+
+        for chat, members, count in chats:
+            if not count:
+                continue
+
+            span = chat.last_message_at - chat.created_at
+            sent_ats = [
+                chat.created_at + span * self.rng.random() for _ in range(count - 1)
+            ]
+            sent_ats.append(chat.last_message_at)
+
+            for sent_at in sent_ats:
+                batch.append(
+                    Message(
+                        chat_id=chat.id,
+                        participant_id=self.rng.choice(members),
+                        message_type=MessageType.TEXT,
+                        content=" ".join(
+                            self.rng.choices(WORDS, k=power_law(self.rng, 1, 80, 2))
+                        ),
+                        sent_at=sent_at,
+                        # Keep the backfill of the statuses away from them
+                        statuses_created=True,
+                    )
+                )
+
+                if len(batch) >= self.batch_size:
+                    self.write(Message, batch)
+                    progress(len(batch))
+                    batch = []
+
+        if batch:
+            self.write(Message, batch)
+            progress(len(batch))
+
+    def pick_members(self, participant_ids, cum_activity, size):
+        if size * 2 > len(participant_ids):
+            return self.rng.sample(participant_ids, size)
+
+        members = {}
+        while len(members) < size:
+            for participant_id in self.rng.choices(
+                participant_ids, cum_weights=cum_activity, k=size - len(members)
+            ):
+                members[participant_id] = None
+
+        return list(members)
+
+    # Writers
+
+    def write(self, model, rows):
+        if not self.use_copy:
+            model.objects.bulk_create(rows, batch_size=self.batch_size)
+            return
+
+        # Let the database fill the serial primary keys
+        fields = [
+            field for field in model._meta.concrete_fields if not field.auto_created
+        ]
+        buffer = io.StringIO()
+
+        for row in rows:
+            buffer.write(
+                "\t".join(
+                    copy_value(field.get_prep_value(getattr(row, field.attname)))
+                    for field in fields
+                )
+            )
+            buffer.write("\n")
+
+        buffer.seek(0)
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {connection.ops.quote_name(model._meta.db_table)} "
+                f"({columns}) FROM STDIN",
+                buffer,
+            )
+
+    def progress(self, label, total):
+        start = time.perf_counter()
+        done = 0
+
+        def advance(count):
+            nonlocal done
+            done += count
+            elapsed = time.perf_counter() - start
+            rate = done / elapsed if elapsed else 0
+
+            self.stdout.write(f"{label}: {done}/{total} ({rate:,.0f} rows/s)")
+
+        return advance
@@ -0,0 +1,66 @@
+import logging
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from apps.Common.profiling import get_current_profile, profile_request, query_timer
+
+
+class ProfilingMiddleware:
+    """
+    Record the database queries and time, cache hits and misses, serializer
+    time and external calls of each request and export them as histograms
+    labeled by view and action. A sample of the requests (PROFILING_SAMPLE_RATE)
+    also logs its slowest queries with the code they came from.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PROFILING_ENABLED:
+            return self.get_response(request)
+
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE
+
+        with profile_request(sampled) as profile, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_timer))
+
+            response = self.get_response(request)
+
+        # Requests that did not reach a view (404, redirects) are not labeled
+        if profile.view is not None:
+            profile.observe()
+            if sampled:
+                self._log_slow_queries(request, profile)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = get_current_profile()
+        if profile is None:
+            return None
+
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        profile.view = view_class.__name__ if view_class else view_func.__name__
+        # Viewsets map the http methods to actions
+        actions = getattr(view_func, "actions", None) or {}
+        profile.action = actions.get(request.method.lower(), request.method.lower())
+        return None
+
+    def _log_slow_queries(self, request, profile):
+        lines = [
+            f"{profile.view}.{profile.action} {request.method} {request.path}: "
+            f"{profile.db_queries} queries in {profile.db_seconds * 1000:.1f}ms"
+        ]
+        for seconds, _, sql, origin in profile.get_slow_queries():
+            lines.append(f"  {seconds * 1000:.1f}ms {sql[:500]}")
+            lines.extend(f"    at {frame}" for frame in origin)
+        self.logger.info("\n".join(lines))
@@ -0,0 +1,19 @@
+class RateLimitHeadersMiddleware:
+    """
+    Add the X-RateLimit-* headers set by the sliding window throttles of
+    the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        rate_limit = getattr(request, "rate_limit", None)
+        if rate_limit is not None:
+            response["X-RateLimit-Limit"] = rate_limit["limit"]
+            response["X-RateLimit-Remaining"] = rate_limit["remaining"]
+            response["X-RateLimit-Reset"] = rate_limit["reset"]
+
+        return response
@@ -0,0 +1,4 @@
+from apps.Common.middleware.ProfilingMiddleware import ProfilingMiddleware
+from apps.Common.middleware.RateLimitHeadersMiddleware import (
+    RateLimitHeadersMiddleware,
+)
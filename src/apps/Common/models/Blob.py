@@ -0,0 +1,101 @@
+from django.db import models
+from django.db.models import Case, F, Value, When
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+
+from .CustomModel import CustomModel
+
+BLOB_PREFIX = "blobs/"
+
+
+class BlobQuerySet(models.QuerySet):
+
+    def for_names(self, names):
+        return self.filter(
+            sha256__in=[Blob.get_sha256(name) for name in names if Blob.is_blob(name)]
+        )
+
+    def touch(self, sha256, size):
+        # Storing content again protects the blob from the garbage collector
+        # until the model referencing it is saved. The row stays locked until
+        # the transaction ends, the collector deletes under the same lock.
+        blob, created = self.select_for_update().get_or_create(
+            sha256=sha256,
+            defaults={"size": size},
+        )
+        if not created:
+            self.filter(id=blob.id).update(last_referenced_at=now())
+        return blob
+
+    def add_references(self, names):
+        if not names:
+            return 0
+        return self.for_names(names).update(
+            reference_count=F("reference_count") + 1,
+            last_referenced_at=now(),
+        )
+
+    def remove_references(self, names):
+        if not names:
+            return 0
+        return self.for_names(names).update(
+            reference_count=Case(
+                When(reference_count__gt=0, then=F("reference_count") - 1),
+                default=Value(0),
+            ),
+            last_referenced_at=now(),
+        )
+
+
+class Blob(CustomModel):
+    sha256 = models.CharField(
+        _("Hash of the content"),
+        max_length=64,
+        unique=True,
+    )
+    size = models.PositiveBigIntegerField(
+        _("Size of the content in bytes"),
+    )
+    reference_count = models.PositiveIntegerField(
+        _("Number of files pointing to the content"),
+        default=0,
+    )
+    created_at = models.DateTimeField(
+        _("Time the content was stored"),
+        auto_now_add=True,
+    )
+    last_referenced_at = models.DateTimeField(
+        _("Last time a reference was added or removed"),
+        default=now,
+    )
+
+    objects = BlobQuerySet.as_manager()
+
+    class Meta:
+        db_table = "COMMON_BLOB"
+        verbose_name = _("Blob")
+        verbose_name_plural = _("Blobs")
+        app_label = "Common"
+        indexes = [
+            models.Index(
+                fields=["last_referenced_at"],
+                condition=models.Q(reference_count=0),
+                name="blob_orphan_idx",
+            ),
+        ]
+
+    @staticmethod
+    def get_name(sha256) -> str:
+        return f"{BLOB_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    @staticmethod
+    def is_blob(name) -> bool:
+        return bool(name) and name.startswith(BLOB_PREFIX)
+
+    @staticmethod
+    def get_sha256(name) -> str:
+        return name.rsplit("/", 1)[-1]
+
+    @property
+    def name(self) -> str:
+        return self.get_name(self.sha256)
@@ -3,7 +3,9 @@ from django.utils.translation import gettext_lazy as _
 
 
 class StatusSuscription(models.TextChoices):
+    INCOMPLETE = "INCOMPLETE", _("Incomplete")
     ACTIVE = "ACTIVE", _("Active")
+    PAST_DUE = "PAST_DUE", _("Past due")
     CANCELED = "CANCELED", _("Canceled")
 
 
@@ -3,5 +3,6 @@ from apps.Common.models.ActivatorModel import (
     ActivatorModelManager,
     ActivatorQuerySet,
 )
+from apps.Common.models.Blob import Blob
 from apps.Common.models.CustomModel import CustomModel
 from apps.Common.models.Utils import *
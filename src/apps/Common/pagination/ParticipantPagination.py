@@ -0,0 +1,7 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ParticipantPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    ordering = ("nickname", "id")
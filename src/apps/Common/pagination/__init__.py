@@ -1,2 +1,3 @@
 from apps.Common.pagination.ChatPagination import *
 from apps.Common.pagination.MessagePagination import *
+from apps.Common.pagination.ParticipantPagination import *
@@ -0,0 +1,9 @@
+from apps.Common.profiling.utils import (
+    external_call,
+    get_current_profile,
+    install_serializer_timing,
+    profile_request,
+    query_timer,
+    record_cache,
+    record_external,
+)
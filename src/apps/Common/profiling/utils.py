@@ -0,0 +1,199 @@
+import heapq
+import os
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from prometheus_client import Histogram
+
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+
+REQUEST_DB_QUERIES = Histogram(
+    "request_db_queries",
+    "Database queries made by a request",
+    ["view", "action"],
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "request_db_seconds",
+    "Time a request spent in the database",
+    ["view", "action"],
+    buckets=SECONDS_BUCKETS,
+)
+REQUEST_CACHE_HITS = Histogram(
+    "request_cache_hits",
+    "Cache hits of a request",
+    ["view", "action"],
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_CACHE_MISSES = Histogram(
+    "request_cache_misses",
+    "Cache misses of a request",
+    ["view", "action"],
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_SERIALIZER_SECONDS = Histogram(
+    "request_serializer_seconds",
+    "Time a request spent serializing data",
+    ["view", "action"],
+    buckets=SECONDS_BUCKETS,
+)
+REQUEST_EXTERNAL_SECONDS = Histogram(
+    "request_external_seconds",
+    "Time a request spent calling external services",
+    ["view", "action", "service"],
+    buckets=SECONDS_BUCKETS,
+)
+
+APPS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+_current_profile = ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    """Counters of a single request."""
+
+    def __init__(self, sampled=False, slow_queries=5):
+        self.sampled = sampled
+        self.slow_queries_count = slow_queries
+        self.view = None
+        self.action = None
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+        self.external_seconds = {}
+        # min heap of (seconds, sequence, sql, origin)
+        self.slow_queries = []
+
+    def record_query(self, sql, seconds):
+        self.db_queries += 1
+        self.db_seconds += seconds
+
+        if not self.sampled:
+            return
+
+        entry = (seconds, self.db_queries, sql, get_origin())
+        if len(self.slow_queries) < self.slow_queries_count:
+            heapq.heappush(self.slow_queries, entry)
+        elif seconds > self.slow_queries[0][0]:
+            heapq.heapreplace(self.slow_queries, entry)
+
+    def observe(self):
+        labels = (self.view, self.action)
+        REQUEST_DB_QUERIES.labels(*labels).observe(self.db_queries)
+        REQUEST_DB_SECONDS.labels(*labels).observe(self.db_seconds)
+        REQUEST_CACHE_HITS.labels(*labels).observe(self.cache_hits)
+        REQUEST_CACHE_MISSES.labels(*labels).observe(self.cache_misses)
+        REQUEST_SERIALIZER_SECONDS.labels(*labels).observe(self.serializer_seconds)
+        for service, seconds in self.external_seconds.items():
+            REQUEST_EXTERNAL_SECONDS.labels(*labels, service).observe(seconds)
+
+    def get_slow_queries(self):
+        return sorted(self.slow_queries, reverse=True)
+
+
+def get_origin(limit=3):
+    """Innermost frames of the project code that led to the current call."""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(APPS_DIR)
+        and not frame.filename.startswith(os.path.dirname(__file__))
+    ]
+    return [
+        f"{os.path.relpath(frame.filename, os.path.dirname(APPS_DIR))}:{frame.lineno} "
+        f"in {frame.name}"
+        for frame in frames[-limit:]
+    ]
+
+
+def get_current_profile():
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_request(sampled=False):
+    profile = RequestProfile(sampled, settings.PROFILING_SLOW_QUERIES)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def record_cache(hits, misses):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.cache_hits += hits
+        profile.cache_misses += misses
+
+
+def record_external(service, seconds):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.external_seconds[service] = (
+            profile.external_seconds.get(service, 0.0) + seconds
+        )
+
+
+@contextmanager
+def external_call(service):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_external(service, time.perf_counter() - start)
+
+
+def query_timer(execute, sql, params, many, context):
+    """Database execute wrapper recording the queries in the profile."""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(sql, time.perf_counter() - start)
+
+
+def install_serializer_timing():
+    """
+    Time the ``data`` of the serializers. Nested serializers do not go
+    through ``data``, and the ones built inside another are not counted
+    twice.
+    """
+    from rest_framework import serializers
+
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        data = serializer_class.data
+        if getattr(data.fget, "profiled", False):
+            continue
+        serializer_class.data = property(_timed_data(data.fget))
+
+
+def _timed_data(fget):
+    def timed(self):
+        profile = _current_profile.get()
+        if profile is None:
+            return fget(self)
+
+        profile.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            profile.serializer_depth -= 1
+            if not profile.serializer_depth:
+                profile.serializer_seconds += time.perf_counter() - start
+
+    timed.profiled = True  # type: ignore
+    return timed
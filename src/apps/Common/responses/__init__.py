@@ -0,0 +1,5 @@
+from apps.Common.responses.utils import (
+    catalogue_response,
+    get_query_variant,
+    media_response,
+)
@@ -0,0 +1,203 @@
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
+
+from rest_framework import status
+from rest_framework.response import Response
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOCK_SIZE = 64 * 1024
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _parse_range(header, size):
+    """
+    Parse a single ``bytes=start-end`` range. Multiple ranges or malformed
+    headers return None and the whole file is served, as the RFC allows.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+
+    start, end = match.groups()
+
+    if start == "":
+        if end == "":
+            return None
+        suffix = int(end)
+        if suffix == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - suffix), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable
+
+    return start, end
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as media_file:
+        media_file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            block = media_file.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def _offload_response(storage, name):
+    header = settings.MEDIA_OFFLOAD_HEADER
+    response = HttpResponse()
+
+    if header == "X-Accel-Redirect":
+        response[header] = quote(f"{settings.MEDIA_OFFLOAD_PREFIX}{name}")
+    else:
+        response[header] = storage.path(name)
+
+    # Let the web server pick the type from the headers we set.
+    del response["Content-Type"]
+    return response
+
+
+def media_response(request, storage, name, content_type=None, etag=None):
+    """
+    Serve a stored file honouring ETag/If-None-Match and single Range
+    requests. When MEDIA_OFFLOAD_HEADER is configured the bytes are sent by
+    the web server (X-Accel-Redirect or X-Sendfile) and Python never reads
+    the file.
+    """
+    path = storage.path(name)
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return HttpResponse(status=404)
+
+    if etag is None:
+        etag = f'"{int(stat.st_mtime)}-{stat.st_size}"'
+        cache_control = DEFAULT_CACHE_CONTROL
+    else:
+        cache_control = IMMUTABLE_CACHE_CONTROL
+
+    content_type = (
+        content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+    )
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and (
+        if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+    ):
+        response = HttpResponse(status=304)
+    elif settings.MEDIA_OFFLOAD_HEADER:
+        response = _offload_response(storage, name)
+        response["Content-Type"] = content_type
+    else:
+        response = _file_response(request, path, stat.st_size, etag, content_type)
+
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def _file_response(request, path, size, etag, content_type):
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range is not None:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(path, start, end),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return response
+
+    # Whole files go through wsgi.file_wrapper, which uses sendfile when
+    # the server supports it.
+    return FileResponse(open(path, "rb"), content_type=content_type)
+
+
+PAGINATION_QUERY_PARAMS = (
+    "page_query_param",
+    "page_size_query_param",
+    "limit_query_param",
+    "offset_query_param",
+    "cursor_query_param",
+)
+
+
+def _get_known_query_params(view):
+    params = set()
+
+    for backend in view.filter_backends:
+        get_filterset_class = getattr(backend(), "get_filterset_class", None)
+        if get_filterset_class is not None:
+            filterset_class = get_filterset_class(view, view.get_queryset())
+            if filterset_class is not None:
+                params.update(filterset_class.base_filters)
+
+    if view.paginator is not None:
+        for attribute in PAGINATION_QUERY_PARAMS:
+            param = getattr(view.paginator, attribute, None)
+            if param:
+                params.add(param)
+
+    return params
+
+
+def get_query_variant(view, *extra, params=()):
+    """
+    Digest of the filter and pagination params of the view, the extra
+    ``params`` it reads, and anything else the response varies on. Other
+    params are left out, so they cannot multiply the cached entries.
+    """
+    known = _get_known_query_params(view).union(params)
+    query = sorted(
+        (param, values)
+        for param, values in view.request.query_params.lists()
+        if param in known
+    )
+    return hashlib.md5(repr([query, *extra]).encode()).hexdigest()[:16]
+
+
+def catalogue_response(request, version, variant, get_data, public=True):
+    """
+    Serve a version-stamped catalogue. A request with the ETag of the
+    current version and variant gets a 304 without building the data.
+    """
+    headers = {
+        "ETag": f'"{version}-{variant}"',
+        "Cache-Control": "public, no-cache" if public else DEFAULT_CACHE_CONTROL,
+    }
+
+    if headers["ETag"] in parse_etags(request.headers.get("If-None-Match", "")):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(get_data(), headers=headers)
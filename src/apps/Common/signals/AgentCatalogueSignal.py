@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.Chat.models import Agent, Nature, Participant
+
+
+@receiver(post_save, sender=Agent)
+@receiver(post_delete, sender=Agent)
+@receiver(post_save, sender=Nature)
+@receiver(post_delete, sender=Nature)
+@receiver(m2m_changed, sender=Agent.natures.through)
+def invalidate_agent_catalogue(sender, instance, **kwargs):
+    # Imported here, the services would be loaded with the app registry.
+    from apps.Chat.service import AgentCatalogueService
+
+    transaction.on_commit(AgentCatalogueService().invalidate)
+
+
+@receiver(post_save, sender=Participant)
+@receiver(post_delete, sender=Participant)
+def invalidate_agent_catalogue_participant(sender, instance, **kwargs):
+    # Only the participants of the agents are in the catalogue
+    if instance.agent_id is not None:
+        from apps.Chat.service import AgentCatalogueService
+
+        transaction.on_commit(AgentCatalogueService().invalidate)
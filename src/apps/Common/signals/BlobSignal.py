@@ -0,0 +1,61 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.Chat.models import Chat, Message, Participant, Upload
+from apps.Common.models import Blob
+
+# Every file field stored in the content addressed storage.
+BLOB_FIELDS = {
+    Participant: ["avatar"],
+    Chat: ["photo"],
+    Message: ["image", "attach", "video"],
+    Upload: ["file"],
+}
+
+
+def _get_blob_names(instance, fields):
+    return {
+        getattr(instance, field).name for field in fields if getattr(instance, field)
+    }
+
+
+@receiver(pre_save, sender=Upload)
+@receiver(pre_save, sender=Message)
+@receiver(pre_save, sender=Chat)
+@receiver(pre_save, sender=Participant)
+def remember_previous_blobs(sender, instance, update_fields=None, **kwargs):
+    fields = BLOB_FIELDS[sender]
+
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+
+    instance._blob_fields = fields
+    instance._previous_blobs = set()
+
+    # New rows and saves that do not touch the files need no query.
+    if instance._state.adding or not fields:
+        return
+
+    previous = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+    if previous:
+        instance._previous_blobs = {name for name in previous.values() if name}
+
+
+@receiver(post_save, sender=Upload)
+@receiver(post_save, sender=Message)
+@receiver(post_save, sender=Chat)
+@receiver(post_save, sender=Participant)
+def update_blob_references(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_blobs", set())
+    current = _get_blob_names(instance, getattr(instance, "_blob_fields", []))
+
+    Blob.objects.add_references(current - previous)
+    Blob.objects.remove_references(previous - current)
+
+
+@receiver(post_delete, sender=Upload)
+@receiver(post_delete, sender=Message)
+@receiver(post_delete, sender=Chat)
+@receiver(post_delete, sender=Participant)
+def release_blob_references(sender, instance, **kwargs):
+    Blob.objects.remove_references(_get_blob_names(instance, BLOB_FIELDS[sender]))
@@ -0,0 +1,17 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.Chat.models import ChatParticipant
+
+
+@receiver(post_save, sender=ChatParticipant)
+@receiver(post_delete, sender=ChatParticipant)
+def invalidate_chat_membership(sender, instance, **kwargs):
+    # Imported here, the services would be loaded with the app registry.
+    from apps.Chat.service import CheckChatMembershipService
+
+    key = CheckChatMembershipService.get_cache_key(instance.chat_id)
+    # After commit, otherwise a request could cache the old members again
+    transaction.on_commit(lambda: cache.delete(key))
@@ -1,19 +1,20 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from apps.Billing.service import CreateCustomerService
+from apps.Billing.models import StripeCustomerOutbox
+from apps.Billing.tasks import create_stripe_customer as create_stripe_customer_task
 from apps.Chat.models import Participant
 
 
 @receiver(post_save, sender=Participant)
 def create_stripe_customer(sender, instance, created, **kwargs):
-    if created and instance.user is not None:
-        custom_user = instance.user
-
-        stripe_custom_user = CreateCustomerService().execute(
-            name=f"{instance.first_name} {instance.last_name}",
-            email=custom_user.email,
-            phone=custom_user.phone,
+    # The customer is created by a worker, onboarding does not wait for
+    # stripe. The outbox row is saved with the participant so the creation
+    # is never lost.
+    if created and instance.user is not None and not instance.user.strip_customer_id:
+        user_id = str(instance.user_id)
+        StripeCustomerOutbox.objects.get_or_create(user_id=user_id)
+        transaction.on_commit(
+            lambda: create_stripe_customer_task.delay(user_id=user_id)  # type: ignore
         )
-        custom_user.strip_customer_id = stripe_custom_user.id
-        custom_user.save()
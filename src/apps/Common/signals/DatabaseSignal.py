@@ -0,0 +1,15 @@
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.dispatch import receiver
+
+
+@receiver(pre_migrate)
+def create_database_extensions(sender, using, **kwargs):
+    # The trigram search indexes of Chat need pg_trgm. Migrations are not
+    # versioned in the repository, so it is created before they run.
+    connection = connections[using]
+    if sender.label != "Chat" or connection.vendor != "postgresql":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
@@ -1,27 +1,26 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from apps.Chat.models import ChatParticipant, Message, MessageStatus
-from apps.Chat.service import OllamaChatService
-from apps.Common.models import MessageType
+from apps.Chat.models import ChatParticipant, Message
+from apps.Chat.tasks import generate_agent_reply
 
 
-# TODO: eventually move this to the websocket to get inmediate response
 @receiver(post_save, sender=Message)
 def create_agent_response(sender, instance, created, **kwargs):
-    if created and instance.participant.agent:
-        response = OllamaChatService().execute(
-            chat=instance.chat,
-            prompt_type=instance.agent.promp_type,
-        )
-        agent_participant = (
-            ChatParticipant.objects.filter(chat=instance.chat)
-            .exclude(participant=instance.participant)
-            .first()
-        )
-        Message.objects.create(
-            chat=instance.chat,
-            participant=agent_participant,
-            message_type=MessageType.TEXT,
-            content=response,
-        )
+    # Only the messages of the users are answered, the token of the reply was
+    # taken by CreateMessageService when it created the message.
+    if not created or instance.participant.agent_id:
+        return
+
+    if not ChatParticipant.objects.filter(
+        chat_id=instance.chat_id,
+        participant__agent__isnull=False,
+    ).exists():
+        return
+
+    # The generation takes seconds, the worker answers once the message of
+    # the user is committed.
+    transaction.on_commit(
+        lambda: generate_agent_reply.delay(message_id=str(instance.id))  # type: ignore
+    )
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.Billing.models import Feature, Plan
+from apps.Billing.repository import PlanFeatureRepository
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+@receiver(m2m_changed, sender=Plan.features.through)
+def invalidate_plan_features(sender, instance, **kwargs):
+    # After commit, otherwise a worker could reload the old rows under the
+    # new version
+    transaction.on_commit(PlanFeatureRepository().invalidate)
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.Billing.models import Currency, Period, Plan, Price
+
+
+@receiver(post_save, sender=Price)
+@receiver(post_delete, sender=Price)
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=Period)
+@receiver(post_delete, sender=Period)
+@receiver(post_save, sender=Currency)
+@receiver(post_delete, sender=Currency)
+def invalidate_price_catalogue(sender, instance, **kwargs):
+    # Imported here, the services would be loaded with the app registry.
+    from apps.Billing.service import PriceCatalogueService
+
+    # After commit, otherwise a request could render the old rows under
+    # the new version
+    transaction.on_commit(PriceCatalogueService().invalidate)
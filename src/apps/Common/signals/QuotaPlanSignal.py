@@ -0,0 +1,13 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.Billing.models import QuotaPlan, Subscription
+
+
+@receiver(post_save, sender=QuotaPlan)
+@receiver(post_delete, sender=QuotaPlan)
+def invalidate_quota_limit(sender, instance, **kwargs):
+    cache.delete(
+        Subscription.get_quota_limit_cache_key(instance.plan.name, instance.quota.code)
+    )
@@ -1,4 +1,18 @@
+from apps.Common.signals.AgentCatalogueSignal import (
+    invalidate_agent_catalogue,
+    invalidate_agent_catalogue_participant,
+)
+from apps.Common.signals.BlobSignal import (
+    release_blob_references,
+    remember_previous_blobs,
+    update_blob_references,
+)
+from apps.Common.signals.ChatParticipantSignal import invalidate_chat_membership
 from apps.Common.signals.CustomerSignal import create_stripe_customer
+from apps.Common.signals.DatabaseSignal import create_database_extensions
 from apps.Common.signals.MessageSignal import (
     create_agent_response,
 )
+from apps.Common.signals.PlanFeatureSignal import invalidate_plan_features
+from apps.Common.signals.PriceCatalogueSignal import invalidate_price_catalogue
+from apps.Common.signals.QuotaPlanSignal import invalidate_quota_limit
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+
+from apps.Common.models import Blob
+
+TEMPORARY_DIR = "blobs/tmp"
+
+
+@deconstructible(path="apps.Common.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its
+    content, so identical files are stored once. Each stored file is
+    tracked by a ``Blob`` row that counts the model fields pointing to it.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is the hash of the content, never a variant.
+        return name
+
+    def _save(self, name, content):
+        temporary_dir = self.path(TEMPORARY_DIR)
+        os.makedirs(temporary_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, temporary_path = tempfile.mkstemp(dir=temporary_dir)
+        try:
+            with os.fdopen(fd, "wb") as temporary_file:
+                for chunk in content.chunks(self.BLOCK_SIZE):
+                    digest.update(chunk)
+                    temporary_file.write(chunk)
+                    size += len(chunk)
+            return self._store(temporary_path, digest.hexdigest(), size)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def save_from_path(self, path):
+        """
+        Move a local file into the storage without copying its bytes.
+        The file must live on the same file system as the storage.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as source_file:
+            for block in iter(lambda: source_file.read(self.BLOCK_SIZE), b""):
+                digest.update(block)
+        return self._store(path, digest.hexdigest(), os.path.getsize(path))
+
+    def _store(self, path, sha256, size):
+        name = Blob.get_name(sha256)
+        blob_path = self.path(name)
+
+        # Lock the row before reusing the file, a collector holding it first
+        # deletes both and the content is stored again. Errors abort the
+        # caller's transaction anyway, no savepoint is needed.
+        with transaction.atomic(savepoint=False):
+            Blob.objects.touch(sha256, size)
+
+            if os.path.exists(blob_path):
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(path, blob_path)
+
+        return name
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,4 @@
+from apps.Common.storage.ContentAddressedStorage import (
+    ContentAddressedStorage,
+    content_addressed_storage,
+)
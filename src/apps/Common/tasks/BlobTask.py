@@ -0,0 +1,84 @@
+import logging
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.timezone import now
+
+from celery import shared_task
+
+from apps.Common.models import Blob
+from apps.Common.signals.BlobSignal import BLOB_FIELDS
+from apps.Common.storage import content_addressed_storage
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+@shared_task
+def collect_orphan_blobs(batch_size=BATCH_SIZE):
+    """
+    Delete the blobs nobody references anymore.
+
+    Blobs are only collected after the grace period, so content stored by a
+    request whose model is not saved yet is kept. Writes that bypass
+    ``save()`` (``update``, ``bulk_create``) do not count references, so the
+    candidates are checked against the file fields before deleting them.
+    """
+    threshold = now() - timedelta(seconds=settings.BLOB_GRACE_PERIOD)
+    candidates = list(
+        Blob.objects.filter(
+            reference_count=0,
+            last_referenced_at__lt=threshold,
+        ).values_list("sha256", flat=True)[:batch_size]
+    )
+
+    if not candidates:
+        return 0
+
+    names = [Blob.get_name(sha256) for sha256 in candidates]
+    still_referenced = set()
+    for model, fields in BLOB_FIELDS.items():
+        for field in fields:
+            still_referenced.update(
+                model._default_manager.filter(**{f"{field}__in": names}).values_list(
+                    field, flat=True
+                )
+            )
+
+    if still_referenced:
+        logger.warning(f"{len(still_referenced)} blobs had untracked references")
+        Blob.objects.for_names(still_referenced).update(last_referenced_at=now())
+
+    collected = 0
+    for name in names:
+        if name in still_referenced:
+            continue
+
+        with transaction.atomic():
+            # Checked again under the lock, the content could have been
+            # stored again since the candidates were listed.
+            blob = (
+                Blob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    sha256=Blob.get_sha256(name),
+                    reference_count=0,
+                    last_referenced_at__lt=threshold,
+                )
+                .first()
+            )
+            if blob is None:
+                continue
+
+            content_addressed_storage.delete(name)
+            shutil.rmtree(
+                default_storage.path(f"previews/{name}"),
+                ignore_errors=True,
+            )
+            blob.delete()
+            collected += 1
+
+    return collected
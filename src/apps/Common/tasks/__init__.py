@@ -0,0 +1 @@
+from apps.Common.tasks.BlobTask import collect_orphan_blobs
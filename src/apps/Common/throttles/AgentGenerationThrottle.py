@@ -0,0 +1,96 @@
+from rest_framework.exceptions import Throttled
+
+from apps.Common.cache import get_redis_client
+from apps.Common.models import AgentType, PlanOption
+
+# KEYS[1] bucket hash {tokens, ts}
+# ARGV[1] capacity, ARGV[2] tokens refilled per second, ARGV[3] tokens
+# requested
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+
+if tokens < requested then
+    return {0, tostring((requested - tokens) / rate)}
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - requested), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {1, '0'}
+"""
+
+
+class AgentGenerationThrottle:
+    """
+    Token bucket per user and agent type that limits how many agent replies
+    a user can queue. The bucket size and refill rate depend on the plan of
+    the user; the whole check runs in Redis so every node shares it.
+
+    consume() takes the token when CreateMessageService creates the message
+    of a user to an agent, before its reply is queued.
+    """
+
+    cache_format = "throttle_agent_%(user)s_%(agent_type)s"
+
+    # Bucket size / time to refill it completely
+    THROTTLE_RATES = {
+        PlanOption.MEMBER: {
+            AgentType.BASIC: "20/1h",
+            AgentType.MEDIUM: "10/1h",
+            AgentType.ADVANCE: "5/1h",
+        },
+        PlanOption.PRO: {
+            AgentType.BASIC: "60/1h",
+            AgentType.MEDIUM: "30/1h",
+            AgentType.ADVANCE: "15/1h",
+        },
+        PlanOption.PREMIUM: {
+            AgentType.BASIC: "120/1h",
+            AgentType.MEDIUM: "60/1h",
+            AgentType.ADVANCE: "30/1h",
+        },
+    }
+
+    def __init__(self):
+        self.client = get_redis_client()
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def parse_rate(self, rate):
+        """Parse rate string like '20/1h' into (capacity, tokens per second)."""
+        num, period = rate.split("/")
+        duration_unit = period[-1]
+        duration_value = int(period[:-1]) if len(period) > 1 else 1
+        duration_map = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+        duration = duration_value * duration_map.get(duration_unit, 1)
+        return int(num), int(num) / duration
+
+    def get_rate(self, user, agent_type):
+        subscription = user.get_last_valid_subscription()
+        plan = subscription.plan_name if subscription else PlanOption.MEMBER
+        rates = self.THROTTLE_RATES.get(plan, self.THROTTLE_RATES[PlanOption.MEMBER])
+        return rates[agent_type]
+
+    def get_cache_key(self, user, agent_type):
+        return self.cache_format % {"user": user.id, "agent_type": agent_type}
+
+    def consume(self, user, agent_type):
+        """
+        Take a token for a reply of the agent. Raise Throttled, answered with
+        Retry-After, when the bucket is empty.
+        """
+        capacity, refill_rate = self.parse_rate(self.get_rate(user, agent_type))
+        allowed, wait = self.script(
+            keys=[self.get_cache_key(user, agent_type)],
+            args=[capacity, refill_rate, 1],
+        )
+        if not int(allowed):
+            raise Throttled(wait=float(wait))
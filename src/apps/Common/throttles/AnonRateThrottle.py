@@ -0,0 +1,7 @@
+from rest_framework import throttling
+
+from .SlidingWindowRateThrottle import SlidingWindowRateThrottle
+
+
+class AnonRateThrottle(SlidingWindowRateThrottle, throttling.AnonRateThrottle):
+    scope = "anon"
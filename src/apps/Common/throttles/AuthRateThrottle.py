@@ -1,4 +1,4 @@
-from rest_framework.throttling import AnonRateThrottle
+from .AnonRateThrottle import AnonRateThrottle
 
 
 class AuthRateThrottle(AnonRateThrottle):
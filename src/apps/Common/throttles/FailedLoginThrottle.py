@@ -1,5 +1,3 @@
-import time
-
 from django.core.cache import cache
 
 from rest_framework.throttling import SimpleRateThrottle
@@ -7,24 +5,36 @@ from rest_framework.throttling import SimpleRateThrottle
 
 class FailedLoginThrottle(SimpleRateThrottle):
     """
-    Event-based throttle that activates after 3 failed login attempts.
-    Once activated, the user is blocked for 30 minutes.
+    Event-based throttle that activates after 3 failed login attempts from
+    the same IP, or 10 failed attempts against the same email from anywhere.
+    Once activated, the client is blocked for 30 minutes.
     Resets on successful login.
 
     Unlike standard throttles, this one doesn't count requests automatically.
     Instead, use record_failed_attempt() to record failures and reset() on success.
+
+    Failures are fixed-window counters updated with atomic cache operations
+    (SET NX + INCR + EXPIRE on Redis), so parallel attempts are never lost
+    and each key takes constant memory.
     """
 
     scope = "failed_login"
+    email_scope = "failed_login_email"
     cache_format = "throttle_%(scope)s_%(ident)s"
 
-    # 3 attempts per 30 minutes
-    THROTTLE_RATES = {"failed_login": "3/30m"}
+    # 3 attempts per 30 minutes per IP, 10 per 30 minutes per email
+    THROTTLE_RATES = {
+        "failed_login": "3/30m",
+        "failed_login_email": "10/30m",
+    }
 
     def __init__(self):
         # Bypass parent's rate lookup from settings
         self.rate = self.get_rate()
         self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.email_num_requests, self.email_duration = self.parse_rate(
+            self.THROTTLE_RATES.get(self.email_scope)
+        )
 
     def get_rate(self):
         """Return the rate defined in THROTTLE_RATES."""
@@ -47,21 +57,29 @@ class FailedLoginThrottle(SimpleRateThrottle):
         ident = self.get_ident(request)
         return self.cache_format % {"scope": self.scope, "ident": ident}
 
+    def get_email_cache_key(self, request):
+        """Generate cache key based on the email of the login, if any."""
+        email = request.data.get("email") if hasattr(request, "data") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return self.cache_format % {
+            "scope": self.email_scope,
+            "ident": email.strip().lower(),
+        }
+
     def allow_request(self, request, view):
         """
-        Check if the request should be allowed based on failed attempt history.
-        This cleans up expired entries and checks if under the limit.
+        Check if the request should be allowed based on the failed attempt
+        counters of its IP and email. Both are read in a single round trip.
         Does NOT record the current request as an attempt.
         """
-        self.key = self.get_cache_key(request, view)
-        self.history = cache.get(self.key, [])
-        self.now = time.time()
-
-        # Remove expired timestamps (older than duration)
-        while self.history and self.history[-1] <= self.now - self.duration:  # type: ignore
-            self.history.pop()
+        ip_key = self.get_cache_key(request, view)
+        email_key = self.get_email_cache_key(request)
+        counters = cache.get_many([key for key in (ip_key, email_key) if key])
 
-        if len(self.history) >= self.num_requests:  # type: ignore
+        if counters.get(ip_key, 0) >= self.num_requests:  # type: ignore
+            return self.throttle_failure()
+        if email_key and counters.get(email_key, 0) >= self.email_num_requests:  # type: ignore
             return self.throttle_failure()
         return True
 
@@ -69,27 +87,44 @@ class FailedLoginThrottle(SimpleRateThrottle):
         """Called when throttle check fails."""
         return False
 
+    def _increment(self, key, num_requests, duration):
+        # The window starts with the first failure. Once the limit is hit
+        # the expiry is pushed so the block lasts the whole duration.
+        cache.add(key, 0, duration)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            cache.add(key, 1, duration)
+            count = 1
+
+        if count >= num_requests:
+            cache.touch(key, duration)
+        return count
+
     def record_failed_attempt(self, request):
         """
         Record a failed login attempt.
         Call this method when a login attempt fails.
         """
-        key = self.get_cache_key(request)
-        now = time.time()
-        history = cache.get(key, [])
-
-        # Clean up expired entries
-        while history and history[-1] <= now - self.duration:  # type: ignore
-            history.pop()
+        self._increment(self.get_cache_key(request), self.num_requests, self.duration)
 
-        # Add current timestamp at the beginning
-        history.insert(0, now)
-        cache.set(key, history, self.duration)
+        email_key = self.get_email_cache_key(request)
+        if email_key:
+            self._increment(email_key, self.email_num_requests, self.email_duration)
 
     def reset(self, request):
         """
-        Reset the failed login counter.
+        Reset the failed login counters.
         Call this method when a login is successful.
         """
-        key = self.get_cache_key(request)
-        cache.delete(key)
+        cache.delete_many(
+            [
+                key
+                for key in (
+                    self.get_cache_key(request),
+                    self.get_email_cache_key(request),
+                )
+                if key
+            ]
+        )
@@ -0,0 +1,109 @@
+import math
+
+from django.core.cache import cache as default_cache
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from apps.Common.cache import get_redis_client
+
+# KEYS[1] window counter
+# ARGV[1] amount, ARGV[2] seconds the counter lives
+WINDOW_COUNTER_SCRIPT = """
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2], 'NX')
+return count
+"""
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter throttle. Each client has one integer counter per
+    fixed window and the rate is estimated from the current counter plus the
+    previous one weighted by how much of it is still inside the sliding
+    window. Counting runs INCRBY and EXPIRE NX in one Lua script on the
+    shared Redis, so the limit holds across every web node, a counter can
+    never be left without expiry and the cost of a request does not depend
+    on the rate: a GET of the previous window plus the script. A rejected
+    request runs the script again to take itself back.
+
+    The state of the most restrictive throttle of the request is exposed
+    with X-RateLimit-* headers by RateLimitHeadersMiddleware.
+    """
+
+    cache = default_cache
+
+    def __init__(self):
+        super().__init__()
+        self.script = get_redis_client().register_script(WINDOW_COUNTER_SCRIPT)
+
+    def get_window_key(self, window):
+        return f"{self.key}_{window}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+
+        current_key = self.get_window_key(window)
+        self.previous = self.cache.get(self.get_window_key(window - 1), 0)
+        self.current = self._increment(current_key)
+
+        weight = 1 - self.elapsed / self.duration
+        estimated = self.previous * weight + self.current
+
+        if estimated > self.num_requests:
+            # Rejected requests do not count against the client.
+            self._increment(current_key, -1)
+            self.current -= 1
+            self._set_headers(request, 0)
+            return self.throttle_failure()
+
+        self._set_headers(request, math.floor(self.num_requests - estimated))
+        return self.throttle_success()
+
+    def _increment(self, key, amount=1):
+        # Both windows must be readable until the next one ends.
+        return int(
+            self.script(
+                keys=[self.cache.make_key(key)], args=[amount, self.duration * 2]
+            )
+        )
+
+    def throttle_success(self):
+        return True
+
+    def _set_headers(self, request, remaining):
+        http_request = getattr(request, "_request", request)
+        rate_limit = getattr(http_request, "rate_limit", None)
+
+        if rate_limit is None or remaining < rate_limit["remaining"]:
+            http_request.rate_limit = {
+                "limit": self.num_requests,
+                "remaining": remaining,
+                "reset": math.ceil(self.duration - self.elapsed),
+            }
+
+    def wait(self):
+        """
+        Seconds until the estimated rate leaves room for one more request.
+        """
+        room = self.num_requests - 1
+
+        if self.current <= room and self.previous:
+            wait = (
+                self.duration * (1 - (room - self.current) / self.previous)
+                - self.elapsed
+            )
+        else:
+            # Wait for the current window to become the previous one
+            wait = (self.duration - self.elapsed) + self.duration * (
+                1 - room / self.current
+            )
+        return max(wait, 0)
@@ -0,0 +1,7 @@
+from rest_framework import throttling
+
+from .SlidingWindowRateThrottle import SlidingWindowRateThrottle
+
+
+class UserRateThrottle(SlidingWindowRateThrottle, throttling.UserRateThrottle):
+    scope = "user"
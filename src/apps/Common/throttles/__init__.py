@@ -1,3 +1,7 @@
+from apps.Common.throttles.AgentGenerationThrottle import AgentGenerationThrottle
+from apps.Common.throttles.AnonRateThrottle import AnonRateThrottle
 from apps.Common.throttles.AuthRateThrottle import AuthRateThrottle
 from apps.Common.throttles.FailedLoginThrottle import FailedLoginThrottle
 from apps.Common.throttles.RefreshRateThrottle import RefreshRateThrottle
+from apps.Common.throttles.SlidingWindowRateThrottle import SlidingWindowRateThrottle
+from apps.Common.throttles.UserRateThrottle import UserRateThrottle
@@ -30,6 +30,27 @@ CSRF_TRUSTED_ORIGINS = os.environ.get("CSRF_TRUSTED_ORIGINS", "*").split(",")
 
 STRIPE_API_KEY = os.environ.get("STRIPE_API_KEY")
 STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET")
+# Local stub server (stripe-mock) for tests, stripe API when empty
+STRIPE_API_BASE = os.environ.get("STRIPE_API_BASE") or None
+STRIPE_CONNECT_TIMEOUT = float(os.environ.get("STRIPE_CONNECT_TIMEOUT", "3"))
+STRIPE_READ_TIMEOUT = float(os.environ.get("STRIPE_READ_TIMEOUT", "20"))
+STRIPE_MAX_NETWORK_RETRIES = int(os.environ.get("STRIPE_MAX_NETWORK_RETRIES", "2"))
+STRIPE_HTTP_POOL_SIZE = int(os.environ.get("STRIPE_HTTP_POOL_SIZE", "10"))
+
+# Request profiling histograms, a fraction of the requests also logs its
+# slowest queries (0 disables the log)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "True") == "True"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_SLOW_QUERIES = int(os.environ.get("PROFILING_SLOW_QUERIES", "5"))
+
+OLLAMA_URL = os.environ.get("OLLAMA_URL")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL")
+
+# Dependency checks of the readiness probe, their report is reused for a few
+# seconds. A failing optional dependency only degrades the node
+HEALTH_CHECK_TIMEOUT = float(os.environ.get("HEALTH_CHECK_TIMEOUT", "1"))
+HEALTH_CHECK_CACHE_SECONDS = float(os.environ.get("HEALTH_CHECK_CACHE_SECONDS", "5"))
+HEALTH_CHECK_OPTIONAL = os.environ.get("HEALTH_CHECK_OPTIONAL", "ollama").split(",")
 
 # ====================================
 # APPS
@@ -43,6 +64,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -88,7 +110,10 @@ DJANGO_MIDDLEWARE = [
 
 THIRD_PARTY_MIDDLEWARE = []
 
-PERSONAL_MIDDLEWARE = []
+PERSONAL_MIDDLEWARE = [
+    "apps.Common.middleware.ProfilingMiddleware",
+    "apps.Common.middleware.RateLimitHeadersMiddleware",
+]
 
 MIDDLEWARE = DJANGO_MIDDLEWARE + THIRD_PARTY_MIDDLEWARE + PERSONAL_MIDDLEWARE
 
@@ -159,8 +184,8 @@ REST_FRAMEWORK = {
     "VERSION_PARAM": "version",
     # THROTTLE
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "apps.Common.throttles.AnonRateThrottle",
+        "apps.Common.throttles.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "50/day",
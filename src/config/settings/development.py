@@ -45,7 +45,7 @@ else:
 
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "BACKEND": "apps.Common.cache.ProfiledRedisCache",
         "LOCATION": REDIS_URL,
     }
 }
@@ -88,6 +88,33 @@ CELERY_BROKER_URL = (
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# ====================================
+# CELERY BEAT
+# ====================================
+
+CELERY_BEAT_SCHEDULE = {
+    "create-pending-message-statuses": {
+        "task": "apps.Chat.tasks.MessageTask.create_pending_message_statuses",
+        "schedule": 30.0,
+    },
+    "collect-orphan-blobs": {
+        "task": "apps.Common.tasks.BlobTask.collect_orphan_blobs",
+        "schedule": 60.0 * 60,
+    },
+    "flush-quota-usage": {
+        "task": "apps.Billing.tasks.UsageTask.flush_quota_usage",
+        "schedule": 15.0,
+    },
+    "create-pending-stripe-customers": {
+        "task": "apps.Billing.tasks.StripeCustomerTask.create_pending_stripe_customers",
+        "schedule": 60.0,
+    },
+    "process-pending-stripe-events": {
+        "task": "apps.Billing.tasks.StripeEventTask.process_pending_stripe_events",
+        "schedule": 60.0,
+    },
+}
+
 # ====================================
 # STATIC CONTENT
 # ====================================
@@ -102,3 +129,24 @@ MEDIA_URL = "/media/"
 
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfields")
 MEDIA_ROOT = os.path.join(BASE_DIR, "mediafields")
+
+# Protected media is sent by the web server when a header is configured:
+# "X-Accel-Redirect" (nginx, internal location at MEDIA_OFFLOAD_PREFIX) or
+# "X-Sendfile" (apache/lighttpd, absolute path).
+MEDIA_OFFLOAD_HEADER = os.environ.get("MEDIA_OFFLOAD_HEADER") or None
+MEDIA_OFFLOAD_PREFIX = os.environ.get("MEDIA_OFFLOAD_PREFIX", "/protected-media/")
+
+# ====================================
+# CHUNKED UPLOADS
+# ====================================
+
+CHUNKED_UPLOAD_ROOT = os.path.join(MEDIA_ROOT, "partial_uploads")
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+CHUNKED_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+
+# ====================================
+# CONTENT ADDRESSED STORAGE
+# ====================================
+
+# Seconds an unreferenced blob is kept before being collected
+BLOB_GRACE_PERIOD = 60 * 60 * 24
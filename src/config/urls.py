@@ -1,7 +1,6 @@
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from .views import HealthCheckView
 
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -9,12 +8,16 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from .views import HealthCheckView, LivenessView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("Authentication.api.v1.urls")),
     path("api/v1/", include("Billing.api.v1.urls")),
     path("api/v1/", include("Chat.api.v1.urls")),
     path("api/health/", HealthCheckView.as_view(), name="health_check"),
+    path("api/health/live/", LivenessView.as_view(), name="health_live"),
+    path("api/health/ready/", HealthCheckView.as_view(), name="health_ready"),
     path("", include("django_prometheus.urls")),
 ]
 
@@ -1,17 +1,39 @@
-from rest_framework.views import APIView
+from django.db import transaction
+from django.utils.decorators import method_decorator
+
+from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework.views import APIView
+
+from apps.Common.health import UNHEALTHY, get_health_report
 
 
+# The probes do not open a transaction, the database is checked on its own
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class LivenessView(APIView):
+    """The process answers, the dependencies are not checked."""
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+    def get(self, request, *args, **kwargs):
+        return Response({"status": "alive"}, status=status.HTTP_200_OK)
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class HealthCheckView(APIView):
+    """Readiness, 503 while a required dependency is unhealthy."""
+
     authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = []
 
     def get(self, request, *args, **kwargs):
-        health_status = {
-            "status": "healthy",
-            "services": {"database": "unhealthy", "cache": "unhealthy"},
-        }
+        report = get_health_report()
+
+        if report["status"] == UNHEALTHY:
+            return Response(report, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-        return Response(health_status, status=status.HTTP_200_OK)
+        return Response(report, status=status.HTTP_200_OK)
@@ -5,6 +5,8 @@ This module provides shared fixtures for API testing, including:
 - Database configuration
 - API client instances
 - Authentication helpers
+- A fakeredis backed cache
+- A user allowed to use the Chat API
 - URL fixtures for Authentication endpoints
 - Common test data (credentials, payloads)
 - Throttle disabling fixtures
@@ -76,6 +78,51 @@ def user_factory(django_user_model):
     return create_user
 
 
+# =============================================================================
+# Cache Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def redis_cache(settings):
+    """
+    Use a RedisCache backed by fakeredis, for the code that runs INCR and Lua
+    scripts on the cache client.
+    """
+    import fakeredis
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+            "OPTIONS": {
+                "connection_class": fakeredis.FakeConnection,
+                "server": fakeredis.FakeServer(),
+            },
+        }
+    }
+    return settings
+
+
+# =============================================================================
+# Chat Fixtures
+# =============================================================================
+
+
+@pytest.fixture
+def chat_user(db):
+    """Return a user with a participant, a subscription and the Chat permissions."""
+    from django.contrib.auth.models import Permission
+
+    from .factories import ParticipantFactory, SubscriptionFactory, UserFactory
+
+    user = UserFactory()
+    user.user_permissions.set(Permission.objects.filter(content_type__app_label="Chat"))
+    SubscriptionFactory(user=user)
+    ParticipantFactory(user=user)
+    return user
+
+
 # =============================================================================
 # URL Fixtures for Authentication Endpoints
 # =============================================================================
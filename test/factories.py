@@ -0,0 +1,206 @@
+"""
+factory_boy factories for the models of the API.
+
+Users get an MD5 hashed password when the tests configure that hasher, so
+seeding many of them stays cheap.
+"""
+
+from datetime import timedelta
+
+from django.utils.timezone import now
+
+import factory
+from factory.django import DjangoModelFactory
+
+from apps.Common.models import (
+    AgentType,
+    MessageType,
+    NatureType,
+    ParticipantType,
+    PlanOption,
+    StatusSuscription,
+)
+
+DEFAULT_PASSWORD = "Testpassword123$"
+
+
+# =============================================================================
+# Authentication
+# =============================================================================
+
+
+class UserFactory(DjangoModelFactory):
+    class Meta:
+        model = "Authentication.CustomUser"
+        skip_postgeneration_save = True
+
+    email = factory.Sequence(lambda n: f"user{n}@example.com")
+    phone = factory.Sequence(lambda n: f"+1212{n:07d}")
+    password = factory.django.Password(DEFAULT_PASSWORD)
+    strip_customer_id = factory.Sequence(lambda n: f"cus_{n}")
+
+
+# =============================================================================
+# Chat
+# =============================================================================
+
+
+class NatureFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.Nature"
+        django_get_or_create = ("name",)
+
+    name = factory.Iterator(NatureType.values)
+    description = factory.Faker("sentence")
+
+
+class AgentFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.Agent"
+        skip_postgeneration_save = True
+
+    promp_type = factory.Faker("paragraph")
+    description = factory.Faker("sentence")
+    agent_type = factory.Iterator(AgentType.values)
+
+    @factory.post_generation
+    def natures(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.natures.set(extracted)
+
+
+class ParticipantFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.Participant"
+
+    participant_type = ParticipantType.USER
+    user = factory.SubFactory(UserFactory)
+    first_name = factory.Faker("first_name")
+    last_name = factory.Faker("last_name")
+    nickname = factory.Sequence(lambda n: f"participant{n}")
+
+
+class AgentParticipantFactory(ParticipantFactory):
+    participant_type = ParticipantType.AGENT
+    user = None
+    agent = factory.SubFactory(AgentFactory)
+    nickname = factory.Sequence(lambda n: f"agent{n}")
+
+
+class ChatFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.Chat"
+        skip_postgeneration_save = True
+
+    last_message_at = factory.LazyFunction(now)
+
+    @factory.post_generation
+    def participants(self, create, extracted, **kwargs):
+        if create and extracted:
+            for participant in extracted:
+                ChatParticipantFactory(chat=self, participant=participant)
+
+
+class ChatParticipantFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.ChatParticipant"
+
+    chat = factory.SubFactory(ChatFactory)
+    participant = factory.SubFactory(ParticipantFactory)
+
+
+class MessageFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.Message"
+
+    chat = factory.SubFactory(ChatFactory)
+    participant = factory.SubFactory(ParticipantFactory)
+    message_type = MessageType.TEXT
+    content = factory.Faker("sentence")
+    statuses_created = True
+
+
+class UploadFactory(DjangoModelFactory):
+    class Meta:
+        model = "Chat.Upload"
+
+    participant = factory.SubFactory(ParticipantFactory)
+    file_name = factory.Sequence(lambda n: f"file{n}.bin")
+    content_type = "application/octet-stream"
+    size = 1024
+
+
+# =============================================================================
+# Billing
+# =============================================================================
+
+
+class FeatureFactory(DjangoModelFactory):
+    class Meta:
+        model = "Billing.Feature"
+        django_get_or_create = ("code",)
+
+    name = factory.SelfAttribute("code")
+    description = factory.Faker("sentence")
+
+
+class PlanFactory(DjangoModelFactory):
+    class Meta:
+        model = "Billing.Plan"
+        django_get_or_create = ("name",)
+        skip_postgeneration_save = True
+
+    name = PlanOption.PRO
+    description = factory.Faker("sentence")
+
+    @factory.post_generation
+    def features(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.features.set(extracted)
+
+
+class CurrencyFactory(DjangoModelFactory):
+    class Meta:
+        model = "Billing.Currency"
+        django_get_or_create = ("code",)
+
+    code = "usd"
+    name = "US Dollar"
+    simbol = "$"
+
+
+class PeriodFactory(DjangoModelFactory):
+    class Meta:
+        model = "Billing.Period"
+        django_get_or_create = ("name",)
+
+    name = "MONTHLY"
+    interval_count = 1
+
+
+class PriceFactory(DjangoModelFactory):
+    class Meta:
+        model = "Billing.Price"
+
+    plan = factory.SubFactory(PlanFactory)
+    period = factory.SubFactory(PeriodFactory)
+    currency = factory.SubFactory(CurrencyFactory)
+    amount = 1000
+    stripe_price_id = factory.Sequence(lambda n: f"price_{n}")
+
+
+class SubscriptionFactory(DjangoModelFactory):
+    class Meta:
+        model = "Billing.Subscription"
+
+    stripe_subscription_id = factory.Sequence(lambda n: f"sub_{n}")
+    user = factory.SubFactory(UserFactory)
+    price = factory.SubFactory(PriceFactory)
+    start_date = factory.LazyFunction(now)
+    current_period_start = factory.LazyFunction(now)
+    current_period_end = factory.LazyFunction(lambda: now() + timedelta(days=30))
+    status = StatusSuscription.ACTIVE
+    amount = factory.SelfAttribute("price.amount")
+    currency_code = factory.SelfAttribute("price.currency.code")
+    plan_name = factory.SelfAttribute("price.plan.name")
+    period_name = factory.SelfAttribute("price.period.name")
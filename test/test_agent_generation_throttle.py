@@ -0,0 +1,146 @@
+from django.contrib.auth.models import Permission
+
+import pytest
+from rest_framework.exceptions import Throttled
+
+from apps.Chat.api.v1.consumers.ChatConsumer import ChatConsumer
+from apps.Chat.models import Message
+from apps.Chat.tasks import generate_agent_reply
+from apps.Common.models import AgentType, MessageType
+from apps.Common.throttles import AgentGenerationThrottle
+
+from .factories import (
+    AgentFactory,
+    AgentParticipantFactory,
+    ChatFactory,
+    ParticipantFactory,
+    SubscriptionFactory,
+    UserFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+RATE = 3
+
+
+@pytest.fixture
+def throttle_settings(redis_cache, mocker):
+    redis_cache.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+    mocker.patch.object(AgentGenerationThrottle, "get_rate", return_value=f"{RATE}/1h")
+    return redis_cache
+
+
+@pytest.fixture
+def user():
+    user = UserFactory()
+    user.user_permissions.set(Permission.objects.filter(content_type__app_label="Chat"))
+    SubscriptionFactory(user=user)
+    ParticipantFactory(user=user)
+    return user
+
+
+@pytest.fixture
+def agent_chat(user):
+    agent = AgentParticipantFactory(agent=AgentFactory(agent_type=AgentType.BASIC))
+    return ChatFactory(participants=[user.participant, agent])
+
+
+def send(client, chat):
+    return client.post(
+        "/api/v1/messages/",
+        {"chat": str(chat.id), "message_type": MessageType.TEXT, "content": "Hi"},
+        format="json",
+    )
+
+
+def test_message_over_the_rate_is_throttled(
+    throttle_settings, api_client, user, agent_chat
+):
+    api_client.force_authenticate(user)
+
+    for _ in range(RATE):
+        assert send(api_client, agent_chat).status_code == 201
+
+    response = send(api_client, agent_chat)
+
+    assert response.status_code == 429
+    assert 0 < int(response["Retry-After"]) <= 3600 / RATE
+    assert Message.objects.filter(chat=agent_chat).count() == RATE
+
+
+def test_messages_between_users_take_no_token(throttle_settings, api_client, user):
+    api_client.force_authenticate(user)
+    chat = ChatFactory(participants=[user.participant, ParticipantFactory()])
+
+    for _ in range(RATE + 1):
+        assert send(api_client, chat).status_code == 201
+
+
+def test_websocket_message_over_the_rate_is_throttled(
+    throttle_settings, user, agent_chat
+):
+    consumer = ChatConsumer()
+    consumer.user = user
+    consumer.chat_id = str(agent_chat.id)
+
+    for _ in range(RATE):
+        consumer.create_message("Hi")
+
+    with pytest.raises(Throttled) as error:
+        consumer.create_message("Hi")
+
+    assert error.value.wait > 0
+    assert Message.objects.filter(chat=agent_chat).count() == RATE
+
+
+def test_message_of_a_non_member_takes_no_token(
+    throttle_settings, api_client, user, agent_chat
+):
+    stranger = UserFactory()
+    stranger.user_permissions.set(user.user_permissions.all())
+    SubscriptionFactory(user=stranger)
+    ParticipantFactory(user=stranger)
+    api_client.force_authenticate(stranger)
+
+    for _ in range(RATE + 1):
+        assert send(api_client, agent_chat).status_code == 403
+
+    throttle = AgentGenerationThrottle()
+    key = throttle.get_cache_key(stranger, AgentType.BASIC)
+    assert not throttle.client.exists(key)
+
+
+def test_agent_reply_is_generated_by_a_worker(
+    throttle_settings,
+    api_client,
+    user,
+    agent_chat,
+    mocker,
+    django_capture_on_commit_callbacks,
+):
+    delay = mocker.patch.object(generate_agent_reply, "delay")
+    execute = mocker.patch(
+        "apps.Chat.service.OllamaChatService.OllamaChatService.execute",
+        return_value="Hello",
+    )
+    api_client.force_authenticate(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        send(api_client, agent_chat)
+
+    # Nothing is generated in the request
+    execute.assert_not_called()
+    message_id = delay.call_args.kwargs["message_id"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        generate_agent_reply(message_id)
+
+    reply = Message.objects.get(chat=agent_chat, participant__agent__isnull=False)
+    assert reply.content == "Hello"
+    assert execute.call_args.kwargs["prompt_type"] == reply.participant.agent.promp_type
+    # Sent like any other message, and not answered
+    agent_chat.refresh_from_db()
+    assert agent_chat.last_message_at == reply.sent_at
+    delay.assert_called_once()
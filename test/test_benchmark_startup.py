@@ -0,0 +1,36 @@
+import json
+
+from django.core.management import call_command
+
+
+def test_startup_does_not_load_the_deferred_modules(tmp_path):
+    output = tmp_path / "startup.json"
+
+    call_command("benchmark_startup", runs=1, top=5, check=True, output=str(output))
+
+    results = json.loads(output.read_text())
+    assert results["deferred_loaded"] == []
+    assert results["setup_ms"]["median"] <= results["urls_ms"]["median"]
+    assert 0 < len(results["slowest_imports"]) <= 5
+
+
+def test_slowest_imports_are_top_level(mocker):
+    from apps.Common.management.commands.benchmark_startup import Command
+
+    importtime = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     _io",
+            "import time:       200 |       5000 |   django.conf",
+            "import time:       300 |       9000 | django",
+            "import time:       400 |        400 | json",
+        ]
+    )
+    mocker.patch.object(Command, "run_probe", return_value=({}, importtime))
+
+    imports = Command().get_slowest_imports("", {}, 5)
+
+    assert imports == [
+        {"module": "django", "cumulative_ms": 9.0},
+        {"module": "json", "cumulative_ms": 0.4},
+    ]
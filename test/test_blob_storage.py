@@ -0,0 +1,106 @@
+import os
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.utils.timezone import now
+
+import pytest
+
+from apps.Common.models import Blob, MessageType
+from apps.Common.storage import content_addressed_storage
+from apps.Common.tasks import collect_orphan_blobs
+
+from .factories import MessageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def blob_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.BLOB_GRACE_PERIOD = 60
+    return settings
+
+
+def file_message(content):
+    return MessageFactory(
+        message_type=MessageType.FILE,
+        content=None,
+        attach=ContentFile(content, name="notes.txt"),
+    )
+
+
+def make_orphan(name):
+    Blob.objects.filter(sha256=Blob.get_sha256(name)).update(
+        reference_count=0,
+        last_referenced_at=now() - timedelta(days=1),
+    )
+
+
+def test_identical_files_share_a_blob(blob_settings):
+    first = file_message(b"same content")
+    second = file_message(b"same content")
+
+    assert first.attach.name == second.attach.name
+    blob = Blob.objects.get()
+    assert blob.reference_count == 2
+    assert blob.size == len(b"same content")
+
+
+def test_references_follow_updates_and_deletes(blob_settings):
+    first = file_message(b"same content")
+    second = file_message(b"same content")
+    old_name = first.attach.name
+
+    first.attach = ContentFile(b"other content", name="notes.txt")
+    first.save()
+    assert Blob.objects.get(sha256=Blob.get_sha256(old_name)).reference_count == 1
+
+    second.delete()
+    assert Blob.objects.get(sha256=Blob.get_sha256(old_name)).reference_count == 0
+    assert (
+        Blob.objects.get(sha256=Blob.get_sha256(first.attach.name)).reference_count == 1
+    )
+
+
+def test_collector_deletes_orphans_after_the_grace_period(blob_settings):
+    message = file_message(b"orphan")
+    name = message.attach.name
+    message.delete()
+
+    # Still in the grace period
+    assert collect_orphan_blobs() == 0
+
+    make_orphan(name)
+    assert collect_orphan_blobs() == 1
+    assert not Blob.objects.exists()
+    assert not content_addressed_storage.exists(name)
+
+
+def test_collector_keeps_untracked_references(blob_settings):
+    message = file_message(b"untracked")
+    make_orphan(message.attach.name)
+
+    assert collect_orphan_blobs() == 0
+    assert content_addressed_storage.exists(message.attach.name)
+
+
+def test_content_stored_again_is_not_collected(blob_settings, mocker):
+    message = file_message(b"stored again")
+    name = message.attach.name
+    message.delete()
+    make_orphan(name)
+
+    get_name = Blob.get_name
+
+    def store_again(sha256):
+        # Upload the same content after the collector listed its candidates
+        mocker.patch.object(Blob, "get_name", get_name)
+        content_addressed_storage.save("notes.txt", ContentFile(b"stored again"))
+        return get_name(sha256)
+
+    mocker.patch.object(Blob, "get_name", side_effect=store_again)
+
+    assert collect_orphan_blobs() == 0
+    assert os.path.exists(content_addressed_storage.path(name))
+    assert Blob.objects.filter(sha256=Blob.get_sha256(name)).exists()
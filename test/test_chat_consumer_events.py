@@ -0,0 +1,39 @@
+import json
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from apps.Chat.api.v1.consumers.ChatConsumer import ChatConsumer
+
+
+def receive(event, mocker):
+    consumer = ChatConsumer()
+    send = mocker.patch.object(consumer, "send")
+
+    async_to_sync(consumer.receive)(text_data=json.dumps(event))
+
+    return json.loads(send.call_args.kwargs["text_data"])
+
+
+@pytest.mark.parametrize("event_type", ["delete_message", "react_message"])
+def test_event_without_handler_is_not_implemented(mocker, event_type):
+    event = {"type": event_type, "message_id": str(uuid4()), "reaction": "+1"}
+    response = receive(event, mocker)
+
+    assert response["type"] == "error"
+    assert response["data"] == [f'The "{event_type}" event is not implemented yet']
+
+
+def test_unknown_event_is_rejected(mocker):
+    response = receive({"type": "edit_message"}, mocker)
+
+    assert response["type"] == "error"
+    assert response["data"] == {"type": ['Unsupported event type "edit_message".']}
+
+
+def test_invalid_event_is_rejected(mocker):
+    response = receive({"type": "seen", "message_id": "not-an-id"}, mocker)
+
+    assert response["type"] == "error"
+    assert "message_id" in response["data"]
@@ -0,0 +1,170 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from django.db import connection
+from django.utils.timezone import now
+
+import pytest
+
+from apps.Chat.models import Message, Upload
+from apps.Chat.service import AppendUploadChunkService
+from apps.Common.models import Blob, MessageType
+
+from .factories import ChatFactory, ParticipantFactory
+
+pytestmark = pytest.mark.django_db
+
+DATA = os.urandom(3000)
+
+
+@pytest.fixture
+def upload_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.CHUNKED_UPLOAD_ROOT = str(tmp_path / "partial_uploads")
+    settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 1024
+    settings.CHUNKED_UPLOAD_MAX_SIZE = 4096
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+    return settings
+
+
+@pytest.fixture
+def client(upload_settings, api_client, chat_user):
+    api_client.force_authenticate(chat_user)
+    return api_client
+
+
+def create_upload(client, data=DATA, content_type="image/png"):
+    response = client.post(
+        "/api/v1/uploads/",
+        {"file_name": "photo.png", "content_type": content_type, "size": len(data)},
+        format="json",
+    )
+    assert response.status_code == 201
+    return response.data["id"]
+
+
+def put_chunk(client, upload_id, data, offset):
+    return client.put(
+        f"/api/v1/uploads/{upload_id}/chunk/",
+        data,
+        content_type="application/octet-stream",
+        HTTP_UPLOAD_OFFSET=str(offset),
+    )
+
+
+def upload(client, data=DATA, content_type="image/png"):
+    upload_id = create_upload(client, data, content_type)
+    for offset in range(0, len(data), 1024):
+        chunk = data[offset : offset + 1024]
+        assert put_chunk(client, upload_id, chunk, offset).status_code == 200
+    return client.post(f"/api/v1/uploads/{upload_id}/complete/")
+
+
+def test_upload_is_resumed_from_the_committed_offset(client):
+    upload_id = create_upload(client)
+
+    assert put_chunk(client, upload_id, DATA[:1024], 0).data["offset"] == 1024
+
+    # A retried chunk is rejected with the offset to resume from
+    response = put_chunk(client, upload_id, DATA[:1024], 0)
+    assert response.status_code == 400
+    assert response.data["errors"][0]["detail"] == "Expected offset 1024, received 0"
+    assert client.get(f"/api/v1/uploads/{upload_id}/").data["offset"] == 1024
+
+    put_chunk(client, upload_id, DATA[1024:2048], 1024)
+    put_chunk(client, upload_id, DATA[2048:], 2048)
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete/")
+
+    assert response.status_code == 200
+    assert response.data["sha256"] == hashlib.sha256(DATA).hexdigest()
+    upload = Upload.objects.get(id=upload_id)
+    with upload.file.open("rb") as stored:
+        assert stored.read() == DATA
+
+
+def test_invalid_chunks_are_rejected(client):
+    upload_id = create_upload(client)
+
+    # Over the chunk size
+    assert put_chunk(client, upload_id, DATA[:2048], 0).status_code == 400
+    # Over the declared size
+    put_chunk(client, upload_id, DATA[:1024], 0)
+    put_chunk(client, upload_id, DATA[:1024], 1024)
+    assert put_chunk(client, upload_id, DATA[:1024], 2048).status_code == 400
+    # Not every byte was received
+    assert client.post(f"/api/v1/uploads/{upload_id}/complete/").status_code == 400
+
+
+def test_identical_uploads_share_the_stored_file(client):
+    first = upload(client)
+    second = upload(client)
+
+    assert first.data["sha256"] == second.data["sha256"]
+    assert Blob.objects.count() == 1
+    assert Blob.objects.get().reference_count == 2
+
+
+def test_upload_is_attached_to_a_message(client, chat_user):
+    chat = ChatFactory(participants=[chat_user.participant, ParticipantFactory()])
+    upload_id = upload(client).data["id"]
+
+    response = client.post(
+        "/api/v1/messages/",
+        {"chat": str(chat.id), "message_type": MessageType.IMAGE, "upload": upload_id},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    message = Message.objects.get(chat=chat)
+    assert message.image.name == Upload.objects.get(id=upload_id).file.name
+
+
+def test_content_type_must_match_the_message_type(client, chat_user):
+    chat = ChatFactory(participants=[chat_user.participant, ParticipantFactory()])
+    upload_id = upload(client, content_type="application/pdf").data["id"]
+
+    response = client.post(
+        "/api/v1/messages/",
+        {"chat": str(chat.id), "message_type": MessageType.VIDEO, "upload": upload_id},
+        format="json",
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chunk_is_written_outside_of_a_transaction(client, mocker):
+    mocker.patch.dict(connection.settings_dict, {"ATOMIC_REQUESTS": True})
+    write_chunk = AppendUploadChunkService._write_chunk
+    in_transaction = []
+
+    def spy(service, *args):
+        in_transaction.append(connection.in_atomic_block)
+        return write_chunk(service, *args)
+
+    mocker.patch.object(AppendUploadChunkService, "_write_chunk", spy)
+    upload_id = create_upload(client)
+
+    assert put_chunk(client, upload_id, DATA[:1024], 0).status_code == 200
+    assert in_transaction == [False]
+
+
+def test_chunk_being_written_is_reserved(client):
+    upload_id = create_upload(client)
+    Upload.objects.filter(id=upload_id).update(
+        chunk_reserved_until=now() + timedelta(minutes=1)
+    )
+
+    response = put_chunk(client, upload_id, DATA[:1024], 0)
+    assert response.status_code == 400
+    assert "being written" in response.data["errors"][0]["detail"]
+
+    # An expired reservation is taken over by the retry of the client
+    Upload.objects.filter(id=upload_id).update(
+        chunk_reserved_until=now() - timedelta(seconds=1)
+    )
+    assert put_chunk(client, upload_id, DATA[:1024], 0).data["offset"] == 1024
+    assert Upload.objects.get(id=upload_id).chunk_reserved_until is None
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+
+import pytest
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.Common.throttles import FailedLoginThrottle
+
+
+@pytest.fixture
+def throttle_settings(redis_cache):
+    cache.clear()
+    return redis_cache
+
+
+def login_request(email="user@example.com", ip="10.0.0.1"):
+    request = APIRequestFactory().post(
+        "/", {"email": email}, format="json", REMOTE_ADDR=ip
+    )
+    return Request(request, parsers=[JSONParser()])
+
+
+def fail(request, times=1):
+    for _ in range(times):
+        FailedLoginThrottle().record_failed_attempt(request)
+
+
+def allowed(request):
+    return FailedLoginThrottle().allow_request(request, None)
+
+
+def test_ip_is_blocked_after_its_failures(throttle_settings):
+    fail(login_request(), 2)
+    assert allowed(login_request())
+
+    fail(login_request())
+
+    # Any email from the same IP
+    assert not allowed(login_request(email="other@example.com"))
+    assert allowed(login_request(ip="10.0.0.2"))
+
+
+def test_email_is_blocked_from_every_ip(throttle_settings):
+    for n in range(10):
+        fail(login_request(email=" User@Example.com", ip=f"10.0.1.{n}"))
+
+    assert not allowed(login_request(ip="10.0.2.1"))
+    assert allowed(login_request(email="other@example.com", ip="10.0.2.1"))
+
+
+def test_parallel_failures_are_all_counted(throttle_settings):
+    request = login_request()
+    throttle = FailedLoginThrottle()
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: throttle.record_failed_attempt(request), range(9)))
+
+    assert cache.get(throttle.get_cache_key(request)) == 9
+    assert cache.get(throttle.get_email_cache_key(request)) == 9
+
+
+def test_block_lasts_the_whole_duration(throttle_settings, mocker):
+    touch = mocker.spy(cache, "touch")
+    request = login_request()
+
+    fail(request, 2)
+    touch.assert_not_called()
+
+    fail(request)
+    touch.assert_called_once_with(FailedLoginThrottle().get_cache_key(request), 30 * 60)
+
+
+def test_successful_login_resets_the_counters(throttle_settings):
+    request = login_request()
+    fail(request, 3)
+
+    FailedLoginThrottle().reset(request)
+
+    assert allowed(request)
+    assert cache.get(FailedLoginThrottle().get_email_cache_key(request)) is None
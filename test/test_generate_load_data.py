@@ -0,0 +1,73 @@
+import random
+
+from django.core.management import call_command
+from django.db.models import Count, Max
+
+import pytest
+
+
+def test_power_law_is_bounded():
+    from apps.Common.management.commands.generate_load_data import power_law
+
+    rng = random.Random(1)
+    samples = [power_law(rng, 3, 50, 2.5) for _ in range(1000)]
+
+    assert min(samples) >= 3
+    assert max(samples) <= 50
+    # Heavy tail, most of the groups are small
+    assert sorted(samples)[500] < 10
+
+
+def test_allocate_keeps_the_total():
+    from apps.Common.management.commands.generate_load_data import allocate
+
+    counts = allocate(1000, [1, 10, 100, 3], random.Random(1))
+
+    assert sum(counts) == 1000
+    assert counts[2] > counts[1] > counts[0]
+
+
+def test_copy_value_escapes_the_text_format():
+    from apps.Common.management.commands.generate_load_data import copy_value
+
+    assert copy_value(None) == "\\N"
+    assert copy_value(True) == "t"
+    assert copy_value({"a": 1}) == '{"a": 1}'
+    assert copy_value("a\tb\nc\\") == "a\\tb\\nc\\\\"
+
+
+@pytest.mark.django_db
+def test_generate_load_data(capsys):
+    from apps.Authentication.models import CustomUser
+    from apps.Chat.models import Chat, ChatParticipant, Message, Participant
+
+    call_command(
+        "generate_load_data",
+        users=50,
+        chats=30,
+        messages=400,
+        group_ratio=0.5,
+        max_group_size=10,
+        batch_size=40,
+        seed=1,
+    )
+
+    assert CustomUser.objects.count() == 50
+    assert Participant.objects.count() == 50
+    assert Chat.objects.count() == 30
+    assert Message.objects.count() == 400
+
+    chats = Chat.objects.annotate(
+        members=Count("chatparticipant", distinct=True),
+        last_sent_at=Max("message__sent_at"),
+    )
+    for chat in chats:
+        assert 2 <= chat.members <= 10
+        assert chat.members == 2 or chat.name
+        assert chat.last_sent_at == chat.last_message_at
+
+    # Every message is sent by a member of its chat
+    memberships = set(ChatParticipant.objects.values_list("chat_id", "participant_id"))
+    assert set(Message.objects.values_list("chat_id", "participant_id")) <= memberships
+
+    assert "messages: 400/400" in capsys.readouterr().out
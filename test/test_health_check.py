@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from apps.Common.health import HealthChecker
+
+
+@pytest.fixture
+def health_settings(settings):
+    settings.HEALTH_CHECK_TIMEOUT = 0.2
+    settings.HEALTH_CHECK_CACHE_SECONDS = 60
+    settings.HEALTH_CHECK_OPTIONAL = ["ollama"]
+
+
+def failing_check():
+    raise ConnectionError("redis://:secret@redis:6379")
+
+
+def test_healthy_report_has_the_latency_of_every_check(health_settings):
+    report = HealthChecker(
+        {"database": lambda: None, "cache": lambda: None}
+    ).get_report()
+
+    assert report["status"] == "healthy"
+    assert set(report["services"]) == {"database", "cache"}
+    for service in report["services"].values():
+        assert service["status"] == "healthy"
+        assert service["latency_ms"] >= 0
+
+
+def test_failing_required_check_is_unhealthy(health_settings):
+    report = HealthChecker(
+        {"database": lambda: None, "cache": failing_check}
+    ).get_report()
+
+    assert report["status"] == "unhealthy"
+    # The message is not exposed
+    assert report["services"]["cache"]["error"] == "ConnectionError"
+
+
+def test_failing_optional_check_is_degraded(health_settings):
+    report = HealthChecker(
+        {"database": lambda: None, "ollama": failing_check}
+    ).get_report()
+
+    assert report["status"] == "degraded"
+
+
+def test_hanging_check_times_out_and_is_not_started_twice(health_settings):
+    release = threading.Event()
+    calls = []
+
+    def hanging_check():
+        calls.append(1)
+        release.wait(5)
+
+    checker = HealthChecker({"broker": hanging_check})
+    try:
+        report = checker.run()
+        assert report["status"] == "unhealthy"
+        assert report["services"]["broker"]["error"] == "Timeout"
+
+        checker.run()
+        assert len(calls) == 1
+    finally:
+        release.set()
+
+
+def test_report_is_cached(health_settings):
+    calls = []
+    checker = HealthChecker({"database": lambda: calls.append(1)})
+
+    first = checker.get_report()
+    second = checker.get_report()
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_liveness_does_not_check_the_dependencies(api_client, mocker):
+    get_health_report = mocker.patch("config.views.get_health_report")
+
+    response = api_client.get("/api/health/live/")
+
+    assert response.status_code == 200
+    get_health_report.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "health_status, status_code",
+    [("healthy", 200), ("degraded", 200), ("unhealthy", 503)],
+)
+def test_readiness_status_code(api_client, mocker, health_status, status_code):
+    mocker.patch(
+        "config.views.get_health_report",
+        return_value={"status": health_status, "services": {}},
+    )
+
+    response = api_client.get("/api/health/ready/")
+
+    assert response.status_code == status_code
+    assert response.json()["status"] == health_status
@@ -0,0 +1,29 @@
+import pytest
+from PIL import Image
+
+from apps.Common.images import encode_blurhash
+
+
+@pytest.mark.parametrize(
+    "image,expected",
+    [
+        (
+            Image.linear_gradient("L").convert("RGB").resize((32, 32)),
+            "L#HetWoffQof00WBfQWBxuj[fQj[",
+        ),
+        (
+            Image.effect_mandelbrot((32, 32), (-2, -1.5, 1, 1.5), 50).convert("RGB"),
+            "L142M3t79FM{t7j[ayay00M{t7%M",
+        ),
+    ],
+)
+def test_encode_blurhash_matches_reference(image, expected):
+    assert encode_blurhash(image) == expected
+
+
+def test_encode_blurhash_is_independent_of_image_size():
+    small = Image.effect_mandelbrot((32, 32), (-2, -1.5, 1, 1.5), 50)
+    large = small.resize((3200, 3200))
+
+    assert len(encode_blurhash(large)) == 28
+    assert encode_blurhash(large)[0] == encode_blurhash(small)[0]
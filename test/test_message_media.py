@@ -0,0 +1,146 @@
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+import pytest
+
+from apps.Chat.api.v1.serializers import MessageDetailedSerializer
+from apps.Chat.models import ChatParticipant, Message
+from apps.Chat.service import CheckChatMembershipService
+from apps.Common.models import MessageType
+
+from .factories import (
+    ChatFactory,
+    MessageFactory,
+    ParticipantFactory,
+    SubscriptionFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.MEDIA_OFFLOAD_HEADER = None
+    settings.MEDIA_OFFLOAD_PREFIX = "/protected-media/"
+    return settings
+
+
+@pytest.fixture
+def message(media_settings, chat_user):
+    chat = ChatFactory(participants=[chat_user.participant, ParticipantFactory()])
+    return MessageFactory(
+        chat=chat,
+        participant=chat_user.participant,
+        message_type=MessageType.FILE,
+        content=None,
+        attach=ContentFile(DATA, name="data.bin"),
+    )
+
+
+@pytest.fixture
+def client(api_client, chat_user):
+    api_client.force_authenticate(chat_user)
+    return api_client
+
+
+def get_media(client, message, **headers):
+    return client.get(f"/api/v1/messages/{message.id}/media/attach/", **headers)
+
+
+def test_whole_file_is_served_with_a_strong_etag(client, message):
+    response = get_media(client, message)
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == DATA
+    assert response["ETag"] == f'"{message.attach.name.rsplit("/", 1)[-1]}"'
+    assert "immutable" in response["Cache-Control"]
+    assert response["Accept-Ranges"] == "bytes"
+
+
+def test_matching_etag_is_not_modified(client, message):
+    etag = get_media(client, message)["ETag"]
+
+    response = get_media(client, message, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert not response.content
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [("bytes=10-19", 10, 19), ("bytes=1000-", 1000, 1023), ("bytes=-4", 1020, 1023)],
+)
+def test_range_is_served_partially(client, message, header, start, end):
+    response = get_media(client, message, HTTP_RANGE=header)
+
+    assert response.status_code == 206
+    assert b"".join(response.streaming_content) == DATA[start : end + 1]
+    assert response["Content-Range"] == f"bytes {start}-{end}/{len(DATA)}"
+
+
+def test_range_out_of_the_file_is_not_satisfiable(client, message):
+    response = get_media(client, message, HTTP_RANGE="bytes=2000-")
+
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(DATA)}"
+
+
+def test_stale_if_range_serves_the_whole_file(client, message):
+    response = get_media(
+        client, message, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+    )
+
+    assert response.status_code == 200
+
+
+def test_web_server_sends_the_file_when_offloaded(client, message, media_settings):
+    media_settings.MEDIA_OFFLOAD_HEADER = "X-Accel-Redirect"
+
+    response = get_media(client, message)
+
+    assert response.status_code == 200
+    assert response["X-Accel-Redirect"] == f"/protected-media/{message.attach.name}"
+    assert not response.content
+
+
+def test_media_is_only_served_to_chat_members(api_client, message):
+    stranger = ParticipantFactory()
+    stranger.user.user_permissions.set(
+        Permission.objects.filter(content_type__app_label="Chat")
+    )
+    SubscriptionFactory(user=stranger.user)
+    api_client.force_authenticate(stranger.user)
+
+    assert get_media(api_client, message).status_code == 403
+
+
+def test_removed_member_loses_access_once_committed(
+    client, message, chat_user, django_capture_on_commit_callbacks
+):
+    assert get_media(client, message).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        ChatParticipant.objects.filter(participant=chat_user.participant).delete()
+        # Not invalidated before the commit, a request would cache it again
+        assert cache.get(CheckChatMembershipService.get_cache_key(message.chat_id))
+
+    assert callbacks
+    assert get_media(client, message).status_code == 403
+
+
+def test_previews_are_linked_to_the_media_endpoint(client, message):
+    name = default_storage.save("previews/data/small.webp", ContentFile(b"webp"))
+    Message.objects.filter(id=message.id).update(previews={"small": name})
+    message.refresh_from_db()
+
+    url = MessageDetailedSerializer(message).data["previews"]["small"]
+
+    assert url == f"/api/v1/messages/{message.id}/media/small/"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"webp"
@@ -0,0 +1,90 @@
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+import pytest
+from PIL import Image, ImageFile
+
+from apps.Chat.models import Message
+from apps.Chat.tasks import generate_message_previews
+from apps.Common.models import MessageType
+
+from .factories import MessageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def media_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    return settings
+
+
+def image_message(content):
+    return MessageFactory(
+        message_type=MessageType.IMAGE,
+        content=None,
+        image=ContentFile(content, name="photo.png"),
+    )
+
+
+def png(size=(320, 240)):
+    buffer = BytesIO()
+    Image.effect_mandelbrot(size, (-2, -1.5, 1, 1.5), 50).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_previews_are_generated(media_settings):
+    message = image_message(png())
+
+    generate_message_previews.apply(args=[message.id])
+
+    message.refresh_from_db()
+    assert (message.width, message.height) == (320, 240)
+    assert set(message.previews) == {"medium", "small"}
+    assert message.preview_error is None
+
+
+def test_corrupt_image_is_recorded_and_not_retried(media_settings, mocker):
+    message = image_message(b"not an image")
+    retry = mocker.patch.object(generate_message_previews, "retry")
+
+    result = generate_message_previews.apply(args=[message.id])
+
+    assert result.successful()
+    retry.assert_not_called()
+    message.refresh_from_db()
+    assert message.preview_error == "UnidentifiedImageError"
+    assert message.previews == {}
+
+
+def test_storage_errors_are_retried(media_settings, mocker):
+    message = image_message(b"not an image")
+    mocker.patch(
+        "django.core.files.storage.default_storage.open",
+        side_effect=OSError("disk unavailable"),
+    )
+    retry = mocker.patch.object(
+        generate_message_previews, "retry", side_effect=RuntimeError
+    )
+
+    generate_message_previews.apply(args=[message.id])
+
+    retry.assert_called_once()
+    assert isinstance(retry.call_args.kwargs["exc"], OSError)
+    assert Message.objects.get(id=message.id).preview_error is None
+
+
+def test_huge_image_is_refused_before_decoding(media_settings, mocker):
+    mocker.patch(
+        "apps.Chat.service.GenerateMessagePreviewService.MAX_PREVIEW_PIXELS",
+        320 * 240 - 1,
+    )
+    message = image_message(png())
+    load = mocker.spy(ImageFile.ImageFile, "load")
+
+    generate_message_previews.apply(args=[message.id])
+
+    load.assert_not_called()
+    message.refresh_from_db()
+    assert message.preview_error == "DecompressionBombError"
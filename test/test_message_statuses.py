@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils.timezone import now
+
+import pytest
+
+from apps.Chat.models import ChatParticipant, Message, MessageStatus
+from apps.Chat.tasks import create_message_statuses, create_pending_message_statuses
+
+from .factories import ChatFactory, ChatParticipantFactory, MessageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def chat():
+    chat = ChatFactory()
+    ChatParticipantFactory.create_batch(3, chat=chat)
+    return chat
+
+
+def send(chat, count=1):
+    sender = chat.chatparticipant_set.first().participant
+    return [
+        str(message.id)
+        for message in MessageFactory.create_batch(
+            count, chat=chat, participant=sender, statuses_created=False
+        )
+    ]
+
+
+def not_seen(chat):
+    return sorted(chat.chatparticipant_set.values_list("not_seen", flat=True))
+
+
+def test_statuses_are_created_for_the_other_members(chat):
+    message_ids = send(chat, 2)
+
+    assert create_message_statuses(message_ids) == 2
+
+    assert MessageStatus.objects.count() == 4
+    assert not_seen(chat) == [0, 2, 2]
+    assert not Message.objects.filter(statuses_created=False).exists()
+
+
+def test_redelivered_task_counts_nothing(chat):
+    message_ids = send(chat)
+    create_message_statuses(message_ids)
+
+    assert create_message_statuses(message_ids) == 0
+    assert not_seen(chat) == [0, 1, 1]
+
+
+def test_existing_statuses_are_not_counted_again(chat):
+    [message_id] = send(chat)
+    member = chat.chatparticipant_set.last()
+    MessageStatus.objects.create(message_id=message_id, participant=member.participant)
+
+    create_message_statuses([message_id])
+
+    assert MessageStatus.objects.count() == 2
+    member.refresh_from_db()
+    assert member.not_seen == 0
+
+
+def test_later_members_get_no_status_for_older_messages(chat):
+    [message_id] = send(chat)
+    late = ChatParticipantFactory(chat=chat)
+    ChatParticipant.objects.filter(id=late.id).update(
+        joined_at=now() + timedelta(minutes=1)
+    )
+
+    create_message_statuses([message_id])
+
+    assert not MessageStatus.objects.filter(participant=late.participant).exists()
+    late.refresh_from_db()
+    assert late.not_seen == 0
+
+
+def test_sweep_queues_the_pending_messages(chat, mocker):
+    delay = mocker.patch.object(create_message_statuses, "delay")
+    MessageFactory(chat=chat)
+    message_ids = send(chat, 2)
+
+    assert create_pending_message_statuses() == 2
+    assert sorted(delay.call_args.kwargs["message_ids"]) == sorted(message_ids)
+
+
+def test_backfill_flags_the_messages_sent_before_the_deploy(chat):
+    message_ids = send(chat, 2)
+    Message.objects.filter(id=message_ids[0]).update(sent_at=now() - timedelta(days=1))
+
+    call_command("backfill_message_statuses", before=now() - timedelta(hours=1))
+
+    pending = Message.objects.filter(statuses_created=False)
+    assert [str(message.id) for message in pending] == message_ids[1:]
+    assert not MessageStatus.objects.exists()
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+
+import pytest
+
+from apps.Billing.models import Price
+from apps.Billing.service.Price.PriceCatalogueService import VERSION_KEY
+from apps.Common.cache import get_redis_client
+
+from .factories import PeriodFactory, PriceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def prices(redis_cache):
+    return [
+        PriceFactory(period=PeriodFactory(name="MONTHLY")),
+        PriceFactory(period=PeriodFactory(name="YEARLY", interval_count=12)),
+    ]
+
+
+def cached_entries():
+    return get_redis_client().keys("*price_catalogue__*")
+
+
+def test_unknown_params_share_the_cached_entry(api_client, prices):
+    etag = api_client.get("/api/v1/prices/")["ETag"]
+
+    for n in range(3):
+        assert api_client.get(f"/api/v1/prices/?utm_source={n}")["ETag"] == etag
+    assert len(cached_entries()) == 1
+
+
+def test_filter_and_page_are_cached_on_their_own(api_client, prices):
+    monthly = api_client.get("/api/v1/prices/?period__name=MONTHLY")
+    page = api_client.get("/api/v1/prices/?limit=1&offset=1")
+
+    assert monthly.data["count"] == 1
+    assert page.data["count"] == 2
+    assert len(page.data["results"]) == 1
+    assert monthly["ETag"] != page["ETag"]
+    assert len(cached_entries()) == 2
+
+
+def test_catalogue_is_invalidated_after_commit(
+    api_client, prices, django_capture_on_commit_callbacks
+):
+    etag = api_client.get("/api/v1/prices/")["ETag"]
+    version = cache.get(VERSION_KEY)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Price.objects.filter(id=prices[0].id).get().save()
+        # The old version is served until the change is committed
+        assert cache.get(VERSION_KEY) == version
+
+    assert api_client.get("/api/v1/prices/")["ETag"] != etag
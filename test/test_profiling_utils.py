@@ -0,0 +1,33 @@
+import pytest
+
+from apps.Common.profiling import profile_request, record_cache, record_external
+
+
+@pytest.fixture
+def profiling_settings(settings):
+    settings.PROFILING_SLOW_QUERIES = 2
+
+
+def test_record_outside_a_request_is_ignored():
+    record_cache(hits=1, misses=1)
+    record_external("stripe", 1.0)
+
+
+def test_profile_counts_cache_and_external_calls(profiling_settings):
+    with profile_request() as profile:
+        record_cache(hits=2, misses=1)
+        record_external("ollama", 0.5)
+        record_external("ollama", 0.25)
+
+    assert (profile.cache_hits, profile.cache_misses) == (2, 1)
+    assert profile.external_seconds == {"ollama": 0.75}
+
+
+def test_sampled_profile_keeps_the_slowest_queries(profiling_settings):
+    with profile_request(sampled=True) as profile:
+        for sql, seconds in [("a", 0.1), ("b", 0.3), ("c", 0.2), ("d", 0.05)]:
+            profile.record_query(sql, seconds)
+
+    assert profile.db_queries == 4
+    assert profile.db_seconds == pytest.approx(0.65)
+    assert [sql for _, _, sql, _ in profile.get_slow_queries()] == ["b", "c"]
@@ -0,0 +1,524 @@
+"""
+Query count and wall time budgets of the API routes.
+
+Every route of the Chat, Billing and Authentication APIs is requested
+against a realistic data set (users with chats of different sizes, a chat
+with thousands of messages, a catalogue of agents) and must stay under
+its budget of SQL queries and seconds. A route added without a budget
+fails ``test_every_route_has_a_budget``.
+
+Budgets are for a cold request (empty cache), raising one should come with
+a reason in the commit that does it.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.urls import URLPattern, get_resolver, reverse
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.Authentication.service import CreateTokenService
+from apps.Authorization.models import Policy, Rule
+from apps.Billing.repository import PlanFeatureRepository, StripeRepository
+from apps.Chat.models import Message
+from apps.Common.models import CustomGroups, FeatureCode, MessageType, NatureType
+
+from .factories import (
+    DEFAULT_PASSWORD,
+    AgentFactory,
+    AgentParticipantFactory,
+    ChatFactory,
+    FeatureFactory,
+    MessageFactory,
+    NatureFactory,
+    ParticipantFactory,
+    PlanFactory,
+    PriceFactory,
+    SubscriptionFactory,
+    UploadFactory,
+    UserFactory,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.slow]
+
+URLCONFS = [
+    "Chat.api.v1.urls",
+    "Billing.api.v1.urls",
+    "Authentication.api.v1.urls",
+]
+
+AGENTS = 40
+USERS = 60
+# Messages of the busiest chat, the other chats follow a power law
+BIG_CHAT_MESSAGES = 2000
+WEBHOOK_SECRET = "whsec_test"
+
+
+# =============================================================================
+# Data
+# =============================================================================
+
+
+@pytest.fixture
+def perf_settings(redis_cache, tmp_path):
+    settings = redis_cache
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.MEDIA_OFFLOAD_HEADER = None
+    settings.CHUNKED_UPLOAD_ROOT = str(tmp_path / "partial_uploads")
+    settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+    settings.CHUNKED_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+    settings.STRIPE_API_KEY = "sk_test"
+    settings.STRIPE_WEBHOOK_SECRET = WEBHOOK_SECRET
+    # The process level matrix could come from another test database
+    PlanFeatureRepository().invalidate()
+    return settings
+
+
+@pytest.fixture
+def seed(perf_settings):
+    Group.objects.create(name=CustomGroups.MEMBER)
+    natures = [NatureFactory(name=name) for name in NatureType.values]
+    features = [FeatureFactory(code=code) for code in FeatureCode.values]
+    price = PriceFactory(plan=PlanFactory(features=features))
+
+    user = UserFactory()
+    user.user_permissions.set(
+        Permission.objects.filter(content_type__app_label__in=["Chat", "Billing"])
+    )
+    SubscriptionFactory(user=user, price=price)
+    participant = ParticipantFactory(user=user)
+
+    agents = [
+        AgentParticipantFactory(
+            agent=AgentFactory(
+                natures=[natures[(i * 7 + j) % len(natures)] for j in range(1 + i % 3)]
+            )
+        )
+        for i in range(AGENTS)
+    ]
+    others = ParticipantFactory.create_batch(USERS)
+
+    # One to one chats with half of the users, a few group chats and the
+    # chats with agents, the busiest one first.
+    chats = [ChatFactory(participants=[participant, other]) for other in others[:30]]
+    chats += [
+        ChatFactory(participants=[participant, *others[30 + i : 32 + i * 3]])
+        for i in range(5)
+    ]
+    chats += [ChatFactory(participants=[participant, agent]) for agent in agents[:5]]
+
+    messages = []
+    for rank, chat in enumerate(chats):
+        for i in range(BIG_CHAT_MESSAGES // (rank + 1) ** 2):
+            messages.append(
+                MessageFactory.build(
+                    chat=chat,
+                    participant=participant if i % 2 else others[rank % USERS],
+                )
+            )
+    Message.objects.bulk_create(messages)
+
+    own_message = MessageFactory(chat=chats[0], participant=participant)
+    media_message = MessageFactory(
+        chat=chats[0],
+        participant=participant,
+        message_type=MessageType.FILE,
+        content=None,
+        attach=ContentFile(b"notes" * 100, name="notes.txt"),
+    )
+
+    # Message edition is granted to its author by a policy
+    policy = Policy.objects.create(
+        name="Edit own messages",
+        description="Edit own messages",
+        resource_type=ContentType.objects.get_for_model(Message),
+        action="edit",
+        effect=True,
+    )
+    Rule.objects.create(
+        policy=policy,
+        rule_type="resource_attr",
+        attribute_name="participant_id",
+        operator="equals",
+        value=str(participant.id),
+    )
+
+    full_upload = UploadFactory(participant=participant, size=4)
+    full_upload.offset = 4
+    full_upload.save()
+    os.makedirs(perf_settings.CHUNKED_UPLOAD_ROOT, exist_ok=True)
+    with open(
+        os.path.join(perf_settings.CHUNKED_UPLOAD_ROOT, f"{full_upload.id}.part"), "wb"
+    ) as partial_file:
+        partial_file.write(b"data")
+
+    return SimpleNamespace(
+        user=user,
+        participant=participant,
+        price=price,
+        big_chat=chats[0],
+        group_chat=chats[30],
+        stranger=others[-1],
+        own_message=own_message,
+        media_message=media_message,
+        upload=UploadFactory(participant=participant),
+        full_upload=full_upload,
+        newcomer=UserFactory(),
+    )
+
+
+def login(client, user):
+    refresh_token, access_token = CreateTokenService().execute(user)
+    client.cookies["access_token"] = access_token
+    client.cookies["refresh_token"] = str(refresh_token)
+    return client
+
+
+def sign(payload):
+    timestamp = int(time.time())
+    signature = hmac.new(
+        WEBHOOK_SECRET.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def webhook_event():
+    payload = json.dumps(
+        {
+            "id": "evt_1",
+            "type": "customer.subscription.updated",
+            "created": int(time.time()),
+            "data": {"object": {"object": "subscription", "customer": "cus_1"}},
+        }
+    )
+    return {
+        "data": payload,
+        "content_type": "application/json",
+        "HTTP_STRIPE_SIGNATURE": sign(payload),
+    }
+
+
+# =============================================================================
+# Budgets
+# =============================================================================
+
+# ``build(seed)`` returns the url kwargs and the request kwargs, ``as_user``
+# is the seeded user logged in ("user", "newcomer") or "anonymous".
+Route = namedtuple(
+    "Route",
+    ["name", "method", "status", "max_queries", "max_seconds", "build", "as_user"],
+    defaults=["user"],
+)
+
+ROUTES = [
+    # Chat
+    Route("agent-list", "get", 200, 11, 0.5, lambda seed: ({}, {})),
+    Route("agent-recommendations", "get", 200, 11, 0.5, lambda seed: ({}, {})),
+    Route("chat-list", "get", 200, 9, 0.5, lambda seed: ({}, {})),
+    Route(
+        "chat-create-chat-and-assign-participants",
+        "post",
+        200,
+        12,
+        0.5,
+        lambda seed: (
+            {},
+            {"data": {"participant_id": str(seed.stranger.id)}, "format": "json"},
+        ),
+    ),
+    Route(
+        "chat-messages",
+        "get",
+        200,
+        8,
+        0.5,
+        lambda seed: ({"pk": seed.big_chat.id}, {}),
+    ),
+    Route(
+        "chat-participants",
+        "get",
+        200,
+        8,
+        0.5,
+        lambda seed: ({"pk": seed.group_chat.id}, {}),
+    ),
+    Route(
+        "message-list",
+        "post",
+        201,
+        22,
+        0.5,
+        lambda seed: (
+            {},
+            {
+                "data": {
+                    "chat": str(seed.big_chat.id),
+                    "message_type": MessageType.TEXT,
+                    "content": "Hello",
+                },
+                "format": "json",
+            },
+        ),
+    ),
+    Route(
+        "message-detail",
+        "put",
+        200,
+        15,
+        0.5,
+        lambda seed: (
+            {"pk": seed.own_message.id},
+            {
+                "data": {
+                    "chat": str(seed.big_chat.id),
+                    "message_type": MessageType.TEXT,
+                    "content": "Edited",
+                },
+                "format": "json",
+            },
+        ),
+    ),
+    Route(
+        "message-detail",
+        "patch",
+        200,
+        14,
+        0.5,
+        lambda seed: (
+            {"pk": seed.own_message.id},
+            {"data": {"content": "Edited"}, "format": "json"},
+        ),
+    ),
+    Route(
+        "message-media",
+        "get",
+        200,
+        8,
+        0.5,
+        lambda seed: ({"pk": seed.media_message.id, "variant": "attach"}, {}),
+    ),
+    Route("nature-list", "get", 200, 9, 0.5, lambda seed: ({}, {})),
+    Route("participant-list", "get", 200, 10, 0.5, lambda seed: ({}, {})),
+    Route(
+        "participant-search",
+        "get",
+        200,
+        10,
+        0.5,
+        lambda seed: ({}, {"data": {"q": "participant1"}}),
+    ),
+    Route(
+        "upload-list",
+        "post",
+        201,
+        8,
+        0.5,
+        lambda seed: (
+            {},
+            {
+                "data": {
+                    "file_name": "photo.jpg",
+                    "content_type": "image/jpeg",
+                    "size": 1024,
+                },
+                "format": "json",
+            },
+        ),
+    ),
+    Route(
+        "upload-detail",
+        "get",
+        200,
+        8,
+        0.5,
+        lambda seed: ({"pk": seed.upload.id}, {}),
+    ),
+    Route(
+        "upload-chunk",
+        "put",
+        200,
+        11,
+        0.5,
+        lambda seed: (
+            {"pk": seed.upload.id},
+            {
+                "data": b"x" * 512,
+                "content_type": "application/octet-stream",
+                "HTTP_UPLOAD_OFFSET": "0",
+            },
+        ),
+    ),
+    Route(
+        "upload-complete",
+        "post",
+        200,
+        17,
+        0.5,
+        lambda seed: ({"pk": seed.full_upload.id}, {}),
+    ),
+    # Billing
+    Route(
+        "price-list",
+        "get",
+        200,
+        4,
+        0.5,
+        lambda seed: ({}, {}),
+        "anonymous",
+    ),
+    Route(
+        "stripe-create-session",
+        "post",
+        200,
+        4,
+        0.5,
+        lambda seed: (
+            {},
+            {
+                "data": {
+                    "success_url": "https://example.com/success",
+                    "cancel_url": "https://example.com/cancel",
+                    "stripe_price_id": str(seed.price.id),
+                },
+                "format": "json",
+            },
+        ),
+    ),
+    Route(
+        "stripe-webhook",
+        "post",
+        200,
+        8,
+        0.5,
+        lambda seed: ({}, webhook_event()),
+        "anonymous",
+    ),
+    # Authentication
+    Route(
+        "auth-login",
+        "post",
+        200,
+        8,
+        0.5,
+        lambda seed: (
+            {},
+            {"data": {"email": seed.user.email, "password": DEFAULT_PASSWORD}},
+        ),
+        "anonymous",
+    ),
+    Route("auth-logout", "post", 200, 10, 0.5, lambda seed: ({}, {})),
+    Route("auth-me", "post", 200, 7, 0.5, lambda seed: ({}, {})),
+    Route("auth-refresh-token", "post", 200, 4, 0.5, lambda seed: ({}, {})),
+    Route(
+        "auth-register",
+        "post",
+        201,
+        10,
+        0.5,
+        lambda seed: (
+            (
+                {},
+                {
+                    "data": {
+                        "email": "newuser@example.com",
+                        "phone": "987654321",
+                        "password1": "Strongpassword123$",
+                        "password2": "Strongpassword123$",
+                    }
+                },
+            )
+        ),
+        "anonymous",
+    ),
+    Route(
+        "onboard-create-profile-participant",
+        "post",
+        200,
+        17,
+        0.5,
+        lambda seed: (
+            (
+                {},
+                {
+                    "data": {
+                        "first_name": "New",
+                        "last_name": "Comer",
+                        "nickname": "newcomer",
+                        "gender": "NONE",
+                        "birth_date": "1990-01-01T00:00:00Z",
+                    }
+                },
+            )
+        ),
+        "newcomer",
+    ),
+]
+
+
+def get_route_names(urlconf):
+    names = set()
+    patterns = list(get_resolver(urlconf).url_patterns)
+    while patterns:
+        pattern = patterns.pop()
+        if isinstance(pattern, URLPattern):
+            names.add(pattern.name)
+        else:
+            patterns.extend(pattern.url_patterns)
+    names.discard("api-root")
+    return names
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+
+def test_every_route_has_a_budget():
+    names = set()
+    for urlconf in URLCONFS:
+        names |= get_route_names(urlconf)
+
+    assert names == {route.name for route in ROUTES}
+
+
+@pytest.mark.parametrize(
+    "route", ROUTES, ids=[f"{route.method}-{route.name}" for route in ROUTES]
+)
+def test_route_budget(route, seed, django_assert_max_num_queries, mocker):
+    if route.name == "participant-search" and connection.vendor != "postgresql":
+        pytest.skip("The participant search needs pg_trgm")
+
+    mocker.patch.object(
+        StripeRepository,
+        "create_stripe_checkout_session",
+        return_value=SimpleNamespace(url="https://checkout.stripe.com/c/pay/cs_1"),
+    )
+
+    client = APIClient()
+    if route.as_user != "anonymous":
+        login(client, getattr(seed, route.as_user))
+    url_kwargs, request_kwargs = route.build(seed)
+    url = reverse(route.name, kwargs=url_kwargs)
+
+    with django_assert_max_num_queries(route.max_queries):
+        started = time.perf_counter()
+        response = getattr(client, route.method)(url, **request_kwargs)
+        elapsed = time.perf_counter() - started
+
+    assert response.status_code == route.status, getattr(response, "data", None)
+    assert elapsed <= route.max_seconds
@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError
+
+import pytest
+from rest_framework.exceptions import PermissionDenied
+
+from apps.Billing.models import Quota, QuotaPlan, Usage
+from apps.Billing.repository import PlanFeatureRepository, QuotaRepository
+from apps.Billing.tasks import flush_quota_usage
+from apps.Chat.service import CreateChatService
+from apps.Common.cache import get_redis_client
+from apps.Common.models import AgentType, FeatureCode, QuotaCode
+
+from .factories import (
+    AgentFactory,
+    AgentParticipantFactory,
+    FeatureFactory,
+    ParticipantFactory,
+    PlanFactory,
+    PriceFactory,
+    SubscriptionFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+QUOTA = QuotaCode.AGENT_CHAT_COUNT
+
+
+@pytest.fixture
+def subscription(redis_cache):
+    # The process level matrix could come from another test database
+    PlanFeatureRepository().invalidate()
+    plan = PlanFactory(features=[FeatureFactory(code=FeatureCode.BASIC_AGENT)])
+    quota = Quota.objects.create(code=QUOTA, name="Agent chats", description="")
+    QuotaPlan.objects.create(plan=plan, quota=quota, limit=5)
+
+    return SubscriptionFactory(price=PriceFactory(plan=plan))
+
+
+def test_consume_stops_at_the_limit(subscription):
+    assert [subscription.consume(QUOTA) for _ in range(7)] == [True] * 5 + [False] * 2
+    assert subscription.get_quota_usage(QUOTA) == 5
+    assert subscription.get_quota_remaining(QUOTA) == 0
+
+
+def test_concurrent_consumers_do_not_overrun_the_limit(subscription):
+    # Seeds the counter, the threads never read the database
+    assert subscription.consume(QUOTA)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: subscription.consume(QUOTA), range(20)))
+
+    assert results.count(True) == 4
+    assert subscription.get_quota_usage(QUOTA) == 5
+
+
+def test_missing_counter_is_seeded_from_the_stored_usage(subscription):
+    Usage.objects.create(
+        subscription=subscription,
+        quota=Quota.objects.get(code=QUOTA),
+        period_start=subscription.current_period_start,
+        count=4,
+    )
+
+    assert subscription.can_consume(QUOTA)
+    assert subscription.consume(QUOTA)
+    assert not subscription.consume(QUOTA)
+
+
+def test_flush_writes_the_counters_once(subscription):
+    subscription.consume(QUOTA, amount=3)
+
+    assert flush_quota_usage() == 1
+    assert Usage.objects.get(subscription=subscription).count == 3
+    # Nothing changed since the last flush
+    assert flush_quota_usage() == 0
+
+    subscription.consume(QUOTA)
+    flush_quota_usage()
+    assert Usage.objects.get(subscription=subscription).count == 4
+
+
+def test_failed_flush_keeps_the_counters_pending(subscription, mocker):
+    subscription.consume(QUOTA)
+    mocker.patch.object(Usage.objects, "bulk_create", side_effect=RuntimeError)
+
+    with pytest.raises(RuntimeError):
+        flush_quota_usage()
+
+    assert QuotaRepository().pop_pending(10) == [
+        (QuotaRepository.get_key(subscription, QUOTA), 1)
+    ]
+
+
+def test_redis_client_needs_a_redis_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+    with pytest.raises(ImproperlyConfigured):
+        get_redis_client()
+
+
+def test_chats_over_the_limit_are_denied(subscription):
+    ParticipantFactory(user=subscription.user)
+    agents = AgentParticipantFactory.create_batch(6, agent__agent_type=AgentType.BASIC)
+
+    for agent in agents[:5]:
+        CreateChatService().execute(subscription.user, agent.id)
+
+    with pytest.raises(PermissionDenied):
+        CreateChatService().execute(subscription.user, agents[5].id)
+    assert subscription.get_quota_usage(QUOTA) == 5
+
+
+def test_failed_chat_creation_refunds_the_quota(subscription, mocker):
+    ParticipantFactory(user=subscription.user)
+    agent = AgentParticipantFactory(agent=AgentFactory(agent_type=AgentType.BASIC))
+    mocker.patch.object(
+        CreateChatService,
+        "_create_chat_assing_participants",
+        side_effect=IntegrityError,
+    )
+
+    with pytest.raises(IntegrityError):
+        CreateChatService().execute(subscription.user, agent.id)
+
+    assert subscription.get_quota_usage(QUOTA) == 0
+
+
+def test_refund_never_goes_below_zero(subscription):
+    subscription.refund(QUOTA)
+
+    assert subscription.get_quota_usage(QUOTA) == 0
+    assert subscription.consume(QUOTA)
+    assert subscription.get_quota_usage(QUOTA) == 1
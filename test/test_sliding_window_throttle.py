@@ -0,0 +1,112 @@
+from django.core.cache import cache
+
+import pytest
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from apps.Common.cache import get_redis_client
+from apps.Common.middleware import RateLimitHeadersMiddleware
+from apps.Common.throttles import SlidingWindowRateThrottle
+
+# Start of a window of the 10/min rate
+START = 6_000_000.0
+
+
+class ClockThrottle(SlidingWindowRateThrottle):
+    rate = "10/min"
+    now = START
+
+    def timer(self):
+        return ClockThrottle.now
+
+    def get_cache_key(self, request, view):
+        return f"throttle_test_{self.rate}"
+
+
+class StrictThrottle(ClockThrottle):
+    rate = "3/min"
+
+
+@pytest.fixture
+def throttle_settings(redis_cache):
+    cache.clear()
+    ClockThrottle.now = START
+
+
+def allowed(throttle=ClockThrottle, at=None):
+    if at is not None:
+        ClockThrottle.now = START + at
+    return throttle().allow_request(APIRequestFactory().get("/"), None)
+
+
+def test_window_allows_the_rate(throttle_settings):
+    assert [allowed() for _ in range(11)] == [True] * 10 + [False]
+    # Rejected requests do not count, the next window starts full
+    assert [allowed(at=120) for _ in range(11)] == [True] * 10 + [False]
+
+
+def test_counters_always_expire(throttle_settings):
+    client = get_redis_client()
+    allowed()
+    key = cache.make_key(ClockThrottle().get_cache_key(None, None) + "_100000")
+    # A counter left without expiry gets it back on the next request
+    client.persist(key)
+
+    allowed()
+
+    assert int(client.get(key)) == 2
+    assert client.ttl(key) == 120
+
+
+def test_previous_window_is_weighted_by_its_overlap(throttle_settings):
+    for _ in range(10):
+        allowed(at=0)
+
+    # Right after the window ends the previous one still counts fully
+    assert not allowed(at=60)
+    # Halfway through, half of it does
+    assert [allowed(at=90) for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_wait_is_the_time_until_a_request_fits(throttle_settings):
+    for _ in range(10):
+        allowed(at=0)
+    for _ in range(5):
+        allowed(at=90)
+
+    throttle = ClockThrottle()
+    assert not throttle.allow_request(APIRequestFactory().get("/"), None)
+
+    wait = throttle.wait()
+    assert wait == pytest.approx(6)
+    assert not allowed(at=90 + wait - 1)
+    assert allowed(at=90 + wait)
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [ClockThrottle, StrictThrottle]
+
+    def get(self, request):
+        return Response({})
+
+
+def test_headers_report_the_most_restrictive_throttle(throttle_settings):
+    view = RateLimitHeadersMiddleware(ThrottledView.as_view())
+
+    response = view(APIRequestFactory().get("/"))
+
+    assert response.status_code == 200
+    assert response["X-RateLimit-Limit"] == "3"
+    assert response["X-RateLimit-Remaining"] == "2"
+    assert response["X-RateLimit-Reset"] == "60"
+
+    view(APIRequestFactory().get("/"))
+    view(APIRequestFactory().get("/"))
+    response = view(APIRequestFactory().get("/"))
+
+    assert response.status_code == 429
+    assert response["X-RateLimit-Remaining"] == "0"
+    assert int(response["Retry-After"]) > 0
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from apps.Billing.models import StripeCustomerOutbox
+from apps.Billing.repository.StripeRepository import get_stripe_client
+from apps.Billing.service import CreateCustomerService, GetOrCreateCustomerService
+from apps.Billing.tasks import create_pending_stripe_customers, create_stripe_customer
+
+from .factories import ParticipantFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def outbox():
+    participant = ParticipantFactory(user__strip_customer_id="")
+    return StripeCustomerOutbox.objects.get(user=participant.user)
+
+
+@pytest.fixture
+def create_customer(settings, mocker):
+    settings.STRIPE_API_KEY = "sk_test_outbox"
+    get_stripe_client.cache_clear()
+    yield mocker.patch.object(
+        CreateCustomerService,
+        "execute",
+        side_effect=[RuntimeError("stripe is down"), SimpleNamespace(id="cus_new")],
+    )
+    get_stripe_client.cache_clear()
+
+
+def test_failed_creation_is_recorded_and_retried(outbox, create_customer):
+    with pytest.raises(RuntimeError):
+        create_stripe_customer(str(outbox.user_id))
+
+    outbox.refresh_from_db()
+    assert outbox.attempts == 1
+    assert outbox.last_error == "stripe is down"
+    assert outbox.processed_at is None
+
+    assert create_stripe_customer(str(outbox.user_id)) == "cus_new"
+
+    outbox.refresh_from_db()
+    assert outbox.processed_at is not None
+    assert outbox.last_error is None
+    outbox.user.refresh_from_db()
+    assert outbox.user.strip_customer_id == "cus_new"
+    # Both attempts are the same customer for stripe
+    keys = {call.kwargs["idempotency_key"] for call in create_customer.call_args_list}
+    assert keys == {f"customer-{outbox.idempotency_key}"}
+
+
+def test_failure_in_a_request_is_left_to_the_worker(outbox, create_customer):
+    with pytest.raises(RuntimeError):
+        GetOrCreateCustomerService().execute(outbox.user_id)
+
+    outbox.refresh_from_db()
+    assert outbox.attempts == 0
+
+
+def test_sweep_queues_the_pending_creations(outbox, mocker):
+    delay = mocker.patch.object(create_stripe_customer, "delay")
+    ParticipantFactory()
+
+    assert create_pending_stripe_customers() == 1
+    delay.assert_called_once_with(user_id=str(outbox.user_id))
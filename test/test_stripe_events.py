@@ -0,0 +1,140 @@
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.utils.timezone import now
+
+import pytest
+from celery.exceptions import Retry
+from rest_framework import status
+
+from apps.Billing.models import StripeEvent
+from apps.Billing.service import ProcessStripeEventService, StripeWebHookService
+from apps.Billing.tasks import process_stripe_events
+from apps.Common.models import StatusSuscription
+
+from .factories import SubscriptionFactory
+
+pytestmark = pytest.mark.django_db
+
+CUSTOMER = "cus_test"
+
+
+@pytest.fixture
+def subscription():
+    return SubscriptionFactory(user__strip_customer_id=CUSTOMER)
+
+
+def invoice_event(event_id, event_type, created, subscription):
+    return {
+        "id": event_id,
+        "type": event_type,
+        "created": int(created.timestamp()),
+        "data": {
+            "object": {
+                "object": "invoice",
+                "customer": CUSTOMER,
+                "subscription": subscription.stripe_subscription_id,
+                "lines": {"data": [{"period": {"start": 0, "end": 0}}]},
+            }
+        },
+    }
+
+
+def store(event):
+    return StripeEvent.objects.create(
+        stripe_event_id=event["id"],
+        event_type=event["type"],
+        stripe_customer_id=CUSTOMER,
+        payload=event,
+        created=datetime.fromtimestamp(event["created"], tz=dt_timezone.utc),
+    )
+
+
+def test_retried_delivery_is_stored_and_processed_once(
+    subscription, mocker, django_capture_on_commit_callbacks
+):
+    mocker.patch("stripe.Webhook.construct_event")
+    delay = mocker.patch(
+        "apps.Billing.service.Stripe.StripeWebHookService.process_stripe_events.delay"
+    )
+    payload = json.dumps(
+        invoice_event("evt_1", "invoice.payment_failed", now(), subscription)
+    )
+
+    for _ in range(2):
+        with django_capture_on_commit_callbacks(execute=True):
+            result = StripeWebHookService().execute(payload, "signature")
+        assert result == status.HTTP_200_OK
+
+    assert StripeEvent.objects.count() == 1
+    delay.assert_called_once_with(customer_id=CUSTOMER)
+
+
+def test_events_are_applied_in_the_order_stripe_created_them(subscription, mocker):
+    execute = mocker.spy(ProcessStripeEventService, "execute")
+    created = now()
+    # Delivered out of order
+    store(invoice_event("evt_2", "invoice.paid", created, subscription))
+    store(
+        invoice_event(
+            "evt_1", "invoice.payment_failed", created - timedelta(1), subscription
+        )
+    )
+
+    assert process_stripe_events(CUSTOMER) == 2
+
+    applied = [call.args[1].stripe_event_id for call in execute.call_args_list]
+    assert applied == ["evt_1", "evt_2"]
+    subscription.refresh_from_db()
+    assert subscription.status == StatusSuscription.ACTIVE
+    assert not StripeEvent.objects.filter(processed_at__isnull=True).exists()
+
+
+def test_late_event_does_not_move_the_subscription_back(subscription):
+    created = now()
+    store(invoice_event("evt_2", "invoice.paid", created, subscription))
+    process_stripe_events(CUSTOMER)
+
+    store(
+        invoice_event(
+            "evt_1", "invoice.payment_failed", created - timedelta(1), subscription
+        )
+    )
+    process_stripe_events(CUSTOMER)
+
+    subscription.refresh_from_db()
+    assert subscription.status == StatusSuscription.ACTIVE
+    assert subscription.last_event_at == created.replace(microsecond=0)
+
+
+def test_failed_event_holds_back_the_later_ones(subscription, mocker):
+    created = now()
+    store(invoice_event("evt_1", "invoice.paid", created, subscription))
+    store(
+        invoice_event(
+            "evt_2", "invoice.payment_failed", created + timedelta(1), subscription
+        )
+    )
+    mocker.patch.object(
+        ProcessStripeEventService, "_renew_subscription", side_effect=KeyError("lines")
+    )
+
+    with pytest.raises(Retry):
+        process_stripe_events(CUSTOMER)
+
+    failed = StripeEvent.objects.get(stripe_event_id="evt_1")
+    assert failed.attempts == 1
+    assert failed.last_error == "'lines'"
+    assert StripeEvent.objects.filter(processed_at__isnull=True).count() == 2
+
+
+def test_events_without_customer_are_processed():
+    StripeEvent.objects.create(
+        stripe_event_id="evt_1",
+        event_type="product.created",
+        payload={"data": {"object": {}}},
+        created=now(),
+    )
+
+    assert process_stripe_events(None) == 1
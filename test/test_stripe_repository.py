@@ -0,0 +1,91 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from prometheus_client import REGISTRY
+
+from apps.Billing.repository import StripeRepository
+from apps.Billing.repository.StripeRepository import get_stripe_client
+
+
+class StripeStubHandler(BaseHTTPRequestHandler):
+    """Answers like stripe, failing the first ``failures`` requests."""
+
+    failures = 0
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.requests.append((self.path, self.headers.get("Idempotency-Key"), body))
+
+        if len(self.requests) <= self.failures:
+            self._answer(500, {"error": {"type": "api_error", "message": "down"}})
+        else:
+            self._answer(200, {"id": "cus_stub", "object": "customer"})
+
+    def _answer(self, status, data):
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stripe_stub(settings):
+    StripeStubHandler.failures = 0
+    StripeStubHandler.requests = []
+    server = HTTPServer(("127.0.0.1", 0), StripeStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.STRIPE_API_KEY = "sk_test_stub"
+    settings.STRIPE_API_BASE = f"http://127.0.0.1:{server.server_port}"
+    settings.STRIPE_CONNECT_TIMEOUT = 1
+    settings.STRIPE_READ_TIMEOUT = 5
+    settings.STRIPE_MAX_NETWORK_RETRIES = 1
+    settings.STRIPE_HTTP_POOL_SIZE = 2
+    get_stripe_client.cache_clear()
+
+    yield StripeStubHandler
+
+    server.shutdown()
+    get_stripe_client.cache_clear()
+
+
+def _latency_count(operation, outcome):
+    return (
+        REGISTRY.get_sample_value(
+            "stripe_request_latency_seconds_count",
+            {"operation": operation, "outcome": outcome},
+        )
+        or 0
+    )
+
+
+def test_create_customer_sends_idempotency_key(stripe_stub):
+    before = _latency_count("customer", "success")
+
+    customer = StripeRepository().create_customer(
+        "Jane Doe", "jane@example.com", "+12125550000", idempotency_key="key-1"
+    )
+
+    assert customer.id == "cus_stub"
+    assert stripe_stub.requests[0][0] == "/v1/customers"
+    assert stripe_stub.requests[0][1] == "key-1"
+    assert _latency_count("customer", "success") == before + 1
+
+
+def test_failed_request_is_retried_with_the_same_idempotency_key(stripe_stub):
+    stripe_stub.failures = 1
+
+    StripeRepository().create_stripe_product("Pro")
+
+    assert len(stripe_stub.requests) == 2
+    assert stripe_stub.requests[0][1] is not None
+    assert stripe_stub.requests[0][1] == stripe_stub.requests[1][1]
@@ -0,0 +1,57 @@
+import json
+
+from django.core.management import call_command
+
+import pytest
+
+
+@pytest.fixture
+def benchmark_settings(settings, mocker):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    mocker.patch("apps.Chat.service.CreateMessageService.create_message_statuses")
+
+
+def test_percentile_is_nearest_rank():
+    from apps.Common.management.commands.benchmark_websockets import percentile
+
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 90) == 7
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_websockets_saves_results(benchmark_settings, tmp_path, capsys):
+    from apps.Authentication.models import CustomUser
+    from apps.Chat.models import Chat
+
+    output = tmp_path / "results.json"
+
+    call_command(
+        "benchmark_websockets",
+        clients=6,
+        chats=2,
+        rounds=2,
+        output=str(output),
+    )
+
+    results = json.loads(output.read_text())
+
+    assert results["connections"] == 12
+    assert results["connect_failures"] == 0
+    assert results["errors"] == 0
+    assert results["deliveries"]["lost"] == 0
+    assert results["memory_per_connection_bytes"] > 0
+    for kind in ("typing", "message", "notification", "seen"):
+        assert results["fanout_ms"][kind]["count"] > 0
+        assert results["fanout_ms"][kind]["p50"] <= results["fanout_ms"][kind]["p99"]
+
+    # The benchmark data is removed once the run is over
+    assert not Chat.objects.exists()
+    assert not CustomUser.objects.exists()
+    assert "Results saved in" in capsys.readouterr().out